@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark del auto-scheduler de tareas (task_auto_schedule).
+
+Genera un mes de calendario con reuniones y N tareas pendientes con
+prioridad, fecha límite y duración estimada, y mide el cálculo de huecos
+libres, el reparto EDF y la construcción del iCal que se importa en una
+sola llamada a calcurse.
+
+Uso:
+    uv run python scripts/bench_auto_schedule.py --tasks 500 --days 30
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.calcurse import build_ical
+from src.utils.intervals import IntervalTree
+from src.utils.scheduling import SchedulableTask, WorkSchedule, schedule_tasks
+
+SCHEDULE = WorkSchedule.from_config(
+    {"calendar": {"work_hours": {"start": "09:00", "end": "18:00"}, "break_time": 15}}
+)
+
+
+def make_meetings(start: datetime, days: int, rng: random.Random) -> IntervalTree:
+    """De 2 a 6 reuniones de 30 a 90 minutos por día laboral."""
+    meetings = []
+    for day in range(days):
+        day_start = start + timedelta(days=day, hours=9)
+        for _ in range(rng.randint(2, 6)):
+            begin = day_start + timedelta(minutes=15 * rng.randrange(32))
+            end = begin + timedelta(minutes=rng.choice((30, 60, 90)))
+            meetings.append((begin, end, (begin, end)))
+    return IntervalTree(meetings)
+
+
+def make_tasks(count: int, start: datetime, days: int, rng: random.Random):
+    """Tareas de 15 a 120 minutos; 70% con fecha límite dentro del rango."""
+    tasks = []
+    for i in range(count):
+        due = None
+        if rng.random() < 0.7:
+            due = start + timedelta(hours=rng.randrange(12, days * 24))
+        tasks.append(
+            SchedulableTask(
+                id=f"task_{i}",
+                title=f"Tarea {i}",
+                duration=timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120))),
+                due=due,
+                priority=rng.choice(("urgent", "high", "medium", "low")),
+            )
+        )
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    start = datetime(2025, 3, 3)
+    end = start + timedelta(days=args.days)
+    meetings = make_meetings(start, args.days, rng)
+    tasks = make_tasks(args.tasks, start, args.days, rng)
+
+    def busy(window_start, window_end):
+        return meetings.overlapping(window_start, window_end)
+
+    timings = {"huecos": 0.0, "reparto": 0.0, "ical": 0.0}
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        free = list(SCHEDULE.free_intervals(start, end, busy, deep_work="allow"))
+        t1 = time.perf_counter()
+        placements, unscheduled = schedule_tasks(tasks, free, SCHEDULE.break_time)
+        t2 = time.perf_counter()
+        build_ical(
+            [
+                {
+                    "id": p.task.id,
+                    "title": p.task.title,
+                    "start_time": p.start.isoformat(),
+                    "end_time": p.end.isoformat(),
+                }
+                for p in placements
+            ]
+        )
+        t3 = time.perf_counter()
+        timings["huecos"] += t1 - t0
+        timings["reparto"] += t2 - t1
+        timings["ical"] += t3 - t2
+
+    late = sum(1 for p in placements if p.task.due and p.end > p.task.due)
+    print(f"{len(meetings)} reuniones y {len(free)} huecos en {args.days} días")
+    print(f"Agendadas: {len(placements)}, sin espacio: {len(unscheduled)}, tarde: {late}")
+    for label, total in timings.items():
+        print(f"{label}: {total / args.runs * 1000:.2f}ms")
+    print(f"total: {sum(timings.values()) / args.runs * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
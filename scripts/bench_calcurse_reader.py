@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la agenda de calcurse: lector de archivos vs `calcurse -r`.
+
+Genera un directorio de calcurse sintético con N citas y mide la carga
+inicial del lector, las consultas de rango con la caché caliente y, si
+calcurse está instalado, el tiempo de lanzar `calcurse -r` sobre los
+mismos datos.
+
+Uso:
+    uv run python scripts/bench_calcurse_reader.py --appointments 100000
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.calcurse_reader import CalcurseReader
+
+
+def write_calendar(path: Path, appointments: int):
+    """Escribe apts y todo con citas cada 37 minutos alrededor de hoy."""
+    base = datetime.now().replace(second=0, microsecond=0) - timedelta(
+        minutes=37 * appointments // 2
+    )
+    with open(path / "apts", "w", encoding="utf-8") as f:
+        for i in range(appointments):
+            start = base + timedelta(minutes=37 * i)
+            end = start + timedelta(minutes=45)
+            f.write(f"{start:%m/%d/%Y @ %H:%M} -> {end:%m/%d/%Y @ %H:%M} |Evento {i}\n")
+    with open(path / "todo", "w", encoding="utf-8") as f:
+        for i in range(100):
+            f.write(f"[{i % 10}] Tarea {i}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        write_calendar(path, args.appointments)
+
+        reader = CalcurseReader(tmp)
+        start = datetime.combine(datetime.now().date(), datetime.min.time())
+        end = start + timedelta(days=1)
+
+        t0 = time.perf_counter()
+        found = reader.appointments(start, end)
+        print(f"Carga inicial ({args.appointments} citas): {time.perf_counter() - t0:.3f}s")
+
+        t0 = time.perf_counter()
+        for _ in range(args.queries):
+            reader.appointments(start, end)
+        per_query = (time.perf_counter() - t0) / args.queries
+        print(f"Consulta de un día ({len(found)} citas, con stat): {per_query * 1e6:.1f}µs")
+
+        if reader.watch():
+            reader.appointments(start, end)
+            t0 = time.perf_counter()
+            for _ in range(args.queries):
+                reader.appointments(start, end)
+            per_query = (time.perf_counter() - t0) / args.queries
+            print(f"Consulta de un día (watchdog): {per_query * 1e6:.1f}µs")
+            reader.stop_watching()
+
+        if shutil.which("calcurse"):
+            runs = 20
+            t0 = time.perf_counter()
+            for _ in range(runs):
+                subprocess.run(["calcurse", "-D", tmp, "-r1"], capture_output=True, check=True)
+            print(f"calcurse -r1: {(time.perf_counter() - t0) / runs * 1000:.1f}ms")
+        else:
+            print("calcurse no instalado: se omite la comparación con calcurse -r")
+
+
+if __name__ == "__main__":
+    main()
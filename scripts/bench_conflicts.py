@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la detección de conflictos de calendario.
+
+Genera N eventos (algunos de varios días, como vacaciones o viajes) y mide
+la construcción del árbol de intervalos y las consultas de solapamiento de
+una hora, comparadas con un recorrido lineal y con la búsqueda por inicio
+más duración máxima que usaba el índice de la agenda antes.
+
+Uso:
+    uv run python scripts/bench_conflicts.py --events 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.intervals import IntervalTree
+
+
+def make_events(count: int, seed: int = 7):
+    """Eventos de 15 a 120 minutos en un año, más un 0.1% de eventos de varios días."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    events = []
+    for i in range(count):
+        start = base + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        if i % 1000 == 0:
+            duration = timedelta(days=rng.randint(2, 14))
+        else:
+            duration = timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120)))
+        events.append((start, start + duration, i))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    rng = random.Random(11)
+    windows = []
+    for _ in range(args.queries):
+        start = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        windows.append((start, start + timedelta(hours=1)))
+
+    t0 = time.perf_counter()
+    tree = IntervalTree(events)
+    print(f"Construcción del árbol ({len(tree)} eventos): {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    found = 0
+    for start, end in windows:
+        found += len(tree.overlapping(start, end))
+    per_query = (time.perf_counter() - t0) / args.queries
+    average = found / args.queries
+    print(f"Árbol de intervalos: {per_query * 1e6:.1f}µs/consulta ({average:.1f} conflictos)")
+
+    # Inicio ordenado + duración máxima: un solo evento largo ensancha cada consulta
+    ordered = sorted(events)
+    starts = [e[0] for e in ordered]
+    max_duration = max(e[1] - e[0] for e in events)
+    t0 = time.perf_counter()
+    for start, end in windows:
+        lo = bisect_left(starts, start - max_duration)
+        hi = bisect_left(starts, end)
+        [e for e in ordered[lo:hi] if e[1] > start]
+    per_query = (time.perf_counter() - t0) / args.queries
+    print(f"bisect + duración máxima: {per_query * 1e6:.1f}µs/consulta")
+
+    sample = windows[: min(200, args.queries)]
+    t0 = time.perf_counter()
+    for start, end in sample:
+        linear = sorted(e[2] for e in ordered if e[0] < end and e[1] > start)
+        assert linear == sorted(tree.overlapping(start, end)), "el árbol no coincide"
+    per_query = (time.perf_counter() - t0) / len(sample)
+    print(f"Recorrido lineal: {per_query * 1e6:.1f}µs/consulta (resultados verificados)")
+
+
+if __name__ == "__main__":
+    main()
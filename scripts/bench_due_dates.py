@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de filtros por fecha límite sobre TaskDatabase (SQLite).
+
+Carga N tareas sintéticas y mide today/overdue/week/upcoming, mostrando
+el plan de consulta para confirmar que se usa idx_tasks_user_due.
+
+Uso:
+    uv run python scripts/bench_due_dates.py --tasks 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.database import TaskDatabase
+
+
+async def populate(db_path: str, total: int, users: int):
+    """Inserta tareas con fechas límite repartidas en ±180 días."""
+    now = datetime.now()
+    batch = []
+    async with aiosqlite.connect(db_path) as db:
+        for i in range(total):
+            due = now + timedelta(minutes=random.randint(-180 * 1440, 180 * 1440))
+            batch.append(
+                (
+                    f"bench_{i}",
+                    f"user_{i % users}",
+                    f"Tarea {i}",
+                    "",
+                    "medium",
+                    due.isoformat(timespec="seconds"),
+                    "",
+                    i % 5 == 0,
+                    now.isoformat(),
+                    int(due.timestamp()),
+                )
+            )
+            if len(batch) == 50_000:
+                await db.executemany(
+                    """
+                    INSERT INTO tasks
+                    (id, user_id, title, description, priority, due_date, tags,
+                     completed, created_at, due_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    batch,
+                )
+                batch.clear()
+        if batch:
+            await db.executemany(
+                """
+                INSERT INTO tasks
+                (id, user_id, title, description, priority, due_date, tags,
+                 completed, created_at, due_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                batch,
+            )
+        await db.commit()
+        await db.execute("ANALYZE")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--db", default="data/bench_due_dates.db")
+    args = parser.parse_args()
+
+    Path(args.db).unlink(missing_ok=True)
+    db = TaskDatabase(db_path=args.db)
+    await db.initialize()
+
+    start = time.perf_counter()
+    await populate(args.db, args.tasks, args.users)
+    print(f"Carga de {args.tasks} tareas: {time.perf_counter() - start:.1f}s")
+
+    async with aiosqlite.connect(args.db) as conn:
+        async with conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks "
+            "WHERE user_id = ? AND completed = 0 AND due_at >= ? AND due_at < ? "
+            "ORDER BY due_at ASC LIMIT ?",
+            ("user_0", 0, 1, 10),
+        ) as cursor:
+            for row in await cursor.fetchall():
+                print(f"Plan: {row[-1]}")
+
+    for filter_type in ("today", "overdue", "week", "upcoming"):
+        start = time.perf_counter()
+        for run in range(args.runs):
+            await db.list_tasks(f"user_{run % args.users}", filter_type=filter_type, limit=50)
+        elapsed = (time.perf_counter() - start) / args.runs * 1000
+        print(f"{filter_type:>9}: {elapsed:.2f} ms/consulta")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
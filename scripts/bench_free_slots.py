@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de huecos libres (calendar_find_free_slots).
+
+Genera un calendario denso de varios meses (citas de 30 a 90 minutos con
+huecos cortos entre ellas dentro del horario laboral) y mide cuánto tarda
+encontrar los primeros k huecos de una duración dada, incluido el peor
+caso en el que ningún hueco alcanza y se recorre todo el rango.
+
+Uso:
+    uv run python scripts/bench_free_slots.py --months 3 --duration 60
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.intervals import IntervalTree
+from src.utils.scheduling import WorkSchedule
+
+SCHEDULE = WorkSchedule.from_config(
+    {
+        "calendar": {
+            "work_hours": {"start": "09:00", "end": "18:00"},
+            "break_time": 15,
+            "deep_work_blocks": [
+                {"start": "10:00", "end": "12:00"},
+                {"start": "15:00", "end": "17:00"},
+            ],
+        }
+    }
+)
+
+
+def make_calendar(start: datetime, days: int, seed: int = 3) -> IntervalTree:
+    """Citas de 8:00 a 20:00 separadas por huecos de 0 a 2 horas."""
+    rng = random.Random(seed)
+    events = []
+    for day in range(days):
+        cursor = start + timedelta(days=day, hours=8)
+        day_end = cursor + timedelta(hours=12)
+        while cursor < day_end:
+            end = cursor + timedelta(minutes=rng.choice((30, 45, 60, 90)))
+            events.append((cursor, end, (cursor, end)))
+            cursor = end + timedelta(minutes=rng.choice((0, 10, 20, 40, 60, 90, 120)))
+    return IntervalTree(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--duration", type=int, default=60, help="minutos")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    start = datetime(2025, 1, 1)
+    days = args.months * 30
+    end = start + timedelta(days=days)
+    tree = make_calendar(start, days)
+    print(f"Calendario: {len(tree)} citas en {days} días")
+
+    def busy(window_start, window_end):
+        return tree.overlapping(window_start, window_end)
+
+    duration = timedelta(minutes=args.duration)
+    cases = [
+        (f"top-{args.limit} de {args.duration} min", duration, "allow"),
+        (f"top-{args.limit} de {args.duration} min fuera de trabajo profundo", duration, "avoid"),
+        (f"top-{args.limit} de {args.duration} min en trabajo profundo", duration, "only"),
+        ("peor caso (8 h, sin resultados)", timedelta(hours=8), "allow"),
+    ]
+    for label, duration, deep_work in cases:
+        t0 = time.perf_counter()
+        for _ in range(args.runs):
+            slots = list(SCHEDULE.find_slots(start, end, duration, busy, deep_work, args.limit))
+        elapsed = (time.perf_counter() - t0) / args.runs
+        print(f"{label}: {elapsed * 1000:.2f}ms ({len(slots)} huecos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark del local listener: retraso de disparo y volumen de consultas.
+
+Programa recordatorios sintéticos repartidos en la ventana indicada y
+ejecuta LocalListener sin LISTEN (refresco cada 30 s) y con LISTEN/NOTIFY.
+Los recordatorios no suenan: solo se registra cuándo se dispararon. El
+usuario sintético se elimina al terminar.
+
+Uso:
+    DATABASE_URL=postgresql://... uv run python scripts/bench_listener.py --duration 120
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.local_listener import LocalListener
+from src.utils.config import get_settings
+
+BENCH_USER = "bench_listener"
+
+
+class SilentListener(LocalListener):
+    """LocalListener que no ejecuta alarmas ni notificaciones."""
+
+    async def _execute_reminder(self, reminder: dict):
+        pass
+
+
+async def run(mode: str, database_url: str, reminders: int, duration: int) -> dict:
+    """Ejecuta el listener durante duration segundos y devuelve sus métricas."""
+    listener = SilentListener(database_url, [BENCH_USER], use_notify=mode == "notify")
+    listener.notifications.send_notification = lambda **kwargs: None
+
+    await listener.db.connect()
+    async with listener.db.pool.acquire() as conn:
+        await conn.execute("DELETE FROM reminders WHERE user_id = $1", BENCH_USER)
+    await listener.db.disconnect()
+
+    task = asyncio.create_task(listener.start())
+    # Dar tiempo a que el listener arranque antes de programar
+    await asyncio.sleep(2)
+
+    now = datetime.now()
+    step = (duration - 5) / reminders
+    for i in range(reminders):
+        await listener.db.create_reminder(
+            reminder_id=f"bench_listener_{i}",
+            user_id=BENCH_USER,
+            title=f"Recordatorio {i}",
+            message="bench",
+            trigger_time=now + timedelta(seconds=2 + i * step),
+        )
+
+    await asyncio.sleep(duration)
+    listener.stop()
+    listener._wake.set()
+    await task
+
+    await listener.db.connect()
+    async with listener.db.pool.acquire() as conn:
+        await conn.execute("DELETE FROM reminders WHERE user_id = $1", BENCH_USER)
+    await listener.db.disconnect()
+    return listener.stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=20)
+    parser.add_argument("--duration", type=int, default=120)
+    args = parser.parse_args()
+
+    database_url = get_settings().database_url
+    for mode in ("poll", "notify"):
+        stats = await run(mode, database_url, args.reminders, args.duration)
+        fired = stats["fired"]
+        avg_lag = stats["lag_total"] / fired if fired else 0.0
+        print(
+            f"{mode:>6}: {fired} disparos, retraso medio {avg_lag:.3f}s, "
+            f"máximo {stats['lag_max']:.3f}s, {stats['queries']} consultas "
+            f"({stats['queries'] / args.duration * 60:.1f}/min)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark del outbox de escrituras diferidas (OutboxDatabase).
+
+Mide la latencia que ve el usuario al crear una tarea directamente en
+PostgreSQL y a través del outbox, y cuánto tarda el outbox en aplicar
+todo en PostgreSQL. Al final comprueba que ninguna tarea se perdió ni se
+duplicó. Usa un usuario sintético que se elimina al terminar.
+
+Uso:
+    DATABASE_URL=postgresql://... uv run python scripts/bench_outbox.py --ops 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.pg_outbox import OutboxDatabase
+from src.integrations.postgres_db import PostgresDatabase
+from src.utils.config import get_settings
+
+BENCH_USER = "bench_outbox"
+
+
+def report(label: str, latencies: list):
+    """Imprime la mediana y el p99 de las latencias (ms)."""
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:>22}: p50 {statistics.median(latencies):6.2f} ms  p99 {p99:6.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--outbox", default="data/bench_outbox.db")
+    args = parser.parse_args()
+
+    Path(args.outbox).unlink(missing_ok=True)
+    db = PostgresDatabase(get_settings().database_url)
+    await db.connect()
+    outbox = OutboxDatabase(db, outbox_path=args.outbox)
+    await outbox.start()
+
+    try:
+        async with db.pool.acquire() as conn:
+            await conn.execute("DELETE FROM tasks WHERE user_id = $1", BENCH_USER)
+
+        for label, target, prefix in (("directo", db, "direct"), ("outbox", outbox, "outbox")):
+            latencies = []
+            for i in range(args.ops):
+                start = time.perf_counter()
+                await target.create_task(f"bench_{prefix}_{i}", BENCH_USER, f"Tarea {i}")
+                latencies.append((time.perf_counter() - start) * 1000)
+            report(label, latencies)
+
+        visible = await outbox.list_tasks(BENCH_USER, "all", limit=10)
+        pending = outbox.pending_count
+        print(f"Primera página vía outbox: {len(visible)} tareas ({pending} pendientes)")
+
+        start = time.perf_counter()
+        while outbox.pending_count:
+            await asyncio.sleep(0.05)
+        print(f"Outbox aplicado en PostgreSQL en {time.perf_counter() - start:.2f}s")
+
+        async with db.pool.acquire() as conn:
+            stored = await conn.fetchval(
+                "SELECT COUNT(*) FROM tasks WHERE user_id = $1 AND id LIKE 'bench_outbox_%'",
+                BENCH_USER,
+            )
+        print(f"Tareas del outbox en PostgreSQL: {stored}/{args.ops}")
+
+    finally:
+        await outbox.stop()
+        async with db.pool.acquire() as conn:
+            await conn.execute("DELETE FROM tasks WHERE user_id = $1", BENCH_USER)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
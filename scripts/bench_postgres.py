@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de PostgresDatabase: crear, listar y completar tareas.
+
+Compara la ruta de una tarea por llamada con las rutas en lote
+(executemany/COPY y UPDATE con ANY) sobre un usuario sintético que se
+elimina al terminar.
+
+Uso:
+    DATABASE_URL=postgresql://... uv run python scripts/bench_postgres.py --ops 10000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.postgres_db import PostgresDatabase
+from src.utils.config import get_settings
+
+BENCH_USER = "bench_postgres"
+
+
+def report(label: str, ops: int, elapsed: float):
+    """Imprime tiempo total y throughput de una fase."""
+    print(f"{label:>28}: {elapsed:7.2f}s  ({ops / elapsed:,.0f} ops/s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    db = PostgresDatabase(
+        settings.database_url,
+        min_size=args.concurrency,
+        max_size=args.concurrency,
+    )
+
+    start = time.perf_counter()
+    await db.connect()
+    print(f"Conexión + warm-up del pool: {time.perf_counter() - start:.2f}s")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    try:
+        async with db.pool.acquire() as conn:
+            await conn.execute("DELETE FROM tasks WHERE user_id = $1", BENCH_USER)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                bounded(db.create_task(f"bench_single_{i}", BENCH_USER, f"Tarea {i}"))
+                for i in range(args.ops)
+            )
+        )
+        report("create_task (individual)", args.ops, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await db.create_tasks(
+            BENCH_USER,
+            [{"id": f"bench_batch_{i}", "title": f"Tarea {i}"} for i in range(args.ops)],
+        )
+        report("create_tasks (COPY)", args.ops, time.perf_counter() - start)
+
+        runs = 100
+        start = time.perf_counter()
+        for _ in range(runs):
+            tasks = await db.list_tasks(BENCH_USER, filter_type="pending")
+        report(f"list_tasks ({len(tasks)} filas)", runs, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                bounded(db.complete_task(f"bench_single_{i}", BENCH_USER))
+                for i in range(args.ops)
+            )
+        )
+        report("complete_task (individual)", args.ops, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await db.complete_tasks([f"bench_batch_{i}" for i in range(args.ops)], BENCH_USER)
+        report("complete_tasks (lote)", args.ops, time.perf_counter() - start)
+
+    finally:
+        async with db.pool.acquire() as conn:
+            await conn.execute("DELETE FROM tasks WHERE user_id = $1", BENCH_USER)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
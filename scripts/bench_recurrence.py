@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la expansión perezosa de series recurrentes.
+
+Compara consultar una ventana de una semana sobre N series guardadas como
+una fila (regla + primera repetición) con la alternativa de materializar
+cada repetición como un evento propio, y verifica que ambas coinciden.
+
+Uso:
+    uv run python scripts/bench_recurrence.py --series 1000 --years 5
+"""
+
+import argparse
+import heapq
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.recurrence import RecurrenceRule
+
+RULES = (
+    "FREQ=DAILY",
+    "FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR",
+    "FREQ=WEEKLY;BYDAY=MO,WE",
+    "FREQ=WEEKLY;INTERVAL=2",
+    "FREQ=MONTHLY",
+    "FREQ=YEARLY",
+)
+
+
+def make_series(count: int, seed: int = 5):
+    """Series que empiezan a lo largo de un año, a horas en punto."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    return [
+        (
+            base + timedelta(days=rng.randrange(365), hours=rng.randrange(8, 20)),
+            RecurrenceRule.parse(rng.choice(RULES)),
+            i,
+        )
+        for i in range(count)
+    ]
+
+
+def tagged(series_item, start: datetime, end: datetime):
+    """Repeticiones de una serie en [start, end) como (inicio, índice de la serie)."""
+    dtstart, rule, i = series_item
+    for occurrence in rule.occurrences(dtstart, start, end):
+        yield occurrence, i
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    series = make_series(args.series)
+    horizon = datetime(2025, 1, 1) + timedelta(days=365 * args.years)
+    rng = random.Random(3)
+    windows = []
+    for _ in range(args.queries):
+        start = datetime(2025, 1, 1) + timedelta(days=rng.randrange(365 * args.years - 7))
+        windows.append((start, start + timedelta(days=7)))
+
+    t0 = time.perf_counter()
+    materialized = sorted(
+        (occurrence, i)
+        for dtstart, rule, i in series
+        for occurrence in rule.occurrences(dtstart, end=horizon)
+    )
+    starts = [occurrence for occurrence, _ in materialized]
+    elapsed = time.perf_counter() - t0
+    print(f"Materializado: {len(materialized)} filas para {len(series)} series ({elapsed:.2f}s)")
+
+    t0 = time.perf_counter()
+    lazy_total = 0
+    for start, end in windows:
+        lazy = list(heapq.merge(*(tagged(series_item, start, end) for series_item in series)))
+        lazy_total += len(lazy)
+        eager = materialized[bisect_left(starts, start) : bisect_left(starts, end)]
+        assert lazy == eager, "la expansión perezosa no coincide"
+    per_query = (time.perf_counter() - t0) / args.queries
+    print(
+        f"Expansión perezosa: {per_query * 1e3:.2f}ms/semana "
+        f"({lazy_total / args.queries:.0f} repeticiones, resultados verificados)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recuperación de recordatorios al arrancar (ReminderStore).
+
+Guarda --count recordatorios repartidos en los próximos --days días (y un
+1% ya vencidos, como tras un apagado) en un archivo temporal, arranca un
+ReminderScheduler sobre él y mide cuánto tarda start() en recuperarlos y
+cuántos jobs quedan armados en APScheduler. Después mide reminder_list y
+comprueba que no se perdió ninguno.
+
+Uso:
+    uv run python scripts/bench_reminder_store.py --count 100000 --days 30
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.database import TaskDatabase
+from src.integrations.reminder_store import ReminderJob, ReminderStore
+from src.integrations.scheduler import ReminderScheduler
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--horizon", type=int, default=6, help="Ventana de armado en horas")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReminderStore(f"{tmp}/reminders.db")
+        await store.open()
+
+        now = datetime.now()
+        step = timedelta(days=args.days) / args.count
+        jobs = [
+            ReminderJob(
+                id=f"reminder_{i}",
+                title=f"Recordatorio {i}",
+                message="Benchmark",
+                # El 1% vencidos, el resto repartidos en los próximos días
+                trigger_time=now + step * i if i % 100 else now - step * i,
+                kind="alarm" if i % 10 == 0 else "reminder",
+                sound_type="beep" if i % 10 == 0 else None,
+            )
+            for i in range(args.count)
+        ]
+        start = time.perf_counter()
+        await store.save_many(jobs)
+        print(f"{args.count} recordatorios guardados en {time.perf_counter() - start:.2f}s")
+        await store.close()
+
+        scheduler = ReminderScheduler(
+            task_db=TaskDatabase(db_path=f"{tmp}/tasks.db"),
+            store=ReminderStore(f"{tmp}/reminders.db"),
+            arm_horizon=timedelta(hours=args.horizon),
+        )
+        # Que los vencidos no se disparen durante la medición
+        scheduler.scheduler.start(paused=True)
+        start = time.perf_counter()
+        await scheduler.store.open()
+        await scheduler._rehydrate()
+        elapsed = time.perf_counter() - start
+        armed = len(scheduler.scheduler.get_jobs())
+        print(f"Recuperación al arrancar: {elapsed:.2f}s ({armed} jobs armados)")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            await scheduler.list_reminders(limit=50)
+        print(f"reminder_list: {(time.perf_counter() - start) * 10:.2f} ms/op")
+
+        stored = await scheduler.store.count()
+        print(f"Recordatorios en el almacén: {stored} de {args.count}")
+        await scheduler.stop()
+        return 0 if stored == args.count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
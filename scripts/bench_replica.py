@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la réplica local (ReplicaDatabase) frente a PostgreSQL.
+
+Sincroniza la réplica de un usuario y compara la latencia de las
+lecturas del PC (tareas pendientes, agenda de la semana y recordatorios)
+contra PostgreSQL y contra la réplica. También mide la carga inicial y
+una pasada incremental sin cambios.
+
+Uso:
+    DATABASE_URL=postgresql://... uv run python scripts/bench_replica.py --user default
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.pg_replica import ReplicaDatabase
+from src.integrations.postgres_db import PostgresDatabase
+from src.utils.config import get_settings
+
+
+async def timed(label: str, runs: int, read):
+    """Ejecuta read runs veces e imprime la latencia media."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = await read()
+    elapsed = (time.perf_counter() - start) / runs * 1000
+    print(f"{label:>32}: {elapsed:7.2f} ms/lectura ({len(result)} filas)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user", default="default")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--replica", default="data/bench_replica.db")
+    args = parser.parse_args()
+
+    Path(args.replica).unlink(missing_ok=True)
+    db = PostgresDatabase(get_settings().database_url)
+    await db.connect()
+    replica = ReplicaDatabase(db, [args.user], args.replica, max_staleness=3600)
+    await replica.initialize()
+
+    try:
+        start = time.perf_counter()
+        totals = await replica.sync()
+        print(f"Carga inicial: {totals['upserted']} filas en {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        await replica.sync()
+        print(f"Pasada incremental: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        now = datetime.now()
+        for source, target in (("PostgreSQL", db), ("réplica", replica)):
+            await timed(
+                f"tareas pendientes ({source})",
+                args.runs,
+                lambda: target.list_tasks(args.user, "pending"),
+            )
+            await timed(
+                f"agenda 7 días ({source})",
+                args.runs,
+                lambda: target.list_events(args.user, now, now + timedelta(days=7)),
+            )
+            await timed(
+                f"recordatorios ({source})",
+                args.runs,
+                lambda: target.list_reminders(args.user),
+            )
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda de texto completo sobre TaskDatabase (SQLite FTS5).
+
+Carga N tareas sintéticas (los triggers mantienen el índice) y mide
+consultas típicas del usuario.
+
+Uso:
+    uv run python scripts/bench_search.py --tasks 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import aiosqlite
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.database import TaskDatabase
+
+VERBS = ["revisar", "comprar", "llamar", "enviar", "preparar", "pagar", "estudiar", "limpiar"]
+NOUNS = ["emails", "factura", "informe", "dentista", "leche", "código", "presentación", "casa"]
+
+
+async def populate(db_path: str, total: int, users: int):
+    """Inserta tareas con títulos combinando verbos y sustantivos comunes."""
+    now = datetime.now().isoformat()
+    batch = []
+    async with aiosqlite.connect(db_path) as db:
+        for i in range(total):
+            title = f"{random.choice(VERBS)} {random.choice(NOUNS)} {i}"
+            batch.append((f"bench_{i}", str(100_000 + i % users), title, f"nota {i}", now))
+            if len(batch) == 50_000:
+                await db.executemany(
+                    "INSERT INTO tasks (id, user_id, title, description, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    batch,
+                )
+                batch.clear()
+        if batch:
+            await db.executemany(
+                "INSERT INTO tasks (id, user_id, title, description, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--db", default="data/bench_search.db")
+    args = parser.parse_args()
+
+    Path(args.db).unlink(missing_ok=True)
+    db = TaskDatabase(db_path=args.db)
+    await db.initialize()
+
+    start = time.perf_counter()
+    await populate(args.db, args.tasks, args.users)
+    print(f"Carga de {args.tasks} tareas: {time.perf_counter() - start:.1f}s")
+
+    for query in ("revisar emails", "factura", "dentis", "presentacion"):
+        start = time.perf_counter()
+        for run in range(args.runs):
+            results = await db.search(str(100_000 + run % args.users), query, limit=10)
+        elapsed = (time.perf_counter() - start) / args.runs * 1000
+        print(f"{query!r:>18}: {elapsed:.2f} ms/consulta ({len(results)} resultados)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escrituras concurrentes: un archivo SQLite frente a shards.
+
+Lanza un escritor por usuario que crea tareas a la vez que los demás y
+mide tareas/segundo con TaskDatabase (un archivo) y con
+ShardedTaskDatabase en modo user. Con un archivo los escritores se
+esperan en el lock de la base; con shards el rendimiento debería crecer
+con el número de usuarios activos.
+
+Uso:
+    uv run python scripts/bench_shards.py --users 1 4 16 --tasks 200
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.database import TaskDatabase
+from src.integrations.sharded_database import ShardedTaskDatabase
+
+
+async def write_load(db, users: int, tasks: int) -> float:
+    """Crea tasks tareas por usuario con un escritor concurrente por usuario."""
+
+    async def writer(user: int):
+        for i in range(tasks):
+            await db.create_task(f"u{user}_t{i}", f"user_{user}", f"Tarea {i}", tags=["bench"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(user) for user in range(users)))
+    return users * tasks / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--max-open", type=int, default=32)
+    parser.add_argument("--dir", default="data/bench_shards")
+    args = parser.parse_args()
+
+    base = Path(args.dir)
+    for users in args.users:
+        shutil.rmtree(base, ignore_errors=True)
+        single = TaskDatabase(db_path=str(base / "single.db"))
+        await single.initialize()
+        sharded = ShardedTaskDatabase(
+            base_dir=str(base / "shards"), mode="user", max_open=args.max_open
+        )
+
+        single_rate = await write_load(single, users, args.tasks)
+        sharded_rate = await write_load(sharded, users, args.tasks)
+        print(
+            f"{users:>3} usuarios: un archivo {single_rate:8.0f} tareas/s, "
+            f"shards {sharded_rate:8.0f} tareas/s ({sharded.open_count} abiertos)"
+        )
+
+        start = time.perf_counter()
+        result = await sharded.maintenance()
+        print(f"    mantenimiento de {result['shards']} shards: {time.perf_counter() - start:.2f}s")
+
+    shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
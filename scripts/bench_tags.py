@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark del índice de etiquetas sobre TaskDatabase (SQLite).
+
+Carga N tareas con dos etiquetas cada una y mide el filtro por etiqueta
+de list_tasks y el conteo por etiqueta, mostrando los planes de consulta
+para confirmar que ambos se resuelven sobre los índices de task_tags.
+
+Uso:
+    uv run python scripts/bench_tags.py --tasks 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.database import TaskDatabase
+
+
+async def populate(db_path: str, total: int, users: int, tags: int):
+    """Inserta tareas con una etiqueta común y otra poco frecuente."""
+    now = datetime.now()
+    tasks, task_tags = [], []
+    async with aiosqlite.connect(db_path) as db:
+        for i in range(total):
+            task_id, user_id, completed = f"bench_{i}", f"user_{i % users}", i % 5 == 0
+            created = now - timedelta(minutes=i)
+            tasks.append((task_id, user_id, f"Tarea {i}", "medium", completed, created.isoformat()))
+            for tag in (f"area_{i % 10}", f"tag_{random.randrange(tags)}"):
+                task_tags.append((task_id, user_id, tag, completed))
+            if len(tasks) == 50_000 or i == total - 1:
+                await db.executemany(
+                    """
+                    INSERT INTO tasks (id, user_id, title, priority, completed, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    tasks,
+                )
+                await db.executemany(
+                    """
+                    INSERT OR IGNORE INTO task_tags (task_id, user_id, tag, completed)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    task_tags,
+                )
+                tasks, task_tags = [], []
+        await db.execute("ANALYZE")
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--db", default="data/bench_tags.db")
+    args = parser.parse_args()
+
+    Path(args.db).unlink(missing_ok=True)
+    db = TaskDatabase(db_path=args.db)
+    await db.initialize()
+
+    start = time.perf_counter()
+    await populate(args.db, args.tasks, args.users, args.tags)
+    print(f"Carga de {args.tasks} tareas: {time.perf_counter() - start:.1f}s")
+
+    async with aiosqlite.connect(args.db) as conn:
+        for label, sql, params in (
+            (
+                "filtro",
+                "SELECT * FROM tasks WHERE user_id = ? AND completed = 0 AND id IN "
+                "(SELECT task_id FROM task_tags WHERE user_id = ? AND tag = ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                ("user_0", "user_0", "tag_1", 10),
+            ),
+            (
+                "conteo",
+                "SELECT tag, COUNT(*) FROM task_tags WHERE user_id = ? AND completed = 0 "
+                "GROUP BY tag",
+                ("user_0",),
+            ),
+        ):
+            async with conn.execute(f"EXPLAIN QUERY PLAN {sql}", params) as cursor:
+                for row in await cursor.fetchall():
+                    print(f"Plan ({label}): {row[-1]}")
+
+    for label, tag in (("etiqueta rara", "tag_{}"), ("etiqueta común", "area_{}")):
+        start = time.perf_counter()
+        for run in range(args.runs):
+            await db.list_tasks(
+                f"user_{run % args.users}", "pending", limit=50, tag=tag.format(run % 10)
+            )
+        elapsed = (time.perf_counter() - start) / args.runs * 1000
+        print(f"{label:>14}: {elapsed:.2f} ms/consulta")
+
+    start = time.perf_counter()
+    for run in range(args.runs):
+        await db.tag_counts(f"user_{run % args.users}")
+    elapsed = (time.perf_counter() - start) / args.runs * 1000
+    print(f"{'conteo':>14}: {elapsed:.2f} ms/consulta")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
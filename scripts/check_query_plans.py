@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Verifica que las consultas frecuentes de PostgresDatabase usen índices.
+
+Crea un esquema temporal, aplica las migraciones, lo llena con datos
+sintéticos y ejecuta EXPLAIN sobre cada consulta de QUERIES y los reclamos
+de recordatorios. Termina con código 1 si alguna hace Seq Scan sobre
+tasks, events, reminders o sus tablas de lápidas.
+
+Uso:
+    DATABASE_URL=postgresql://... uv run python scripts/check_query_plans.py
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import asyncpg
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.integrations.pg_maintenance import ensure_reminder_partitions
+from src.integrations.pg_migrations import apply_migrations
+from src.integrations.postgres_db import QUERIES, WRITES
+from src.utils.config import get_settings
+
+SCHEMA = "query_plan_check"
+HOT_TABLES = (
+    "tasks",
+    "events",
+    "reminders",
+    "event_tombstones",
+    "task_tombstones",
+    "reminder_tombstones",
+)
+
+# Escrituras que filtran por algo distinto de la clave primaria
+CHECKED_WRITES = ("reminders_claim", "reminders_claim_all")
+
+
+def sample_params() -> dict:
+    """Parámetros representativos para cada consulta revisada (primera página)."""
+    now = datetime.now(timezone.utc)
+    lease, window = timedelta(seconds=60), timedelta(minutes=10)
+    return {
+        "tasks_all": ("user_1", None, None, 50),
+        "tasks_pending": ("user_1", None, None, 50),
+        "tasks_urgent": ("user_1", None, None, 50),
+        "tasks_completed": ("user_1", None, None, 50),
+        "tasks_due_before": ("user_1", now, None, None, 50),
+        "tasks_due_between": ("user_1", now, now + timedelta(days=7), None, None, 50),
+        "events_between": ("user_1", now, now + timedelta(days=30), None, None, 50),
+        "tasks_tagged": ("user_1", "tag_7", False, None, None, None, 50),
+        "tasks_tagged_due": ("user_1", "tag_7", None, now + timedelta(days=7), None, None, 50),
+        "tasks_schedulable": ("user_1", 100),
+        "task_get": ("task_1", "user_1"),
+        "reminder_get": ("reminder_1", "user_1"),
+        "tag_counts": ("user_1", False),
+        "events_series": ("user_1", now, now + timedelta(days=30)),
+        "events_changed": ("user_1", now - timedelta(minutes=5)),
+        "event_tombstones_since": ("user_1", now - timedelta(minutes=5)),
+        "tasks_changed": ("user_1", now - timedelta(minutes=5), "", 1000),
+        "events_changed_page": ("user_1", now - timedelta(minutes=5), "", 1000),
+        "reminders_changed": ("user_1", now - timedelta(minutes=5), "", 1000),
+        "task_tombstones_since": ("user_1", now - timedelta(minutes=5)),
+        "reminder_tombstones_since": ("user_1", now - timedelta(minutes=5)),
+        "reminders_due": ("user_1",),
+        "reminders_pending": ("user_1", None, None, 50),
+        "reminders_claim": (["user_1", "user_2"], "worker", lease, 100, window),
+        "reminders_claim_all": ("worker", lease, 100, window),
+    }
+
+
+async def populate(conn: asyncpg.Connection, rows: int, users: int):
+    """Llena las tablas con datos repartidos entre usuarios y fechas."""
+    await conn.execute(
+        """
+        INSERT INTO tasks (id, user_id, title, priority, due_date, completed,
+                           created_at, completed_at, tags)
+        SELECT 'task_' || g, 'user_' || (g % $2), 'Tarea ' || g,
+               CASE WHEN g % 10 = 0 THEN 'urgent' ELSE 'medium' END,
+               NOW() + ((g % 360) - 180) * INTERVAL '1 day',
+               g % 3 = 0,
+               NOW() - g * INTERVAL '1 minute',
+               CASE WHEN g % 3 = 0 THEN NOW() END,
+               ARRAY['tag_' || (g % 997), 'tag_' || (g % 13)]
+        FROM generate_series(1, $1) AS g
+        """,
+        rows,
+        users,
+    )
+    await conn.execute(
+        """
+        INSERT INTO events (id, user_id, title, start_time, end_time)
+        SELECT 'event_' || g, 'user_' || (g % $2), 'Evento ' || g,
+               NOW() + ((g % 720) - 360) * INTERVAL '1 hour',
+               NOW() + ((g % 720) - 359) * INTERVAL '1 hour'
+        FROM generate_series(1, $1) AS g
+        """,
+        rows,
+        users,
+    )
+    # Meses pasados de los recordatorios de prueba (no quedan en reminders_default)
+    await ensure_reminder_partitions(conn, since=datetime.now(timezone.utc) - timedelta(days=16))
+    await conn.execute(
+        """
+        INSERT INTO reminders (id, user_id, title, message, trigger_time, executed)
+        SELECT 'reminder_' || g, 'user_' || (g % $2), 'Recordatorio ' || g, 'Mensaje',
+               NOW() + ((g % 720) - 360) * INTERVAL '1 hour',
+               g % 4 <> 0
+        FROM generate_series(1, $1) AS g
+        """,
+        rows,
+        users,
+    )
+    for table in ("event_tombstones", "task_tombstones", "reminder_tombstones"):
+        await conn.execute(
+            f"""
+            INSERT INTO {table} (id, user_id, deleted_at)
+            SELECT 'deleted_' || g, 'user_' || (g % $2), NOW() - g * INTERVAL '1 minute'
+            FROM generate_series(1, $1 / 10) AS g
+            """,
+            rows,
+            users,
+        )
+    await conn.execute("ANALYZE")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(get_settings().database_url)
+    failures = []
+    try:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}")
+
+        await apply_migrations(conn)
+        await populate(conn, args.rows, args.users)
+
+        params = sample_params()
+        statements = {**QUERIES, **{name: WRITES[name] for name in CHECKED_WRITES}}
+        for name, sql in statements.items():
+            plan = "\n".join(
+                row[0] for row in await conn.fetch(f"EXPLAIN {sql}", *params[name])
+            )
+            seq_scans = [t for t in HOT_TABLES if f"Seq Scan on {t}" in plan]
+            status = "FAIL" if seq_scans else "ok"
+            print(f"[{status}] {name}")
+            if seq_scans:
+                failures.append(name)
+                print(plan)
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+    if failures:
+        print(f"\nConsultas con Seq Scan: {', '.join(failures)}")
+        return 1
+    print("\nTodas las consultas frecuentes usan índices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -4,20 +4,31 @@ Local Listener - Ejecuta alarmas y notificaciones en PC local.
 
 Este script:
 1. Se conecta a PostgreSQL compartido
-2. Monitorea recordatorios/alarmas pendientes cada 30 segundos
+2. Reclama los recordatorios que vencen en los próximos minutos y los
+   dispara con timers locales; LISTEN/NOTIFY avisa de altas, cambios y
+   cancelaciones, y el sondeo queda solo como respaldo
 3. Ejecuta alarmas con sonido y notificaciones desktop
-4. Sincroniza con Calcurse local
+4. Sincroniza con Calcurse local en ambos sentidos (solo los cambios)
 5. Marca como ejecutados en la base de datos
+6. Archiva lo terminado y rota las particiones de reminders (ver retention
+   en agent_config.yaml)
+7. Mantiene al día la réplica local en SQLite (REPLICA_PATH) de la que
+   el agente lee las tareas con REPLICA_ENABLED, sin cruzar la WAN
 
 Uso:
     uv run python scripts/local_listener.py
 """
 
 import asyncio
+import heapq
 import logging
+import os
+import socket
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,8 +36,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.integrations.postgres_db import PostgresDatabase
 from src.integrations.notifications import NotificationManager, NotificationPriority
 from src.integrations.alarm import AlarmManager, AlarmSound
-from src.integrations.calcurse import Calcurse
-from src.utils.config import get_settings
+from src.integrations.calcurse_client import AsyncCalcurse
+from src.integrations.calendar_sync import CalendarSync
+from src.integrations.pg_replica import ReplicaDatabase
+from src.integrations.repository import parse_database_url
+from src.utils.config import get_settings, load_yaml_config
+from src.utils.dates import as_local
+from src.utils.retention import RetentionPolicy
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,22 +59,108 @@ class LocalListener:
     hardware local (sonido, notificaciones desktop, Calcurse).
     """
 
-    def __init__(self, database_url: str, user_id: str = "default"):
+    # Intervalo de sondeo sin LISTEN (conexión caída o use_notify=False) y
+    # de reintento de recordatorios que fallaron al ejecutarse
+    FALLBACK_INTERVAL = 30
+
+    # Recordatorios reclamados por viaje y tiempo que el reclamo bloquea a
+    # otros listeners (si este se cae, vuelven a estar disponibles después)
+    CLAIM_BATCH_SIZE = 100
+    CLAIM_LEASE = timedelta(seconds=60)
+
+    # Reintento de una confirmación que falló (segundos, dentro del lease)
+    ACK_RETRY_INTERVAL = 5
+
+    # Ventana de recordatorios que se reclaman por adelantado y se disparan
+    # con timers locales
+    LOOKAHEAD = timedelta(minutes=10)
+
+    def __init__(
+        self,
+        database_url: str,
+        user_ids: Optional[Iterable[str]] = ("default",),
+        pool_min_size: int = 2,
+        poll_interval: int = 300,
+        use_notify: bool = True,
+        calendar_path: Optional[str] = None,
+        calendar_sync_interval: int = 300,
+        retention: Optional[RetentionPolicy] = None,
+        replica_path: Optional[str] = None,
+        replica_sync_interval: int = 30,
+        replica_max_staleness: int = 60,
+    ):
         """
         Inicializa el listener.
 
         Args:
             database_url: Connection string de PostgreSQL
-            user_id: ID del usuario a monitorear
+            user_ids: IDs de los usuarios atendidos por este PC, o None para todos
+            pool_min_size: Conexiones abiertas y preparadas desde el arranque
+            poll_interval: Sondeo de respaldo (segundos) mientras LISTEN está activo
+            use_notify: False vuelve al sondeo fijo cada FALLBACK_INTERVAL
+            calendar_path: Directorio de datos de calcurse
+            calendar_sync_interval: Segundos entre sincronizaciones con calcurse
+            retention: Política de archivo y mantenimiento (None lo desactiva)
+            replica_path: Archivo de la réplica local (None la desactiva)
+            replica_sync_interval: Segundos entre pasadas de la réplica
+            replica_max_staleness: Antigüedad máxima (segundos) de las lecturas de la réplica
         """
-        self.db = PostgresDatabase(database_url)
-        self.user_id = user_id
+        self.db = PostgresDatabase(database_url, min_size=pool_min_size)
+        self.user_ids = None if user_ids is None else frozenset(user_ids)
+        self.poll_interval = poll_interval
+        self.use_notify = use_notify
         self.notifications = NotificationManager()
         self.alarm_manager = AlarmManager()
-        self.calcurse = Calcurse()
+        self.calcurse = AsyncCalcurse(calendar_path)
+        self.calendar_sync_interval = calendar_sync_interval
+        self.retention = retention
         self.running = False
+        self._wake = asyncio.Event()
+        # Identifica los reclamos de este proceso frente a otros listeners
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Min-heap (trigger_time, id) de los recordatorios reclamados en la
+        # ventana; _scheduled es la fuente de verdad y descarta entradas viejas
+        self._timers: List[Tuple[datetime, str]] = []
+        self._scheduled: Dict[str, dict] = {}
+        self._refresh_at = 0.0
+        # Disparados cuya confirmación falló: se reintenta y no se rearman
+        self._unacked: Dict[str, dict] = {}
+
+        # Métricas: consultas a la base, retraso de disparo y disparos por usuario
+        self.stats = {
+            "queries": 0,
+            "fired": 0,
+            "lag_total": 0.0,
+            "lag_max": 0.0,
+            "fired_by_user": {},
+        }
+
+        # El calendario local tiene un solo dueño: las citas creadas en
+        # calcurse se guardan a su nombre
+        self.calendar_sync: Optional[CalendarSync] = None
+        if self.user_ids is not None and len(self.user_ids) == 1:
+            (owner,) = self.user_ids
+            self.calendar_sync = CalendarSync(self.db, self.calcurse, owner)
+        else:
+            logger.warning("Sincronización con Calcurse desactivada: requiere un único usuario")
+
+        # La réplica se pide por usuario: necesita la lista de usuarios atendidos
+        self.replica: Optional[ReplicaDatabase] = None
+        if replica_path and self.user_ids is not None:
+            self.replica = ReplicaDatabase(
+                self.db,
+                self.user_ids,
+                replica_path,
+                sync_interval=replica_sync_interval,
+                max_staleness=replica_max_staleness,
+                retention=retention,
+            )
+        elif replica_path:
+            logger.warning("Réplica local desactivada: requiere LISTENER_USER_IDS explícitos")
 
-        logger.info(f"LocalListener inicializado para user_id: {user_id}")
+        served = "todos" if self.user_ids is None else ", ".join(sorted(self.user_ids))
+        logger.info(f"LocalListener inicializado para usuarios: {served}")
 
     async def start(self):
         """Inicia el listener."""
@@ -77,48 +179,201 @@ class LocalListener:
             )
 
             self.running = True
+            sync_task = asyncio.create_task(self._calendar_sync_loop())
+            maintenance_task = asyncio.create_task(self._maintenance_loop())
+            replica_task = None
+            if self.replica is not None:
+                await self.replica.initialize()
+                replica_task = asyncio.create_task(self.replica.run())
 
             # Loop principal
             while self.running:
                 try:
-                    await self._check_and_execute_reminders()
-                    await asyncio.sleep(30)  # Check cada 30 segundos
+                    if self._wake.is_set() or time.monotonic() >= self._refresh_at:
+                        # Limpiar antes de consultar: un NOTIFY que llegue
+                        # durante la consulta vuelve a despertar el loop
+                        self._wake.clear()
+                        await self._ensure_listening()
+                        await self._refresh_timers()
+                    await self._fire_due()
+                    timeout = self._next_wait()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
                 except KeyboardInterrupt:
                     logger.info("Deteniendo listener...")
                     break
                 except Exception as e:
                     logger.error(f"Error en loop principal: {e}")
-                    await asyncio.sleep(30)
+                    await asyncio.sleep(self.FALLBACK_INTERVAL)
+
+            sync_task.cancel()
+            maintenance_task.cancel()
+            if replica_task is not None:
+                replica_task.cancel()
 
         except Exception as e:
             logger.error(f"Error fatal: {e}")
         finally:
+            self._log_stats()
             await self.db.disconnect()
             logger.info("Local Listener detenido")
 
-    async def _check_and_execute_reminders(self):
-        """Verifica y ejecuta recordatorios pendientes."""
+    async def _ensure_listening(self):
+        """Abre (o reabre tras una caída) la conexión de LISTEN."""
+        if not self.use_notify or self.db.listening:
+            return
         try:
-            # Obtener recordatorios pendientes
-            reminders = await self.db.get_pending_reminders(self.user_id)
-
-            if not reminders:
+            await self.db.listen_reminders(self._on_reminder_change)
+        except Exception as e:
+            logger.warning(f"LISTEN no disponible, sondeando cada {self.FALLBACK_INTERVAL}s: {e}")
+
+    def _on_reminder_change(self, change: dict):
+        """Despierta el loop si el cambio afecta a la ventana de los usuarios atendidos."""
+        if self.user_ids is not None and change.get("user_id") not in self.user_ids:
+            return
+        if self.replica is not None:
+            self.replica.request_sync()
+        # Marcar como ejecutado no cambia ningún timer
+        if change.get("op") == "UPDATE" and change.get("executed"):
+            return
+        if change.get("id") not in self._scheduled:
+            if change.get("op") == "DELETE":
                 return
+            trigger = change.get("trigger_time")
+            if trigger and as_local(datetime.fromisoformat(trigger)) > (
+                datetime.now() + self.LOOKAHEAD
+            ):
+                # Fuera de la ventana: lo reclamará un refresco posterior
+                return
+        self._wake.set()
 
-            logger.info(f"📋 {len(reminders)} recordatorios pendientes encontrados")
+    async def _refresh_timers(self):
+        """
+        Reclama la ventana y reconcilia los timers locales.
+
+        El reclamo devuelve el conjunto completo de recordatorios de este
+        worker en la ventana (los ya reclamados se renuevan), así que los
+        timers se reconstruyen a partir de él: cancelaciones y cambios de
+        hora quedan reflejados sin lógica aparte. Los ya disparados que
+        esperan confirmación también vuelven (su reclamo se renueva), pero
+        no se rearman. Si el reclamo falla se conservan los timers actuales.
+        """
+        interval = self.poll_interval if self.db.listening else self.FALLBACK_INTERVAL
+        interval = min(interval, self.LOOKAHEAD.total_seconds() / 2)
 
-            for reminder in reminders:
-                try:
-                    await self._execute_reminder(reminder)
-                    # Marcar como ejecutado
-                    await self.db.mark_reminder_executed(reminder["id"])
-                except Exception as e:
-                    logger.error(
-                        f"Error ejecutando recordatorio {reminder['id']}: {e}"
-                    )
+        try:
+            self.stats["queries"] += 1
+            reminders = await self.db.claim_due_reminders(
+                None if self.user_ids is None else sorted(self.user_ids),
+                self.worker_id,
+                lease=self.CLAIM_LEASE,
+                limit=self.CLAIM_BATCH_SIZE,
+                lookahead=self.LOOKAHEAD,
+            )
+        except Exception as e:
+            logger.error(f"Error reclamando la ventana de recordatorios: {e}")
+            self._refresh_at = time.monotonic() + self.FALLBACK_INTERVAL
+            return
+
+        reminders = [r for r in reminders if r["id"] not in self._unacked]
+        self._scheduled = {reminder["id"]: reminder for reminder in reminders}
+        self._timers = [
+            (datetime.fromisoformat(reminder["trigger_time"]), reminder["id"])
+            for reminder in reminders
+        ]
+        heapq.heapify(self._timers)
+        self._refresh_at = time.monotonic() + interval
+
+        if len(reminders) == self.CLAIM_BATCH_SIZE:
+            # Ventana llena: volver a reclamar al disparar el último reclamado
+            last = max(trigger for trigger, _ in self._timers)
+            until_last = max((last - datetime.now()).total_seconds(), 0)
+            self._refresh_at = min(self._refresh_at, time.monotonic() + until_last)
+
+    def _next_wait(self) -> float:
+        """Segundos hasta el próximo timer, refresco o reintento de confirmación."""
+        wait = self._refresh_at - time.monotonic()
+        if self._unacked:
+            wait = min(wait, self.ACK_RETRY_INTERVAL)
+        if self._timers:
+            wait = min(wait, (self._timers[0][0] - datetime.now()).total_seconds())
+        return max(wait, 0)
+
+    def _record_lag(self, reminder: dict):
+        """Registra cuánto después de trigger_time se disparó el recordatorio."""
+        lag = (datetime.now() - datetime.fromisoformat(reminder["trigger_time"])).total_seconds()
+        self.stats["fired"] += 1
+        self.stats["lag_total"] += lag
+        self.stats["lag_max"] = max(self.stats["lag_max"], lag)
+        by_user = self.stats["fired_by_user"]
+        by_user[reminder["user_id"]] = by_user.get(reminder["user_id"], 0) + 1
+        logger.info(f"Retraso de disparo de {reminder['id']}: {lag:.3f}s")
+
+    def _log_stats(self):
+        """Resume las métricas de la ejecución."""
+        fired = self.stats["fired"]
+        avg_lag = self.stats["lag_total"] / fired if fired else 0.0
+        logger.info(
+            f"📊 {self.stats['queries']} consultas, {fired} disparos, "
+            f"retraso medio {avg_lag:.3f}s, máximo {self.stats['lag_max']:.3f}s"
+        )
+        for user_id, count in sorted(self.stats["fired_by_user"].items()):
+            logger.info(f"   {user_id}: {count} disparos")
+
+    async def _fire_due(self):
+        """
+        Ejecuta los timers vencidos y confirma el lote.
+
+        Los recordatorios ya están reclamados por este worker, así que
+        ningún otro listener los dispara. Confirmaciones y liberaciones van
+        en un solo viaje por lote; los recurrentes, en lugar de confirmarse,
+        pasan a su próxima repetición. Si la confirmación falla, los
+        disparados se guardan y se vuelve a intentar en la siguiente vuelta,
+        así no se disparan otra vez al vencer el lease.
+        """
+        now = datetime.now()
+        due = []
+        while self._timers and self._timers[0][0] <= now:
+            _, reminder_id = heapq.heappop(self._timers)
+            reminder = self._scheduled.pop(reminder_id, None)
+            if reminder is not None:
+                due.append(reminder)
+
+        if not due and not self._unacked:
+            return
+
+        executed, failed = [], []
+        for reminder in due:
+            try:
+                await self._execute_reminder(reminder)
+                self._record_lag(reminder)
+                executed.append(reminder)
+            except Exception as e:
+                logger.error(f"Error ejecutando recordatorio {reminder['id']}: {e}")
+                failed.append(reminder["id"])
+
+        for reminder in executed:
+            self._unacked[reminder["id"]] = reminder
+        try:
+            if self._unacked:
+                self.stats["queries"] += 1
+                await self.db.advance_reminders(list(self._unacked.values()), self.worker_id)
+                self._unacked.clear()
+        except Exception as e:
+            logger.error(
+                f"Error confirmando {len(self._unacked)} recordatorios, "
+                f"se reintenta en {self.ACK_RETRY_INTERVAL}s: {e}"
+            )
 
+        try:
+            if failed:
+                # Liberar para reintentar en el próximo refresco
+                self.stats["queries"] += 1
+                await self.db.release_reminders(failed, self.worker_id)
         except Exception as e:
-            logger.error(f"Error verificando recordatorios: {e}")
+            logger.error(f"Error liberando recordatorios: {e}")
 
     async def _execute_reminder(self, reminder: dict):
         """Ejecuta un recordatorio/alarma."""
@@ -127,7 +382,7 @@ class LocalListener:
         message = reminder["message"]
         priority = reminder.get("priority", "normal")
 
-        logger.info(f"⏰ Ejecutando {reminder_type}: {title}")
+        logger.info(f"⏰ Ejecutando {reminder_type} de {reminder['user_id']}: {title}")
 
         if reminder_type == "alarm":
             # Ejecutar alarma con sonido
@@ -161,47 +416,66 @@ class LocalListener:
         else:
             logger.warning(f"Tipo de recordatorio desconocido: {reminder_type}")
 
-    async def sync_events_to_calcurse(self):
+    async def sync_events_to_calcurse(self) -> Optional[dict]:
         """
-        Sincroniza eventos de PostgreSQL a Calcurse local.
-
-        Obtiene eventos de los próximos 30 días y los agrega a Calcurse.
-        """
-        try:
-            start_date = datetime.now()
-            end_date = start_date + timedelta(days=30)
-
-            events = await self.db.list_events(self.user_id, start_date, end_date)
-
-            for event in events:
-                # Convertir a formato Calcurse
-                start_time = datetime.fromisoformat(event["start_time"])
-                end_time = datetime.fromisoformat(event["end_time"])
+        Sincroniza en ambos sentidos los eventos de PostgreSQL y Calcurse.
 
-                self.calcurse.saveEvent(
-                    title=event["title"],
-                    date=start_time.strftime("%m/%d/%Y"),
-                    start_time=start_time.strftime("%H:%M"),
-                    end_time=end_time.strftime("%H:%M"),
-                )
+        Solo se envían los cambios desde la última pasada (ver CalendarSync).
 
-            logger.info(f"✅ {len(events)} eventos sincronizados a Calcurse")
+        Returns:
+            Contadores de la pasada, o None si no se sincronizó
+        """
+        if self.calendar_sync is None:
+            return None
 
+        try:
+            return await self.calendar_sync.sync()
         except Exception as e:
-            logger.error(f"Error sincronizando eventos a Calcurse: {e}")
+            logger.error(f"Error sincronizando eventos con Calcurse: {e}")
+            return None
+
+    async def _calendar_sync_loop(self):
+        """Sincroniza con Calcurse cada calendar_sync_interval segundos."""
+        while self.running:
+            await self.sync_events_to_calcurse()
+            await asyncio.sleep(self.calendar_sync_interval)
+
+    async def _maintenance_loop(self):
+        """Archiva y ejecuta el mantenimiento de PostgreSQL cada retention.interval."""
+        if self.retention is None:
+            return
+        while self.running:
+            # Con varios listeners, solo uno la ejecuta (advisory lock)
+            await self.db.run_maintenance(self.retention)
+            await asyncio.sleep(self.retention.interval.total_seconds())
 
     def stop(self):
         """Detiene el listener."""
         self.running = False
 
 
+def parse_user_ids(value: str) -> Optional[List[str]]:
+    """
+    Parsea LISTENER_USER_IDS.
+
+    Args:
+        value: IDs separados por comas, o "*" para todos los usuarios
+
+    Returns:
+        Lista de IDs, o None para todos
+    """
+    if value.strip() == "*":
+        return None
+    return [uid.strip() for uid in value.split(",") if uid.strip()] or ["default"]
+
+
 async def main():
     """Entry point del listener."""
     settings = get_settings()
 
-    # Verificar que DATABASE_URL esté configurado
-    database_url = settings.database_url
-    if not database_url or database_url == "sqlite+aiosqlite:///data/db/tasks.db":
+    # Verificar que DATABASE_URL apunte a PostgreSQL
+    backend, database_url = parse_database_url(settings.database_url)
+    if backend != "postgres":
         logger.error("❌ DATABASE_URL no configurado en .env")
         logger.error("Configura DATABASE_URL con tu connection string de PostgreSQL")
         logger.error(
@@ -209,11 +483,22 @@ async def main():
         )
         return
 
-    # Obtener user_id (por defecto "default", o desde Telegram)
-    user_id = "default"
+    # Usuarios atendidos por este PC (IDs de Telegram separados por comas, o *)
+    user_ids = parse_user_ids(settings.listener_user_ids)
 
     # Crear y ejecutar listener
-    listener = LocalListener(database_url, user_id)
+    listener = LocalListener(
+        database_url,
+        user_ids,
+        settings.database_pool_min_size,
+        poll_interval=settings.listener_poll_interval,
+        calendar_path=str(settings.calendar_path),
+        calendar_sync_interval=settings.calendar_sync_interval,
+        retention=RetentionPolicy.from_config(load_yaml_config()),
+        replica_path=str(settings.replica_path),
+        replica_sync_interval=settings.replica_sync_interval,
+        replica_max_staleness=settings.replica_max_staleness,
+    )
 
     try:
         await listener.start()
@@ -227,7 +512,7 @@ if __name__ == "__main__":
     print("🎧 LOCAL LISTENER - Agente Personal")
     print("=" * 60)
     print()
-    print("Este script monitorea PostgreSQL y ejecuta:")
+    print("Este script escucha PostgreSQL (LISTEN/NOTIFY) y ejecuta:")
     print("  • ⏰ Alarmas con sonido")
     print("  • 🔔 Notificaciones desktop")
     print("  • 📅 Sincronización con Calcurse")
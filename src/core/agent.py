@@ -11,16 +11,20 @@ from ..tools import (
     ToolRegistry,
     CalendarTool,
     CalendarGetAgendaTool,
+    CalendarFindFreeSlotsTool,
     TaskCreateTool,
     TaskListTool,
+    TaskTagsTool,
     TaskCompleteTool,
+    TaskAutoScheduleTool,
     NotificationSendTool,
     ReminderCreateTool,
     ReminderListTool,
     ReminderCancelTool,
     AlarmCreateTool,
+    SearchTool,
 )
-from ..integrations import NotificationManager
+from .services import ServiceContainer, build_services
 
 
 logger = logging.getLogger(__name__)
@@ -34,16 +38,25 @@ class PersonalAgent:
     todas las integraciones (calendario, notificaciones, etc.)
     """
 
-    def __init__(self, settings: Optional[Settings] = None, config: Optional[Dict] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        config: Optional[Dict] = None,
+        services: Optional[ServiceContainer] = None,
+    ):
         """
         Inicializa el agente personal.
 
+        Los servicios (base de datos, scheduler, alarmas) se crean en start().
+
         Args:
             settings: Configuración desde variables de entorno
             config: Configuración desde archivo YAML
+            services: Contenedor de servicios (por defecto build_services)
         """
         self.settings = settings
         self.config = config or {}
+        self.services = services or build_services(settings, self.config)
 
         # Cliente de OpenAI configurado para OpenRouter
         self.client = OpenAI(
@@ -54,12 +67,6 @@ class PersonalAgent:
         self.tool_registry = ToolRegistry()
         self._register_tools()
 
-        # Gestor de notificaciones
-        self.notification_manager = NotificationManager(
-            app_name=self.config.get("agent", {}).get("name", "Agente Personal"),
-            enable_sound=settings.notification_sound,
-        )
-
         # Historial de conversación por usuario
         self.conversation_history: Dict[str, List[Dict[str, str]]] = {}
 
@@ -68,27 +75,46 @@ class PersonalAgent:
 
         logger.info(f"Agente personal inicializado - Modelo: {settings.agent_model}")
 
+    async def start(self):
+        """Inicia y calienta los servicios antes de atender al primer mensaje."""
+        await self.services.start()
+
+    async def stop(self):
+        """Detiene los servicios en orden (scheduler antes que la base de datos)."""
+        await self.services.stop()
+
+    @property
+    def notification_manager(self):
+        """Gestor de notificaciones compartido con las herramientas."""
+        return self.services.notification_manager
+
     def _register_tools(self):
         """Registra todas las herramientas disponibles."""
         # Herramientas de calendario
-        self.tool_registry.register(CalendarTool())
-        self.tool_registry.register(CalendarGetAgendaTool())
+        self.tool_registry.register(CalendarTool(self.services))
+        self.tool_registry.register(CalendarGetAgendaTool(self.services))
+        self.tool_registry.register(CalendarFindFreeSlotsTool(self.services))
 
         # Herramientas de tareas
-        self.tool_registry.register(TaskCreateTool())
-        self.tool_registry.register(TaskListTool())
-        self.tool_registry.register(TaskCompleteTool())
+        self.tool_registry.register(TaskCreateTool(self.services))
+        self.tool_registry.register(TaskListTool(self.services))
+        self.tool_registry.register(TaskTagsTool(self.services))
+        self.tool_registry.register(TaskCompleteTool(self.services))
+        self.tool_registry.register(TaskAutoScheduleTool(self.services))
 
         # Herramientas de notificaciones
-        self.tool_registry.register(NotificationSendTool())
+        self.tool_registry.register(NotificationSendTool(self.services))
 
         # Herramientas de recordatorios
-        self.tool_registry.register(ReminderCreateTool())
-        self.tool_registry.register(ReminderListTool())
-        self.tool_registry.register(ReminderCancelTool())
+        self.tool_registry.register(ReminderCreateTool(self.services))
+        self.tool_registry.register(ReminderListTool(self.services))
+        self.tool_registry.register(ReminderCancelTool(self.services))
 
         # Herramientas de alarmas
-        self.tool_registry.register(AlarmCreateTool())
+        self.tool_registry.register(AlarmCreateTool(self.services))
+
+        # Herramientas de búsqueda
+        self.tool_registry.register(SearchTool(self.services))
 
         logger.info(f"{len(self.tool_registry.get_all())} herramientas registradas")
 
@@ -122,6 +148,7 @@ Cuando el usuario te pida:
 - "agenda algo": crea un evento en el calendario
 - "recuérdame": configura un recordatorio
 - "cancela X": elimina o marca como completado
+- "completa/cancela la tarea de X": usa search para obtener el ID en lugar de listar todo
 - "qué tengo": muestra agenda del día/semana
 - "ayúdame a aprender X": crea un plan de aprendizaje estructurado
 
@@ -0,0 +1,244 @@
+"""
+Contenedor de servicios compartidos del agente.
+
+La base de tareas, el scheduler de recordatorios, las alarmas y las
+notificaciones se crean una sola vez al arrancar (start) y se pasan a las
+herramientas. Los servicios sin dependencias entre sí se calientan en
+paralelo, así la primera petición no paga migraciones, arranque del
+scheduler ni la detección del sistema de audio. stop() los cierra en el
+orden inverso al de arranque.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..utils.config import Settings
+from ..utils.retention import RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class ServiceSpec:
+    """Cómo se crea y se cierra un servicio."""
+
+    name: str
+    factory: Callable[["ServiceContainer"], Awaitable[Any]]
+    depends: Tuple[str, ...] = ()
+    close: Optional[Callable[[Any], Any]] = None
+
+
+class ServiceContainer:
+    """Registro de servicios con arranque en paralelo y cierre ordenado."""
+
+    def __init__(self):
+        self._specs: Dict[str, ServiceSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._started_order: List[str] = []
+        self._lock = asyncio.Lock()
+        self._started = False
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[["ServiceContainer"], Awaitable[Any]],
+        depends: Tuple[str, ...] = (),
+        close: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Registra un servicio.
+
+        Args:
+            name: Nombre del servicio
+            factory: Corrutina que recibe el contenedor y devuelve el servicio listo
+            depends: Servicios que deben estar iniciados antes
+            close: Función (síncrona o corrutina) que recibe el servicio y lo cierra
+        """
+        if self._started:
+            raise RuntimeError(f"No se pueden registrar servicios tras el arranque: {name}")
+        self._specs[name] = ServiceSpec(name, factory, tuple(depends), close)
+
+    @property
+    def started(self) -> bool:
+        """True si start() terminó."""
+        return self._started
+
+    async def start(self):
+        """
+        Crea todos los servicios.
+
+        Cada ronda inicia a la vez los servicios cuyas dependencias ya están
+        listas. Si alguno falla se cierran los ya iniciados y se relanza el
+        error. Llamadas concurrentes esperan al mismo arranque.
+
+        Raises:
+            RuntimeError: Si hay dependencias circulares o no registradas
+        """
+        async with self._lock:
+            if self._started:
+                return
+
+            start = time.perf_counter()
+            pending = dict(self._specs)
+            while pending:
+                ready = [
+                    spec
+                    for spec in pending.values()
+                    if all(dep in self._instances for dep in spec.depends)
+                ]
+                if not ready:
+                    await self._close_started()
+                    raise RuntimeError(
+                        f"Dependencias circulares o sin registrar: {', '.join(pending)}"
+                    )
+
+                results = await asyncio.gather(
+                    *(self._start_one(spec) for spec in ready), return_exceptions=True
+                )
+                errors = [r for r in results if isinstance(r, BaseException)]
+                if errors:
+                    await self._close_started()
+                    raise errors[0]
+                for spec in ready:
+                    del pending[spec.name]
+
+            self._started = True
+            logger.info(
+                f"{len(self._instances)} servicios iniciados en "
+                f"{(time.perf_counter() - start) * 1000:.0f} ms"
+            )
+
+    async def _start_one(self, spec: ServiceSpec):
+        """Crea un servicio y lo registra como iniciado."""
+        start = time.perf_counter()
+        try:
+            self._instances[spec.name] = await spec.factory(self)
+        except Exception as e:
+            logger.error(f"Error iniciando el servicio {spec.name}: {e}")
+            raise
+        self._started_order.append(spec.name)
+        logger.info(f"Servicio {spec.name} listo en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    async def stop(self):
+        """Cierra los servicios en orden inverso al de arranque."""
+        async with self._lock:
+            await self._close_started()
+            self._started = False
+
+    async def _close_started(self):
+        """Cierra los servicios iniciados; un error al cerrar uno no impide cerrar el resto."""
+        for name in reversed(self._started_order):
+            spec = self._specs[name]
+            instance = self._instances.pop(name)
+            if spec.close is None:
+                continue
+            try:
+                result = spec.close(instance)
+                if inspect.isawaitable(result):
+                    await result
+                logger.info(f"Servicio {name} cerrado")
+            except Exception as e:
+                logger.error(f"Error cerrando el servicio {name}: {e}")
+        self._started_order.clear()
+
+    def get(self, name: str) -> Any:
+        """
+        Devuelve un servicio iniciado.
+
+        Raises:
+            RuntimeError: Si el servicio no existe o el contenedor no se inició
+        """
+        try:
+            return self._instances[name]
+        except KeyError:
+            raise RuntimeError(f"Servicio no iniciado: {name}") from None
+
+    @property
+    def task_db(self):
+        """Base de datos de tareas (TaskRepository)."""
+        return self.get("task_db")
+
+    @property
+    def reminder_scheduler(self):
+        """Scheduler de recordatorios y alarmas (ReminderScheduler)."""
+        return self.get("reminder_scheduler")
+
+    @property
+    def alarm_manager(self):
+        """Gestor de alarmas con sonido (AlarmManager)."""
+        return self.get("alarms")
+
+    @property
+    def notification_manager(self):
+        """Gestor de notificaciones de escritorio (NotificationManager)."""
+        return self.get("notifications")
+
+
+def build_services(settings: Settings, config: Optional[Dict[str, Any]] = None) -> ServiceContainer:
+    """
+    Registra los servicios del agente (sin iniciarlos).
+
+    task_db, notifications y alarms se inician a la vez; reminder_scheduler
+    espera a los tres. Las importaciones son diferidas para
+    que APScheduler y los drivers de base de datos solo se carguen aquí.
+
+    Args:
+        settings: Configuración desde variables de entorno
+        config: Configuración desde archivo YAML
+    """
+    config = config or {}
+    container = ServiceContainer()
+
+    async def task_db(_: ServiceContainer):
+        from ..integrations.repository import create_repository
+
+        repository = create_repository(settings)
+        await repository.connect()
+        return repository
+
+    async def notifications(_: ServiceContainer):
+        from ..integrations.notifications import NotificationManager
+
+        # La detección de notify-send lanza un proceso: fuera del event loop
+        return await asyncio.to_thread(
+            NotificationManager,
+            app_name=config.get("agent", {}).get("name", "Agente Personal"),
+            enable_sound=settings.notification_sound,
+        )
+
+    async def alarms(_: ServiceContainer):
+        from ..integrations.alarm import AlarmManager
+
+        # Igual con la detección de paplay/mpv
+        return await asyncio.to_thread(AlarmManager)
+
+    async def reminder_scheduler(services: ServiceContainer):
+        from ..integrations.reminder_store import ReminderStore
+        from ..integrations.scheduler import ReminderScheduler
+
+        scheduler = ReminderScheduler(
+            notification_manager=services.notification_manager,
+            task_db=services.task_db,
+            retention=RetentionPolicy.from_config(config),
+            alarm_manager=services.alarm_manager,
+            store=ReminderStore(str(settings.reminder_store_path)),
+            arm_horizon=timedelta(seconds=settings.reminder_arm_horizon),
+        )
+        await scheduler.start()
+        return scheduler
+
+    container.register("task_db", task_db, close=lambda db: db.disconnect())
+    container.register("notifications", notifications)
+    container.register("alarms", alarms)
+    container.register(
+        "reminder_scheduler",
+        reminder_scheduler,
+        depends=("task_db", "notifications", "alarms"),
+        close=lambda scheduler: scheduler.stop(),
+    )
+    return container
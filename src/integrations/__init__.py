@@ -1,7 +1,17 @@
 """Integraciones con herramientas externas."""
 
 from . import calcurse
+from .repository import TaskRepository, create_repository
 from .database import TaskDatabase
+from .sharded_database import ShardedTaskDatabase
 from .notifications import NotificationManager, NotificationPriority
 
-__all__ = ["calcurse", "TaskDatabase", "NotificationManager", "NotificationPriority"]
+__all__ = [
+    "calcurse",
+    "TaskRepository",
+    "create_repository",
+    "TaskDatabase",
+    "ShardedTaskDatabase",
+    "NotificationManager",
+    "NotificationPriority",
+]
@@ -2,13 +2,97 @@
 
 import subprocess
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from .calcurse_reader import CalcurseReader, get_reader
+
 logger = logging.getLogger(__name__)
 
 
+def event_ical(
+    title: str, start: datetime, end: datetime, recurrence: Optional[str] = None
+) -> str:
+    """
+    Construye el VCALENDAR de un evento para `calcurse -i`.
+
+    Args:
+        title: Título del evento
+        start: Inicio (primera repetición si es recurrente)
+        end: Fin
+        recurrence: RRULE del evento recurrente
+    """
+    dtstart = start.strftime("%Y%m%dT%H%M%S")
+    dtend = end.strftime("%Y%m%dT%H%M%S")
+    rrule = f"RRULE:{recurrence}\n" if recurrence else ""
+    return f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Agente Personal//ES
+BEGIN:VEVENT
+UID:{dtstart}-{title.replace(' ', '-')}@agente
+DTSTART:{dtstart}
+DTEND:{dtend}
+{rrule}SUMMARY:{title}
+END:VEVENT
+END:VCALENDAR"""
+
+
+def task_ical(title: str, priority: int = 0) -> str:
+    """
+    Construye el VCALENDAR de una tarea (VTODO) para `calcurse -i`.
+
+    Args:
+        title: Título de la tarea
+        priority: Prioridad (0-9, siendo 9 la más alta)
+    """
+    return f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Agente Personal//ES
+BEGIN:VTODO
+UID:{datetime.now().timestamp()}-{title.replace(' ', '-')}@agente
+SUMMARY:{title}
+PRIORITY:{priority}
+STATUS:NEEDS-ACTION
+END:VTODO
+END:VCALENDAR"""
+
+
+def clean_title(title: str) -> str:
+    """Título tal como lo guarda calcurse (una sola línea)."""
+    return " ".join(title.split())
+
+
+def _ical_text(value: str) -> str:
+    """Escapa un texto para iCal (RFC 5545)."""
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+
+
+def build_ical(events: List[Dict[str, Any]]) -> str:
+    """
+    Construye un VCALENDAR con un VEVENT por evento.
+
+    No incluye DESCRIPTION: calcurse la guardaría como nota y la línea de
+    la cita dejaría de coincidir con su hash de contenido.
+    """
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Agente Personal//ES"]
+    for event in events:
+        start = datetime.fromisoformat(event["start_time"])
+        end = datetime.fromisoformat(event["end_time"])
+        lines.extend(
+            [
+                "BEGIN:VEVENT",
+                f"UID:{event['id']}",
+                f"DTSTART:{start:%Y%m%dT%H%M00}",
+                f"DTEND:{end:%Y%m%dT%H%M00}",
+                f"SUMMARY:{_ical_text(clean_title(event['title']))}",
+                "END:VEVENT",
+            ]
+        )
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
 class Calcurse:
     """Cliente para interactuar con calcurse (calendario en terminal)."""
 
@@ -21,6 +105,11 @@ class Calcurse:
         """
         self.calendar_path = calendar_path or str(Path.home() / ".local/share/calcurse")
 
+    @property
+    def reader(self) -> CalcurseReader:
+        """Lector con caché de los archivos de datos (compartido por directorio)."""
+        return get_reader(self.calendar_path)
+
     def saveEvent(self, title: str, date: str, start_time: str, end_time: str) -> Dict[str, Any]:
         """
         Guarda un evento en calcurse usando formato iCal.
@@ -35,31 +124,13 @@ class Calcurse:
             Dict con el resultado de la operación
         """
         try:
-            # Convertir fecha MM/DD/YYYY a formato iCal YYYYMMDD
-            from datetime import datetime
-
             dt = datetime.strptime(f"{date} {start_time}", "%m/%d/%Y %H:%M")
             dt_end = datetime.strptime(f"{date} {end_time}", "%m/%d/%Y %H:%M")
 
-            dtstart = dt.strftime("%Y%m%dT%H%M%S")
-            dtend = dt_end.strftime("%Y%m%dT%H%M%S")
-
-            # Crear evento en formato iCal
-            ical_event = f"""BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Agente Personal//ES
-BEGIN:VEVENT
-UID:{dtstart}-{title.replace(' ', '-')}@agente
-DTSTART:{dtstart}
-DTEND:{dtend}
-SUMMARY:{title}
-END:VEVENT
-END:VCALENDAR"""
-
             # Importar a calcurse
             subprocess.run(
                 ["calcurse", "-i", "-", "-q"],
-                input=ical_event,
+                input=event_ical(title, dt, dt_end),
                 capture_output=True,
                 text=True,
                 check=True,
@@ -89,22 +160,10 @@ END:VCALENDAR"""
             Dict con el resultado de la operación
         """
         try:
-            # Crear tarea en formato iCal (VTODO)
-            ical_task = f"""BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Agente Personal//ES
-BEGIN:VTODO
-UID:{datetime.now().timestamp()}-{title.replace(' ', '-')}@agente
-SUMMARY:{title}
-PRIORITY:{priority}
-STATUS:NEEDS-ACTION
-END:VTODO
-END:VCALENDAR"""
-
             # Importar a calcurse
             subprocess.run(
                 ["calcurse", "-i", "-", "-q"],
-                input=ical_task,
+                input=task_ical(title, priority),
                 capture_output=True,
                 text=True,
                 check=True,
@@ -122,79 +181,41 @@ END:VCALENDAR"""
             logger.error(f"Error inesperado creando tarea: {e}")
             return {"success": False, "message": f"Error: {str(e)}"}
 
-    def getAgenda(self, days: int = 1) -> Dict[str, Any]:
+    def getAgenda(self, days: int = 1, start_date: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Obtiene la agenda de calcurse para los próximos N días.
 
+        Lee los archivos de datos directamente (ver CalcurseReader) en lugar
+        de lanzar `calcurse -r` y parsear su salida.
+
         Args:
             days: Número de días a consultar
+            start_date: Primer día (por defecto hoy)
 
         Returns:
-            Dict con los eventos y tareas encontrados
+            Dict con la Agenda tipada (citas, eventos de día completo y tareas)
         """
         try:
-            # Ejecutar calcurse con query para obtener eventos de los próximos N días
-            # El argumento -r requiere el número sin espacio: -r3
-            result = subprocess.run(
-                ["calcurse", f"-r{days}"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            first_day = (start_date or datetime.now()).date()
+            start = datetime.combine(first_day, datetime.min.time())
+            agenda = self.reader.agenda(start, start + timedelta(days=days))
 
-            # Parsear salida
-            output = result.stdout.strip()
-            events = []
-            tasks = []
-
-            if output:
-                lines = output.split("\n")
-                current_section = None
-
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    # Detectar secciones
-                    if "appointments:" in line.lower() or line.startswith("---"):
-                        current_section = "events"
-                        continue
-                    elif "todo:" in line.lower():
-                        current_section = "tasks"
-                        continue
-
-                    # Parsear eventos (formato: - HH:MM -> HH:MM Título)
-                    if current_section == "events" and "-" in line:
-                        events.append(line)
-                    # Parsear tareas (formato: [prioridad] Título)
-                    elif current_section == "tasks" or (line.startswith("[") and "]" in line):
-                        tasks.append(line)
-
-            logger.info(f"Agenda obtenida: {len(events)} eventos, {len(tasks)} tareas")
+            logger.info(
+                f"Agenda obtenida: {len(agenda.appointments) + len(agenda.day_events)} eventos, "
+                f"{len(agenda.todos)} tareas"
+            )
             return {
                 "success": True,
                 "message": f"Agenda para los próximos {days} días",
-                "events": events,
-                "tasks": tasks,
-                "raw_output": output,
+                "agenda": agenda,
             }
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error obteniendo agenda de calcurse: {e.stderr}")
-            return {
-                "success": False,
-                "message": f"Error: {e.stderr}",
-                "events": [],
-                "tasks": [],
-            }
         except Exception as e:
             logger.error(f"Error inesperado obteniendo agenda: {e}")
             return {
                 "success": False,
                 "message": f"Error: {str(e)}",
-                "events": [],
-                "tasks": [],
+                "agenda": None,
             }
 
     def saveEventNote(self, event_id: str, note: str) -> Dict[str, Any]:
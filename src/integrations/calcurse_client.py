@@ -0,0 +1,317 @@
+"""
+Cliente asíncrono de calcurse.
+
+Las llamadas a `calcurse` se lanzan con subprocesos de asyncio y un tiempo
+límite, de modo que una operación de calendario no bloquea el event loop
+(polling de Telegram, scheduler). Las importaciones se serializan con un
+único escritor por directorio y las lecturas comparten un cupo acotado.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .calcurse import build_ical, event_ical, task_ical
+from .calcurse_reader import Agenda, Appointment, CalcurseReader, get_reader
+from ..utils.scheduling import WorkSchedule
+
+logger = logging.getLogger(__name__)
+
+# Segundos que se espera a un proceso de calcurse antes de matarlo
+DEFAULT_TIMEOUT = 10.0
+# Lecturas simultáneas (hilos o procesos) por directorio
+MAX_READERS = 4
+
+
+class CalcurseError(Exception):
+    """Fallo o tiempo agotado de un proceso de calcurse."""
+
+
+class AsyncCalcurse:
+    """
+    Cliente de calcurse sin llamadas bloqueantes.
+
+    Las escrituras (importaciones iCal o reescrituras de apts) toman
+    write_lock, así que nunca hay dos a la vez sobre el mismo directorio
+    dentro del proceso. Las lecturas (agenda desde los archivos o consultas
+    `calcurse -Q`) se limitan a MAX_READERS simultáneas.
+    """
+
+    def __init__(
+        self,
+        calendar_path: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_readers: int = MAX_READERS,
+    ):
+        """
+        Inicializa el cliente.
+
+        Args:
+            calendar_path: Ruta al directorio de datos de calcurse
+            timeout: Segundos máximos por proceso de calcurse
+            max_readers: Lecturas simultáneas permitidas
+        """
+        self.calendar_path = calendar_path or str(Path.home() / ".local/share/calcurse")
+        self.timeout = timeout
+        self.write_lock = asyncio.Lock()
+        self._readers = asyncio.Semaphore(max_readers)
+
+    @property
+    def reader(self) -> CalcurseReader:
+        """Lector con caché de los archivos de datos (compartido por directorio)."""
+        return get_reader(self.calendar_path)
+
+    @property
+    def apts_path(self) -> Path:
+        """Archivo de citas (appointments) de calcurse."""
+        return Path(self.calendar_path) / "apts"
+
+    async def _run(
+        self, args: Sequence[str], input: Optional[str] = None, timeout: Optional[float] = None
+    ) -> str:
+        """
+        Ejecuta calcurse sobre el directorio del cliente.
+
+        Args:
+            args: Argumentos tras `calcurse -D <dir>`
+            input: Texto para stdin
+            timeout: Tiempo límite (por defecto el del cliente)
+
+        Returns:
+            Salida estándar del proceso
+
+        Raises:
+            CalcurseError: Si el proceso falla, no existe o excede el tiempo
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "calcurse",
+                "-D",
+                self.calendar_path,
+                *args,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise CalcurseError("calcurse no está instalado") from e
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(input.encode("utf-8") if input is not None else None),
+                timeout=timeout or self.timeout,
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise CalcurseError(f"calcurse no respondió en {timeout or self.timeout} s")
+
+        if process.returncode != 0:
+            raise CalcurseError(stderr.decode("utf-8", "replace").strip() or "calcurse falló")
+        return stdout.decode("utf-8", "replace")
+
+    async def import_ical(self, ical: str) -> Dict[str, Any]:
+        """
+        Importa un calendario iCal como único escritor del directorio.
+
+        Args:
+            ical: Contenido VCALENDAR con uno o más VEVENT/VTODO
+
+        Returns:
+            Dict con el resultado de la operación
+        """
+        try:
+            async with self.write_lock:
+                await self._run(["-i", "-", "-q"], input=ical)
+            return {"success": True, "message": "Calendario importado en calcurse"}
+        except CalcurseError as e:
+            logger.error(f"Error importando iCal en calcurse: {e}")
+            return {"success": False, "message": f"Error: {e}"}
+
+    async def save_event(
+        self, title: str, start: datetime, end: datetime, recurrence: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Guarda un evento en calcurse.
+
+        Args:
+            title: Título del evento
+            start: Inicio
+            end: Fin
+            recurrence: RRULE si el evento se repite (calcurse guarda la serie)
+
+        Returns:
+            Dict con el resultado de la operación
+        """
+        result = await self.import_ical(event_ical(title, start, end, recurrence))
+        if not result["success"]:
+            return result
+        logger.info(f"Evento creado en calcurse: {title}")
+        return {"success": True, "message": f"Evento '{title}' agregado exitosamente a calcurse"}
+
+    async def save_events(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Guarda varios eventos en una sola importación.
+
+        Args:
+            events: Dicts con id (UID), title, start_time y end_time (ISO)
+
+        Returns:
+            Dict con el resultado de la operación
+        """
+        result = await self.import_ical(build_ical(events))
+        if not result["success"]:
+            return result
+        logger.info(f"{len(events)} eventos creados en calcurse")
+        return {"success": True, "message": f"{len(events)} eventos agregados a calcurse"}
+
+    async def save_task(self, title: str, priority: int = 0) -> Dict[str, Any]:
+        """
+        Guarda una tarea en calcurse.
+
+        Args:
+            title: Título de la tarea
+            priority: Prioridad (0-9, siendo 9 la más alta)
+
+        Returns:
+            Dict con el resultado de la operación
+        """
+        result = await self.import_ical(task_ical(title, priority))
+        if not result["success"]:
+            return result
+        logger.info(f"Tarea creada en calcurse: {title} (prioridad: {priority})")
+        return {
+            "success": True,
+            "message": f"Tarea '{title}' creada exitosamente con prioridad {priority}",
+        }
+
+    async def query(self, *args: str) -> str:
+        """
+        Ejecuta una consulta de solo lectura (p. ej. `-Q --from ... --days 7`).
+
+        Raises:
+            CalcurseError: Si el proceso falla o excede el tiempo
+        """
+        async with self._readers:
+            return await self._run(args)
+
+    async def agenda(self, start: datetime, end: datetime) -> Agenda:
+        """
+        Agenda tipada de [start, end) leída de los archivos en un hilo.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+        """
+        async with self._readers:
+            return await asyncio.to_thread(self.reader.agenda, start, end)
+
+    async def conflicts(self, start: datetime, end: datetime) -> List[Appointment]:
+        """
+        Citas que se solapan con [start, end), consultadas en el índice de intervalos.
+
+        Args:
+            start: Inicio del evento propuesto
+            end: Fin del evento propuesto
+        """
+        async with self._readers:
+            return await asyncio.to_thread(self.reader.conflicts, start, end)
+
+    def _busy(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Intervalos ocupados por citas en [start, end) (para WorkSchedule)."""
+        return [(a.start, a.end) for a in self.reader.conflicts(start, end)]
+
+    async def free_slots(
+        self,
+        start: datetime,
+        end: datetime,
+        duration: timedelta,
+        schedule: WorkSchedule,
+        deep_work: str = "avoid",
+        limit: Optional[int] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Primeros huecos libres del calendario según el horario laboral.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+            duration: Duración del bloque buscado
+            schedule: Horario laboral, trabajo profundo y descansos
+            deep_work: avoid, only o allow
+            limit: Máximo de huecos
+
+        Returns:
+            Lista de (inicio, libre_hasta)
+        """
+
+        def find() -> List[Tuple[datetime, datetime]]:
+            return list(schedule.find_slots(start, end, duration, self._busy, deep_work, limit))
+
+        async with self._readers:
+            return await asyncio.to_thread(find)
+
+    async def free_intervals(
+        self, start: datetime, end: datetime, schedule: WorkSchedule, deep_work: str = "avoid"
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Todos los huecos libres del rango dentro del horario laboral, en orden.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+            schedule: Horario laboral, trabajo profundo y descansos
+            deep_work: avoid, only o allow
+        """
+
+        def find() -> List[Tuple[datetime, datetime]]:
+            return list(schedule.free_intervals(start, end, self._busy, deep_work))
+
+        async with self._readers:
+            return await asyncio.to_thread(find)
+
+    async def get_agenda(
+        self, days: int = 1, start_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Obtiene la agenda de los próximos N días (mismo resultado que Calcurse.getAgenda).
+
+        Args:
+            days: Número de días a consultar
+            start_date: Primer día (por defecto hoy)
+
+        Returns:
+            Dict con la Agenda tipada
+        """
+        try:
+            start = _day_start(start_date or datetime.now())
+            agenda = await self.agenda(start, start + timedelta(days=days))
+            return {
+                "success": True,
+                "message": f"Agenda para los próximos {days} días",
+                "agenda": agenda,
+            }
+        except Exception as e:
+            logger.error(f"Error inesperado obteniendo agenda: {e}")
+            return {"success": False, "message": f"Error: {str(e)}", "agenda": None}
+
+
+def _day_start(value: datetime) -> datetime:
+    """Medianoche del día de value."""
+    return datetime.combine(value.date(), datetime.min.time())
+
+
+# Un cliente por (directorio, event loop): el lock de escritura y el cupo de
+# lecturas se comparten entre herramientas
+_clients: Dict[Tuple[str, int], AsyncCalcurse] = {}
+
+
+def get_client(calendar_path: Optional[str] = None) -> AsyncCalcurse:
+    """Obtiene o crea el cliente asíncrono de un directorio de calcurse."""
+    path = calendar_path or str(Path.home() / ".local/share/calcurse")
+    key = (str(Path(path).expanduser().resolve()), id(asyncio.get_running_loop()))
+    if key not in _clients:
+        _clients[key] = AsyncCalcurse(key[0])
+    return _clients[key]
@@ -0,0 +1,475 @@
+"""
+Lectura directa de los archivos de datos de calcurse (apts y todo).
+
+Evita lanzar `calcurse -r` en cada consulta de agenda: los archivos se
+parsean una vez a registros tipados, se indexan por fecha y se vuelven a
+leer solo cuando cambian (mtime, tamaño o inode, o un evento de watchdog).
+Los registros llevan como UID el hash SHA-1 de su línea, el mismo que usa
+calcurse, y se serializan en forma compacta con to_dict().
+"""
+
+import hashlib
+import itertools
+import logging
+import mmap
+import re
+import threading
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from ..utils.intervals import IntervalTree
+
+logger = logging.getLogger(__name__)
+
+# A partir de este tamaño los archivos se leen con mmap
+MMAP_THRESHOLD = 1 << 20
+# Caracteres del UID que se incluyen en la forma serializada
+UID_LENGTH = 12
+
+# MM/DD/YYYY @ HH:MM -> MM/DD/YYYY @ HH:MM [{recurrencia}] [>nota ]|título
+# (el separador es ! en lugar de | si la cita tiene aviso activado)
+APT_PATTERN = re.compile(
+    r"^(\d{2}/\d{2}/\d{4}) @ (\d{2}:\d{2}) -> (\d{2}/\d{2}/\d{4}) @ (\d{2}:\d{2}) ?"
+    r"(?:\{([^}]*)\} ?)?(?:>(\S+) )?[|!](.*)$"
+)
+# MM/DD/YYYY [tipo] [{recurrencia}] [>nota ]título
+EVENT_PATTERN = re.compile(r"^(\d{2}/\d{2}/\d{4}) \[\d+\] ?(?:\{([^}]*)\} ?)?(?:>(\S+) )?(.*)$")
+# [prioridad][>nota ]título (prioridad negativa = completada)
+TODO_PATTERN = re.compile(r"^\[(-?\d+)\](?:>(\S+) | )(.*)$")
+# 1W -> MM/DD/YYYY !MM/DD/YYYY ... (las reglas extendidas se ignoran)
+RECURRENCE_PATTERN = re.compile(r"^(\d+)([DWMY])(?: -> (\d{2}/\d{2}/\d{4}))?")
+EXCEPTION_PATTERN = re.compile(r"!(\d{2}/\d{2}/\d{4})")
+
+
+@dataclass(slots=True, frozen=True)
+class Recurrence:
+    """Regla de repetición de calcurse (cada freq días, semanas, meses o años)."""
+
+    freq: int
+    unit: str
+    until: Optional[date] = None
+    exceptions: FrozenSet[date] = frozenset()
+
+    def occurrences(
+        self, first: datetime, duration: timedelta, start: datetime, end: datetime
+    ) -> Iterator[datetime]:
+        """
+        Genera los inicios de las repeticiones que se solapan con [start, end).
+
+        Args:
+            first: Inicio de la primera repetición
+            duration: Duración de cada repetición
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+        """
+        low = start - duration
+        if self.unit in "DW":
+            step = timedelta(days=self.freq * (7 if self.unit == "W" else 1))
+            skip = max(0, (low - first) // step)
+            candidates = (first + step * n for n in itertools.count(skip))
+        else:
+            months = self.freq * (12 if self.unit == "Y" else 1)
+            elapsed = (low.year - first.year) * 12 + low.month - first.month
+            skip = max(0, elapsed // months - 1)
+            candidates = (
+                dt for dt in (_add_months(first, months * n) for n in itertools.count(skip)) if dt
+            )
+
+        for occurrence in candidates:
+            if occurrence >= end or (self.until and occurrence.date() > self.until):
+                return
+            if occurrence + duration > start and occurrence.date() not in self.exceptions:
+                yield occurrence
+
+    @property
+    def spec(self) -> str:
+        """Forma corta de la regla (p. ej. 1W o 2M)."""
+        return f"{self.freq}{self.unit}"
+
+
+@dataclass(slots=True, frozen=True)
+class Appointment:
+    """Cita con hora de inicio y fin."""
+
+    start: datetime
+    end: datetime
+    title: str
+    note: Optional[str] = None
+    recurrence: Optional[Recurrence] = None
+    uid: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma compacta: UID corto, inicio y fin al minuto y título."""
+        data = {
+            "uid": self.uid[:UID_LENGTH],
+            "start": self.start.isoformat(timespec="minutes"),
+            "end": self.end.isoformat(timespec="minutes"),
+            "title": self.title,
+        }
+        if self.recurrence:
+            data["repeat"] = self.recurrence.spec
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class DayEvent:
+    """Evento de día completo."""
+
+    day: date
+    title: str
+    note: Optional[str] = None
+    recurrence: Optional[Recurrence] = None
+    uid: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma compacta: UID corto, día y título."""
+        data = {"uid": self.uid[:UID_LENGTH], "date": self.day.isoformat(), "title": self.title}
+        if self.recurrence:
+            data["repeat"] = self.recurrence.spec
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class Todo:
+    """Tarea de la lista todo de calcurse."""
+
+    title: str
+    priority: int
+    completed: bool = False
+    note: Optional[str] = None
+    uid: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma compacta: UID corto, título y prioridad (0 = sin prioridad)."""
+        data = {"uid": self.uid[:UID_LENGTH], "title": self.title, "priority": self.priority}
+        if self.completed:
+            data["completed"] = True
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class Agenda:
+    """Citas, eventos de día completo y tareas de un rango de fechas."""
+
+    start: datetime
+    end: datetime
+    appointments: Tuple[Appointment, ...] = ()
+    day_events: Tuple[DayEvent, ...] = ()
+    todos: Tuple[Todo, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma compacta para respuestas de herramientas y prompts."""
+        return {
+            "events": [e.to_dict() for e in self.day_events]
+            + [a.to_dict() for a in self.appointments],
+            "tasks": [t.to_dict() for t in self.todos],
+        }
+
+
+def _uid(line: str) -> str:
+    """UID de un registro: SHA-1 de su línea, como el hash de calcurse."""
+    return hashlib.sha1(line.encode("utf-8")).hexdigest()
+
+
+def _add_months(dt: datetime, months: int) -> Optional[datetime]:
+    """Suma meses; None si el día no existe en el mes destino (calcurse lo omite)."""
+    month_index = dt.month - 1 + months
+    try:
+        return dt.replace(year=dt.year + month_index // 12, month=month_index % 12 + 1)
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str) -> date:
+    """MM/DD/YYYY a date (por cortes: strptime es el cuello de botella al parsear)."""
+    return date(int(value[6:10]), int(value[0:2]), int(value[3:5]))
+
+
+def _parse_datetime(day: str, time: str) -> datetime:
+    """MM/DD/YYYY y HH:MM a datetime."""
+    return datetime(
+        int(day[6:10]), int(day[0:2]), int(day[3:5]), int(time[0:2]), int(time[3:5])
+    )
+
+
+def _parse_recurrence(spec: Optional[str]) -> Optional[Recurrence]:
+    """Convierte el contenido de {...} en una Recurrence (None si no se reconoce)."""
+    if not spec:
+        return None
+    match = RECURRENCE_PATTERN.match(spec.strip())
+    if not match:
+        logger.warning(f"Recurrencia de calcurse no reconocida: {spec}")
+        return None
+    freq, unit, until = match.groups()
+    return Recurrence(
+        freq=max(int(freq), 1),
+        unit=unit,
+        until=_parse_date(until) if until else None,
+        exceptions=frozenset(_parse_date(d) for d in EXCEPTION_PATTERN.findall(spec)),
+    )
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    """Lee un archivo línea a línea; los grandes se recorren con mmap."""
+    if not path.exists():
+        return
+    if path.stat().st_size < MMAP_THRESHOLD:
+        yield from path.read_text(encoding="utf-8").splitlines()
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for raw in iter(mm.readline, b""):
+            yield raw.decode("utf-8").rstrip("\n")
+
+
+def parse_apts(path: Path) -> Tuple[List[Appointment], List[DayEvent]]:
+    """Parsea el archivo apts en citas y eventos de día completo."""
+    appointments: List[Appointment] = []
+    events: List[DayEvent] = []
+    for line in _read_lines(path):
+        match = APT_PATTERN.match(line)
+        if match:
+            start_date, start_time, end_date, end_time, recur, note, title = match.groups()
+            appointments.append(
+                Appointment(
+                    start=_parse_datetime(start_date, start_time),
+                    end=_parse_datetime(end_date, end_time),
+                    title=title,
+                    note=note,
+                    recurrence=_parse_recurrence(recur),
+                    uid=_uid(line),
+                )
+            )
+            continue
+        match = EVENT_PATTERN.match(line)
+        if match:
+            day, recur, note, title = match.groups()
+            events.append(
+                DayEvent(
+                    day=_parse_date(day),
+                    title=title,
+                    note=note,
+                    recurrence=_parse_recurrence(recur),
+                    uid=_uid(line),
+                )
+            )
+    return appointments, events
+
+
+def parse_todo(path: Path) -> List[Todo]:
+    """Parsea el archivo todo."""
+    todos = []
+    for line in _read_lines(path):
+        match = TODO_PATTERN.match(line)
+        if match:
+            priority, note, title = match.groups()
+            value = int(priority)
+            todos.append(
+                Todo(
+                    title=title,
+                    priority=abs(value),
+                    completed=value < 0,
+                    note=note,
+                    uid=_uid(line),
+                )
+            )
+    return todos
+
+
+class AgendaIndex:
+    """Índice en memoria de citas y eventos para consultas por rango."""
+
+    def __init__(self, appointments: List[Appointment], events: List[DayEvent]):
+        # Las citas sin duración ocupan un microsegundo para que el rango que
+        # empieza en ellas las incluya
+        self._single = IntervalTree(
+            (a.start, max(a.end, a.start + timedelta(microseconds=1)), a)
+            for a in appointments
+            if not a.recurrence
+        )
+        self._recurring = [a for a in appointments if a.recurrence]
+
+        self._events_by_day: Dict[date, List[DayEvent]] = {}
+        for event in events:
+            if not event.recurrence:
+                self._events_by_day.setdefault(event.day, []).append(event)
+        self._recurring_events = [e for e in events if e.recurrence]
+
+    def appointments(self, start: datetime, end: datetime) -> List[Appointment]:
+        """Citas (y repeticiones de citas recurrentes) que se solapan con [start, end)."""
+        found = self._single.overlapping(start, end)
+
+        for apt in self._recurring:
+            duration = apt.end - apt.start
+            for occurrence in apt.recurrence.occurrences(apt.start, duration, start, end):
+                found.append(replace(apt, start=occurrence, end=occurrence + duration))
+
+        found.sort(key=lambda a: a.start)
+        return found
+
+    def day_events(self, start: date, end: date) -> List[DayEvent]:
+        """Eventos de día completo entre start y end (exclusivo)."""
+        found = []
+        day = start
+        while day < end:
+            found.extend(self._events_by_day.get(day, ()))
+            day += timedelta(days=1)
+
+        range_start = datetime.combine(start, datetime.min.time())
+        range_end = datetime.combine(end, datetime.min.time())
+        for event in self._recurring_events:
+            base = datetime.combine(event.day, datetime.min.time())
+            occurrences = event.recurrence.occurrences(
+                base, timedelta(days=1), range_start, range_end
+            )
+            for occurrence in occurrences:
+                found.append(replace(event, day=occurrence.date()))
+
+        found.sort(key=lambda e: e.day)
+        return found
+
+
+class CalcurseReader:
+    """
+    Lector con caché de los archivos de calcurse.
+
+    Cada consulta compara la firma (mtime, tamaño, inode) de apts y todo con
+    la del último parseo; con watch() activo ni siquiera eso, hasta que
+    watchdog avisa de un cambio.
+    """
+
+    def __init__(self, calendar_path: str):
+        """
+        Inicializa el lector.
+
+        Args:
+            calendar_path: Directorio de datos de calcurse
+        """
+        self.apts_path = Path(calendar_path) / "apts"
+        self.todo_path = Path(calendar_path) / "todo"
+        self._signatures: Dict[Path, Optional[Tuple[int, int, int]]] = {}
+        self._index = AgendaIndex([], [])
+        self._todos: List[Todo] = []
+        self._lock = threading.Lock()
+        self._observer = None
+        self._dirty = True
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _refresh(self):
+        """Vuelve a parsear los archivos que cambiaron desde la última lectura."""
+        if self._observer is not None and not self._dirty:
+            return
+
+        with self._lock:
+            self._dirty = False
+            signature = self._signature(self.apts_path)
+            if signature != self._signatures.get(self.apts_path, False):
+                self._index = AgendaIndex(*parse_apts(self.apts_path))
+                self._signatures[self.apts_path] = signature
+                logger.debug(f"apts de calcurse recargado: {self.apts_path}")
+
+            signature = self._signature(self.todo_path)
+            if signature != self._signatures.get(self.todo_path, False):
+                self._todos = parse_todo(self.todo_path)
+                self._signatures[self.todo_path] = signature
+                logger.debug(f"todo de calcurse recargado: {self.todo_path}")
+
+    def appointments(self, start: datetime, end: datetime) -> List[Appointment]:
+        """Citas que se solapan con [start, end), ordenadas por inicio."""
+        self._refresh()
+        return self._index.appointments(start, end)
+
+    def conflicts(self, start: datetime, end: datetime) -> List[Appointment]:
+        """Citas que ocupan parte de [start, end) (las de duración cero no cuentan)."""
+        return [a for a in self.appointments(start, end) if a.start < end and a.end > start]
+
+    def day_events(self, start: date, end: date) -> List[DayEvent]:
+        """Eventos de día completo entre start y end (exclusivo)."""
+        self._refresh()
+        return self._index.day_events(start, end)
+
+    def todos(self, include_completed: bool = False) -> List[Todo]:
+        """Tareas, de mayor a menor prioridad (1 es la más alta; 0 sin prioridad al final)."""
+        self._refresh()
+        todos = [t for t in self._todos if include_completed or not t.completed]
+        return sorted(todos, key=lambda t: (t.priority == 0, t.priority))
+
+    def agenda(self, start: datetime, end: datetime) -> Agenda:
+        """
+        Agenda tipada de [start, end): citas, eventos de día completo y tareas pendientes.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+        """
+        last_day = (end - timedelta(microseconds=1)).date() + timedelta(days=1)
+        return Agenda(
+            start=start,
+            end=end,
+            appointments=tuple(self.appointments(start, end)),
+            day_events=tuple(self.day_events(start.date(), last_day)),
+            todos=tuple(self.todos()),
+        )
+
+    def watch(self) -> bool:
+        """
+        Invalida la caché con eventos de watchdog en lugar de stat por consulta.
+
+        Returns:
+            True si watchdog quedó activo
+        """
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.warning("watchdog no disponible, la caché de calcurse se valida con stat")
+            return False
+
+        reader = self
+        watched = {self.apts_path.name, self.todo_path.name}
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+                if any(Path(p).name in watched for p in paths if p):
+                    reader._dirty = True
+
+        self.apts_path.parent.mkdir(parents=True, exist_ok=True)
+        self._dirty = True
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), str(self.apts_path.parent), recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        logger.info(f"Observando cambios de calcurse en {self.apts_path.parent}")
+        return True
+
+    def stop_watching(self):
+        """Detiene watchdog y vuelve a validar con stat."""
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join(timeout=2)
+        self._observer = None
+        self._dirty = True
+
+
+# Un lector por directorio, compartido entre instancias de Calcurse
+_readers: Dict[str, CalcurseReader] = {}
+
+
+def get_reader(calendar_path: str) -> CalcurseReader:
+    """Obtiene o crea el lector de un directorio de calcurse."""
+    key = str(Path(calendar_path).expanduser().resolve())
+    if key not in _readers:
+        _readers[key] = CalcurseReader(key)
+    return _readers[key]
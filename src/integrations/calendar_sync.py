@@ -0,0 +1,363 @@
+"""
+Sincronización incremental bidireccional entre eventos de PostgreSQL y calcurse.
+
+Cada evento conserva su ID de PostgreSQL como UID estable. calcurse no
+guarda UIDs, así que el estado de sincronización asocia cada ID con el
+hash de su línea en el archivo apts (el mismo SHA1 que calcurse usa como
+hash de la cita) y con un hash del contenido. Con eso se calcula el diff:
+
+- PostgreSQL -> calcurse: solo los eventos con updated_at posterior a la
+  marca o con lápida; las líneas viejas se quitan del archivo apts en una
+  sola reescritura y los eventos nuevos entran en un único import iCal.
+- calcurse -> PostgreSQL: solo si el archivo apts cambió (mtime, tamaño o
+  inode); las altas, ediciones y borrados locales se aplican en una sola
+  transacción.
+
+Si el mismo evento cambió en ambos lados, gana PostgreSQL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .calcurse import build_ical, clean_title
+from .calcurse_client import AsyncCalcurse
+from .postgres_db import PostgresDatabase
+
+logger = logging.getLogger(__name__)
+
+# Cita simple del archivo apts: inicio -> fin, nota opcional y título.
+# Las citas recurrentes ({...}) y los eventos de día completo no se sincronizan.
+APT_PATTERN = re.compile(
+    r"^(\d{2}/\d{2}/\d{4}) @ (\d{2}:\d{2}) -> (\d{2}/\d{2}/\d{4}) @ (\d{2}:\d{2}) "
+    r"(?:>\S+ )?[|!](.*)$"
+)
+
+
+@dataclass
+class _Appointment:
+    """Cita de calcurse leída del archivo apts."""
+
+    line_hash: str
+    start: datetime
+    end: datetime
+    title: str
+
+    @property
+    def content(self) -> str:
+        return content_hash(self.start, self.end, self.title)
+
+
+def line_hash(line: str) -> str:
+    """Hash de una línea de apts (coincide con el hash de cita de calcurse)."""
+    return hashlib.sha1(line.encode("utf-8")).hexdigest()
+
+
+def content_hash(start: datetime, end: datetime, title: str) -> str:
+    """Hash de lo que calcurse conserva de un evento (minutos y título)."""
+    key = f"{start:%Y-%m-%dT%H:%M}|{end:%Y-%m-%dT%H:%M}|{clean_title(title)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _state_item(digest: str, start: datetime, end: datetime, title: str) -> Dict[str, str]:
+    """Entrada del estado: hash de línea, hash de contenido y claves de emparejamiento."""
+    return {
+        "hash": digest,
+        "content": content_hash(start, end, title),
+        "title": clean_title(title),
+        "start": f"{start:%Y-%m-%dT%H:%M}",
+    }
+
+
+def _event_times(event: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """Inicio y fin de un evento de PostgreSQL (ISO en hora local)."""
+    return datetime.fromisoformat(event["start_time"]), datetime.fromisoformat(event["end_time"])
+
+
+def read_appointments(path: Path) -> Dict[str, _Appointment]:
+    """
+    Lee las citas simples del archivo apts.
+
+    Returns:
+        Dict hash de línea -> cita
+    """
+    if not path.exists():
+        return {}
+
+    appointments = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        match = APT_PATTERN.match(line)
+        if not match:
+            continue
+        start_date, start_time, end_date, end_time, title = match.groups()
+        digest = line_hash(line)
+        appointments[digest] = _Appointment(
+            line_hash=digest,
+            start=datetime.strptime(f"{start_date} {start_time}", "%m/%d/%Y %H:%M"),
+            end=datetime.strptime(f"{end_date} {end_time}", "%m/%d/%Y %H:%M"),
+            title=title,
+        )
+    return appointments
+
+
+def remove_lines(path: Path, hashes: set) -> int:
+    """
+    Quita del archivo apts las líneas con los hashes indicados.
+
+    Reescribe el archivo completo en un temporal y lo reemplaza de forma
+    atómica, así calcurse nunca ve un archivo a medio escribir.
+
+    Returns:
+        Número de líneas quitadas
+    """
+    if not hashes or not path.exists():
+        return 0
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    kept = [line for line in lines if line_hash(line) not in hashes]
+    tmp_path = path.with_name(f".{path.name}.sync")
+    tmp_path.write_text("".join(f"{line}\n" for line in kept), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return len(lines) - len(kept)
+
+
+class CalendarSync:
+    """Motor de sincronización entre los eventos de un usuario y calcurse."""
+
+    # La marca se retrocede este margen al consultar: cubre transacciones que
+    # confirmaron tarde con un updated_at anterior. El hash de contenido
+    # descarta lo que ya estaba sincronizado.
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        db: PostgresDatabase,
+        calcurse: AsyncCalcurse,
+        user_id: str,
+        state_path: Optional[Path] = None,
+    ):
+        """
+        Inicializa el motor de sincronización.
+
+        Args:
+            db: Cliente de PostgreSQL conectado
+            calcurse: Cliente asíncrono de calcurse (su calendar_path contiene apts)
+            user_id: Dueño del calendario local; las citas creadas en calcurse
+                se guardan a su nombre
+            state_path: Archivo JSON con el estado de sincronización
+        """
+        self.db = db
+        self.calcurse = calcurse
+        self.user_id = user_id
+        self.state_path = state_path or Path("data") / "sync" / f"calcurse_{user_id}.json"
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Carga el estado persistido (vacío en la primera sincronización)."""
+        if not self.state_path.exists():
+            return {"watermark": None, "apts_stat": None, "events": {}}
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save_state(self, state: Dict[str, Any]):
+        """Guarda el estado de forma atómica."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def _apts_stat(self) -> Optional[List[int]]:
+        """Firma del archivo apts para detectar ediciones locales."""
+        try:
+            stat = self.calcurse.apts_path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+    async def sync(self) -> Dict[str, int]:
+        """
+        Ejecuta una pasada de sincronización en ambos sentidos.
+
+        Returns:
+            Dict con pushed/removed (hacia calcurse) y upserted/deleted
+            (hacia PostgreSQL)
+        """
+        state = self._load_state()
+        items: Dict[str, Dict[str, str]] = state["events"]
+
+        since = None
+        if state["watermark"]:
+            since = datetime.fromisoformat(state["watermark"]) - self.WATERMARK_OVERLAP
+        changes = await self.db.get_event_changes(self.user_id, since)
+
+        # Descartar ecos: cambios remotos cuyo contenido ya está en calcurse.
+        # Las series recurrentes no se sincronizan (como las citas
+        # recurrentes de calcurse en el sentido contrario)
+        remote = [
+            event
+            for event in changes["events"]
+            if not event.get("recurrence")
+            and items.get(event["id"], {}).get("content") != self._event_content(event)
+        ]
+        remote_deleted = [event_id for event_id in changes["deleted"] if event_id in items]
+        local_changed = self._apts_stat() != state["apts_stat"]
+
+        stats = {"pushed": 0, "removed": 0, "upserted": 0, "deleted": 0}
+        if not remote and not remote_deleted and not local_changed:
+            state["watermark"] = changes["server_time"].isoformat()
+            self._save_state(state)
+            return stats
+
+        apts = read_appointments(self.calcurse.apts_path)
+        known_hashes = {item["hash"] for item in items.values()}
+        local_new = {h: apt for h, apt in apts.items() if h not in known_hashes}
+        gone = {event_id for event_id, item in items.items() if item["hash"] not in apts}
+
+        to_remove: set = set()
+        to_push: List[Dict[str, Any]] = []
+        touched: set = set()
+
+        # PostgreSQL -> calcurse (gana sobre cambios locales del mismo evento)
+        for event in remote:
+            event_id = event["id"]
+            content = self._event_content(event)
+            known = items.get(event_id)
+            if known is None:
+                linked = self._link_existing(local_new, content)
+                if linked:
+                    # Ya estaba en calcurse (p. ej. importado antes del estado)
+                    items[event_id] = _state_item(linked, *_event_times(event), event["title"])
+                    continue
+            touched.add(event_id)
+            if known and known["hash"] in apts:
+                to_remove.add(known["hash"])
+            to_push.append(event)
+
+        for event_id in remote_deleted:
+            touched.add(event_id)
+            known = items.pop(event_id)
+            if known["hash"] in apts:
+                to_remove.add(known["hash"])
+
+        # calcurse -> PostgreSQL: emparejar citas nuevas con las desaparecidas
+        # (una edición local cambia el hash de la línea)
+        local_upserts, local_deleted = self._diff_local(local_new, gone, items)
+        for event_id, apt in list(local_upserts.items()):
+            if event_id in touched:
+                # Conflicto: la versión de PostgreSQL reemplaza la edición local
+                to_remove.add(apt.line_hash)
+                del local_upserts[event_id]
+        local_deleted = [event_id for event_id in local_deleted if event_id not in touched]
+
+        if to_remove:
+            async with self.calcurse.write_lock:
+                stats["removed"] = remove_lines(self.calcurse.apts_path, to_remove)
+        if to_push:
+            result = await self.calcurse.import_ical(build_ical(to_push))
+            if not result["success"]:
+                raise RuntimeError(result["message"])
+            stats["pushed"] = len(to_push)
+            self._map_pushed(to_push, items)
+
+        if local_upserts or local_deleted:
+            upserts = [
+                {
+                    "id": event_id,
+                    "title": apt.title,
+                    "start_time": apt.start,
+                    "end_time": apt.end,
+                }
+                for event_id, apt in local_upserts.items()
+            ]
+            result = await self.db.apply_event_changes(self.user_id, upserts, local_deleted)
+            stats["upserted"] = result["upserted"]
+            stats["deleted"] = result["deleted"]
+            for event_id, apt in local_upserts.items():
+                items[event_id] = _state_item(apt.line_hash, apt.start, apt.end, apt.title)
+            for event_id in local_deleted:
+                items.pop(event_id, None)
+
+        state["watermark"] = changes["server_time"].isoformat()
+        state["apts_stat"] = self._apts_stat()
+        self._save_state(state)
+
+        logger.info(
+            f"Sincronización calcurse ({self.user_id}): {stats['pushed']} enviados, "
+            f"{stats['removed']} quitados, {stats['upserted']} guardados, "
+            f"{stats['deleted']} borrados en PostgreSQL"
+        )
+        return stats
+
+    @staticmethod
+    def _event_content(event: Dict[str, Any]) -> str:
+        """Hash de contenido de un evento de PostgreSQL."""
+        return content_hash(*_event_times(event), event["title"])
+
+    @staticmethod
+    def _link_existing(local_new: Dict[str, _Appointment], content: str) -> Optional[str]:
+        """Asocia un evento remoto a una cita local idéntica aún sin dueño."""
+        for digest, apt in local_new.items():
+            if apt.content == content:
+                del local_new[digest]
+                return digest
+        return None
+
+    @staticmethod
+    def _diff_local(
+        local_new: Dict[str, _Appointment], gone: set, items: Dict[str, Dict[str, str]]
+    ) -> Tuple[Dict[str, _Appointment], List[str]]:
+        """
+        Convierte el diff de líneas de apts en cambios de eventos.
+
+        Una cita nueva se toma como edición de un evento desaparecido con el
+        mismo título (con la misma hora de inicio si hay varios); si no hay
+        pareja, es un evento nuevo con UID derivado de su hash. Coincidir
+        solo en la hora no basta: una cita cualquiera heredaría el ID y el
+        historial del evento borrado.
+
+        Returns:
+            Tupla (ID -> cita a guardar, IDs a borrar)
+        """
+        upserts: Dict[str, _Appointment] = {}
+        unmatched = set(gone)
+        by_title: Dict[str, List[str]] = {}
+        for event_id in sorted(gone):
+            by_title.setdefault(items[event_id]["title"], []).append(event_id)
+
+        for digest, apt in local_new.items():
+            start = f"{apt.start:%Y-%m-%dT%H:%M}"
+            candidates = [
+                event_id
+                for event_id in by_title.get(clean_title(apt.title), [])
+                if event_id in unmatched
+            ]
+            same_start = [event_id for event_id in candidates if items[event_id]["start"] == start]
+            event_id = (same_start or candidates or [None])[0]
+            if event_id in unmatched:
+                unmatched.discard(event_id)
+            else:
+                event_id = f"event_calcurse_{digest[:16]}"
+            upserts[event_id] = apt
+
+        return upserts, sorted(unmatched)
+
+    def _map_pushed(self, pushed: List[Dict[str, Any]], items: Dict[str, Dict[str, str]]):
+        """Relee apts tras el import y asocia cada evento enviado con su línea."""
+        known_hashes = {item["hash"] for item in items.values()}
+        unowned: Dict[str, List[str]] = {}
+        for digest, apt in read_appointments(self.calcurse.apts_path).items():
+            if digest not in known_hashes:
+                unowned.setdefault(apt.content, []).append(digest)
+
+        for event in pushed:
+            content = self._event_content(event)
+            candidates = unowned.get(content)
+            if not candidates:
+                logger.warning(f"Evento {event['id']} no encontrado en apts tras importarlo")
+                items.pop(event["id"], None)
+                continue
+            items[event["id"]] = _state_item(candidates.pop(), *_event_times(event), event["title"])
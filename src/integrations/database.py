@@ -1,15 +1,24 @@
 """Sistema de persistencia con SQLite para tareas y eventos."""
 
+import asyncio
 import logging
 import aiosqlite
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from pathlib import Path
 
+from ..utils.dates import DUE_DATE_FILTERS, due_date_range, parse_due_date
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.retention import RetentionPolicy
+from ..utils.search import fts5_match, search_terms
+from ..utils.tags import normalize_tag, normalize_tags
+from .repository import TaskRepository
+
 logger = logging.getLogger(__name__)
 
 
-class TaskDatabase:
+class TaskDatabase(TaskRepository):
     """Gestor de base de datos para tareas del agente."""
 
     def __init__(self, db_path: str = "data/tasks.db"):
@@ -22,10 +31,72 @@ class TaskDatabase:
         self.db_path = db_path
         # Asegurar que el directorio existe
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Conexión persistente opcional (ver open); sin ella cada operación
+        # abre y cierra la suya
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._conn_lock = asyncio.Lock()
+
+    async def connect(self):
+        """Crea o actualiza el esquema (ver initialize)."""
+        await self.initialize()
+
+    async def disconnect(self):
+        """Cierra la conexión persistente si se abrió con open()."""
+        await self.close()
+
+    async def open(self):
+        """
+        Abre una conexión persistente en modo WAL para las operaciones siguientes.
+
+        Las operaciones la usan de una en una y hasta close() no abren
+        conexiones nuevas. No crea el esquema (ver initialize).
+        """
+        if self._conn is None:
+            self._conn = await aiosqlite.connect(self.db_path)
+            await self._conn.execute("PRAGMA journal_mode=WAL")
+
+    async def close(self):
+        """Cierra la conexión persistente cuando termina la operación en curso."""
+        async with self._conn_lock:
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
+
+    @property
+    def is_open(self) -> bool:
+        """True si hay una conexión persistente abierta."""
+        return self._conn is not None
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Conexión para una operación.
+
+        Con conexión persistente, la entrega en exclusiva y deshace la
+        transacción si la operación falla a medias; si no, abre una nueva.
+        """
+        if self._conn is None:
+            async with aiosqlite.connect(self.db_path) as db:
+                yield db
+            return
+
+        async with self._conn_lock:
+            if self._conn is None:
+                # Se cerró mientras se esperaba el turno
+                async with aiosqlite.connect(self.db_path) as db:
+                    yield db
+                return
+            # Cada operación elige su row_factory
+            self._conn.row_factory = None
+            try:
+                yield self._conn
+            except BaseException:
+                await self._conn.rollback()
+                raise
 
     async def initialize(self):
         """Inicializa las tablas de la base de datos."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             await db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS tasks (
@@ -39,13 +110,246 @@ class TaskDatabase:
                     completed BOOLEAN DEFAULT 0,
                     created_at TEXT NOT NULL,
                     completed_at TEXT,
+                    due_at INTEGER,
                     UNIQUE(id)
                 )
             """
             )
+            await self._migrate_due_at(db)
+            await self._migrate_scheduling(db)
+            await self._migrate_tags(db)
+            await self._create_archive(db)
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_due
+                ON tasks(user_id, completed, due_at)
+            """
+            )
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_created
+                ON tasks(user_id, created_at, id)
+            """
+            )
+            await self._create_search_index(db)
             await db.commit()
             logger.info(f"Base de datos inicializada: {self.db_path}")
 
+    async def _create_search_index(self, db: aiosqlite.Connection):
+        """
+        Crea el índice FTS5 sobre título y descripción de las tareas.
+
+        Es una tabla de contenido externo (no duplica el texto) que los
+        triggers mantienen sincronizada con tasks. user_id también se indexa
+        para que FTS5 intersecte por usuario en lugar de rankear las
+        coincidencias de todos. Como se enlaza por rowid, después de un
+        VACUUM hay que reconstruirla con rebuild_search_index().
+        """
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ) as cursor:
+            exists = await cursor.fetchone() is not None
+
+        await db.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title, description, user_id,
+                content='tasks', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts(rowid, title, description, user_id)
+                VALUES (new.rowid, new.title, new.description, new.user_id);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description, user_id)
+                VALUES ('delete', old.rowid, old.title, old.description, old.user_id);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+            AFTER UPDATE OF title, description, user_id ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description, user_id)
+                VALUES ('delete', old.rowid, old.title, old.description, old.user_id);
+                INSERT INTO tasks_fts(rowid, title, description, user_id)
+                VALUES (new.rowid, new.title, new.description, new.user_id);
+            END;
+        """
+        )
+
+        if not exists:
+            # Indexar tareas creadas antes de que existiera el índice
+            await db.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+    async def rebuild_search_index(self):
+        """Reconstruye el índice FTS5 desde la tabla tasks."""
+        async with self._connection() as db:
+            await db.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+            await db.commit()
+        logger.info("Índice de búsqueda reconstruido")
+
+    async def _migrate_due_at(self, db: aiosqlite.Connection):
+        """
+        Agrega la columna due_at a bases existentes y la rellena desde due_date.
+
+        due_at guarda la fecha límite como timestamp UNIX para que los filtros
+        por fecha sean búsquedas por rango sobre el índice.
+        """
+        async with db.execute("PRAGMA table_info(tasks)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+
+        if "due_at" in columns:
+            return
+
+        await db.execute("ALTER TABLE tasks ADD COLUMN due_at INTEGER")
+
+        async with db.execute(
+            "SELECT id, due_date FROM tasks WHERE due_date IS NOT NULL AND due_date != ''"
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        updates = []
+        for task_id, due_date in rows:
+            due_dt = parse_due_date(due_date)
+            if due_dt:
+                updates.append((due_dt.isoformat(), int(due_dt.timestamp()), task_id))
+
+        if updates:
+            await db.executemany(
+                "UPDATE tasks SET due_date = ?, due_at = ? WHERE id = ?", updates
+            )
+        logger.info(f"Migración due_at aplicada ({len(updates)} tareas normalizadas)")
+
+    async def _migrate_scheduling(self, db: aiosqlite.Connection):
+        """
+        Agrega las columnas del auto-scheduler a bases existentes.
+
+        estimated_minutes es la duración estimada de la tarea y scheduled_at
+        el timestamp UNIX del bloque de calendario que se le asignó.
+        """
+        async with db.execute("PRAGMA table_info(tasks)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+
+        for column in ("estimated_minutes", "scheduled_at"):
+            if column not in columns:
+                await db.execute(f"ALTER TABLE tasks ADD COLUMN {column} INTEGER")
+                logger.info(f"Migración {column} aplicada")
+
+    async def _migrate_tags(self, db: aiosqlite.Connection):
+        """
+        Crea la tabla de etiquetas y la rellena desde la columna tags.
+
+        task_tags tiene una fila por (tarea, etiqueta). El índice
+        (user_id, tag, task_id) resuelve "tareas con la etiqueta X" y la
+        clave primaria trae las etiquetas de una página de tareas. completed
+        se copia de tasks por trigger para que el conteo de pendientes por
+        etiqueta lea solo idx_task_tags_user_completed. La columna tags de
+        tasks queda solo por compatibilidad con bases anteriores.
+        """
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_tags'"
+        ) as cursor:
+            exists = await cursor.fetchone() is not None
+
+        await db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS task_tags (
+                task_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                completed BOOLEAN NOT NULL DEFAULT 0,
+                PRIMARY KEY (task_id, tag)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_task_tags_user_tag
+            ON task_tags(user_id, tag, task_id);
+
+            CREATE INDEX IF NOT EXISTS idx_task_tags_user_completed
+            ON task_tags(user_id, completed, tag);
+
+            CREATE TRIGGER IF NOT EXISTS task_tags_completed
+            AFTER UPDATE OF completed ON tasks BEGIN
+                UPDATE task_tags SET completed = new.completed WHERE task_id = new.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS task_tags_delete AFTER DELETE ON tasks BEGIN
+                DELETE FROM task_tags WHERE task_id = old.id;
+            END;
+        """
+        )
+
+        if exists:
+            return
+
+        async with db.execute(
+            "SELECT id, user_id, tags, completed FROM tasks WHERE tags IS NOT NULL AND tags != ''"
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        records = [
+            (task_id, user_id, tag, bool(completed))
+            for task_id, user_id, tags, completed in rows
+            for tag in normalize_tags(tags)
+        ]
+        if records:
+            await db.executemany(
+                """
+                INSERT OR IGNORE INTO task_tags (task_id, user_id, tag, completed)
+                VALUES (?, ?, ?, ?)
+            """,
+                records,
+            )
+        logger.info(f"Migración task_tags aplicada ({len(records)} etiquetas)")
+
+    async def _create_archive(self, db: aiosqlite.Connection):
+        """
+        Crea tasks_archive, donde archive_completed_tasks mueve las completadas antiguas.
+
+        Las etiquetas se guardan como texto "a,b,c" porque el archivo no se
+        filtra por etiqueta. El índice parcial sobre completed_at permite
+        tomar los lotes más antiguos sin recorrer las tareas pendientes.
+        """
+        await db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks_archive (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                priority TEXT,
+                due_date TEXT,
+                tags TEXT,
+                created_at TEXT NOT NULL,
+                completed_at TEXT,
+                archived_at TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_tasks_archive_user_completed
+            ON tasks_archive(user_id, completed_at);
+
+            CREATE INDEX IF NOT EXISTS idx_tasks_completed_at
+            ON tasks(completed_at) WHERE completed = 1;
+        """
+        )
+
+    async def _attach_tags(self, db: aiosqlite.Connection, tasks: List[Dict[str, Any]]):
+        """Agrega a cada tarea su lista de etiquetas (una consulta por página)."""
+        by_id: Dict[str, List[str]] = {}
+        for task in tasks:
+            task["tags"] = by_id.setdefault(task["id"], [])
+        if not by_id:
+            return
+
+        placeholders = ", ".join("?" * len(by_id))
+        async with db.execute(
+            f"SELECT task_id, tag FROM task_tags WHERE task_id IN ({placeholders}) "
+            "ORDER BY task_id, tag",
+            list(by_id),
+        ) as cursor:
+            for task_id, tag in await cursor.fetchall():
+                by_id[task_id].append(tag)
+
     async def create_task(
         self,
         task_id: str,
@@ -55,6 +359,7 @@ class TaskDatabase:
         priority: str = "medium",
         due_date: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        estimated_minutes: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Crea una nueva tarea en la base de datos.
@@ -67,20 +372,28 @@ class TaskDatabase:
             priority: Prioridad (urgent, high, medium, low)
             due_date: Fecha límite (ISO format)
             tags: Lista de etiquetas
+            estimated_minutes: Duración estimada en minutos (para el auto-scheduler)
 
         Returns:
             Dict con la tarea creada
         """
         try:
-            tags_str = ",".join(tags) if tags else ""
+            tags = normalize_tags(tags)
             created_at = datetime.now().isoformat()
 
-            async with aiosqlite.connect(self.db_path) as db:
+            # Normalizar fecha límite; si no se puede interpretar se guarda tal cual
+            due_dt = parse_due_date(due_date)
+            due_at = int(due_dt.timestamp()) if due_dt else None
+            if due_dt:
+                due_date = due_dt.isoformat()
+
+            async with self._connection() as db:
                 await db.execute(
                     """
                     INSERT INTO tasks
-                    (id, user_id, title, description, priority, due_date, tags, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    (id, user_id, title, description, priority, due_date, created_at, due_at,
+                     estimated_minutes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         task_id,
@@ -89,10 +402,16 @@ class TaskDatabase:
                         description,
                         priority,
                         due_date,
-                        tags_str,
                         created_at,
+                        due_at,
+                        estimated_minutes,
                     ),
                 )
+                if tags:
+                    await db.executemany(
+                        "INSERT INTO task_tags (task_id, user_id, tag) VALUES (?, ?, ?)",
+                        [(task_id, user_id, tag) for tag in tags],
+                    )
                 await db.commit()
 
             logger.info(f"Tarea creada en BD: {task_id} - {title}")
@@ -104,70 +423,221 @@ class TaskDatabase:
                 "description": description,
                 "priority": priority,
                 "due_date": due_date,
-                "tags": tags or [],
+                "tags": tags,
                 "completed": False,
                 "created_at": created_at,
+                "estimated_minutes": estimated_minutes,
             }
 
         except Exception as e:
             logger.error(f"Error creando tarea en BD: {e}")
             raise
 
-    async def list_tasks(
-        self, user_id: str, filter_type: str = "pending", limit: int = 10
-    ) -> List[Dict[str, Any]]:
+    async def list_tasks_page(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = 10,
+        days: int = 7,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
-        Lista las tareas de un usuario.
+        Lista una página de tareas de un usuario.
 
         Args:
             user_id: ID del usuario
-            filter_type: Filtro (all, pending, completed, urgent)
-            limit: Límite de resultados
+            filter_type: Filtro (all, pending, completed, urgent, today, overdue,
+                week, upcoming)
+            limit: Tamaño de página
+            days: Días hacia adelante para el filtro upcoming
+            cursor: next_cursor de la página anterior (None para la primera)
+            tag: Solo tareas con esta etiqueta
 
         Returns:
-            Lista de tareas
+            Dict con tasks y next_cursor (None si es la última página)
+
+        Raises:
+            ValueError: Si el cursor no es válido
         """
+        after_value, after_id = decode_cursor(cursor)
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection() as db:
                 db.row_factory = aiosqlite.Row
+                params: List[Any] = [user_id]
 
                 # Construir query según filtro
-                if filter_type == "completed":
+                if filter_type in DUE_DATE_FILTERS:
+                    # Búsqueda por rango sobre idx_tasks_user_due
+                    start, end = due_date_range(filter_type, days=days)
+                    query = "SELECT * FROM tasks WHERE user_id = ? AND completed = 0"
+                    if start is not None:
+                        query += " AND due_at >= ?"
+                        params.append(int(start.timestamp()))
+                    query += " AND due_at < ?"
+                    params.append(int(end.timestamp()))
+                elif filter_type == "completed":
                     query = "SELECT * FROM tasks WHERE user_id = ? AND completed = 1"
                 elif filter_type == "pending":
                     query = "SELECT * FROM tasks WHERE user_id = ? AND completed = 0"
                 elif filter_type == "urgent":
                     query = """
                         SELECT * FROM tasks
-                        WHERE user_id = ? AND completed = 0
-                        AND priority IN ('urgent', 'high')
+                        WHERE user_id = ? AND completed = 0 AND priority = 'urgent'
                     """
                 else:  # all
                     query = "SELECT * FROM tasks WHERE user_id = ?"
 
-                query += " ORDER BY created_at DESC LIMIT ?"
+                if tag:
+                    # Búsqueda sobre idx_task_tags_user_tag
+                    query += """
+                        AND id IN (SELECT task_id FROM task_tags WHERE user_id = ? AND tag = ?)
+                    """
+                    params.extend([user_id, normalize_tag(tag)])
+
+                # Paginación por clave: continuar después de la última fila entregada
+                if filter_type in DUE_DATE_FILTERS:
+                    sort_column = "due_at"
+                    if after_id is not None:
+                        query += " AND (due_at, id) > (?, ?)"
+                        params.extend([after_value, after_id])
+                    query += " ORDER BY due_at ASC, id ASC LIMIT ?"
+                else:
+                    sort_column = "created_at"
+                    if after_id is not None:
+                        query += " AND (created_at, id) < (?, ?)"
+                        params.extend([after_value, after_id])
+                    query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+                params.append(limit)
+
+                async with db.execute(query, params) as db_cursor:
+                    rows = await db_cursor.fetchall()
+
+                next_cursor = None
+                if rows and len(rows) == limit:
+                    next_cursor = encode_cursor(rows[-1][sort_column], rows[-1]["id"])
+
+                tasks = []
+                for row in rows:
+                    task = dict(row)
+                    # Convertir completed a bool
+                    task["completed"] = bool(task["completed"])
+                    task.pop("due_at", None)
+                    if task.get("scheduled_at") is not None:
+                        scheduled_at = datetime.fromtimestamp(task["scheduled_at"])
+                        task["scheduled_at"] = scheduled_at.isoformat()
+                    tasks.append(task)
+                await self._attach_tags(db, tasks)
+
+                logger.info(f"Listadas {len(tasks)} tareas para usuario {user_id}")
+                return {"tasks": tasks, "next_cursor": next_cursor}
 
-                async with db.execute(query, (user_id, limit)) as cursor:
-                    rows = await cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error listando tareas: {e}")
+            return {"tasks": [], "next_cursor": None}
 
-                    tasks = []
-                    for row in rows:
-                        task = dict(row)
-                        # Convertir tags de string a lista
-                        if task.get("tags"):
-                            task["tags"] = task["tags"].split(",")
-                        else:
-                            task["tags"] = []
-                        # Convertir completed a bool
-                        task["completed"] = bool(task["completed"])
-                        tasks.append(task)
+    async def list_tasks(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = 10,
+        days: int = 7,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista las tareas de un usuario (primera página, ver list_tasks_page).
 
-                    logger.info(f"Listadas {len(tasks)} tareas para usuario {user_id}")
-                    return tasks
+        Args:
+            user_id: ID del usuario
+            filter_type: Filtro (all, pending, completed, urgent, today, overdue,
+                week, upcoming)
+            limit: Límite de resultados
+            days: Días hacia adelante para el filtro upcoming
+            tag: Solo tareas con esta etiqueta
 
-        except Exception as e:
-            logger.error(f"Error listando tareas: {e}")
-            return []
+        Returns:
+            Lista de tareas
+        """
+        page = await self.list_tasks_page(user_id, filter_type, limit=limit, days=days, tag=tag)
+        return page["tasks"]
+
+    async def tag_counts(
+        self, user_id: str, include_completed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Cuenta las tareas de cada etiqueta del usuario.
+
+        Args:
+            user_id: ID del usuario
+            include_completed: Contar también las tareas completadas
+
+        Returns:
+            Lista de {tag, count}, de la etiqueta más usada a la menos usada
+        """
+        # Ambas variantes leen solo un índice de task_tags, sin tocar tasks
+        query = "SELECT tag, COUNT(*) AS count FROM task_tags WHERE user_id = ?"
+        if not include_completed:
+            query += " AND completed = 0"
+        query += " GROUP BY tag ORDER BY count DESC, tag"
+
+        async with self._connection() as db:
+            async with db.execute(query, (user_id,)) as cursor:
+                rows = await cursor.fetchall()
+        return [{"tag": tag, "count": count} for tag, count in rows]
+
+    async def list_schedulable_tasks(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Tareas pendientes que aún no tienen bloque en el calendario.
+
+        Args:
+            user_id: ID del usuario
+            limit: Máximo de tareas
+
+        Returns:
+            Lista de tareas con id, title, priority, due_date, estimated_minutes
+            y created_at, por fecha límite (las que no tienen al final)
+        """
+        async with self._connection() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                """
+                SELECT id, title, priority, due_date, estimated_minutes, created_at
+                FROM tasks
+                WHERE user_id = ? AND completed = 0 AND scheduled_at IS NULL
+                ORDER BY due_at IS NULL, due_at, created_at
+                LIMIT ?
+            """,
+                (user_id, limit),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def mark_tasks_scheduled(self, user_id: str, scheduled: Dict[str, datetime]) -> int:
+        """
+        Registra el inicio del bloque asignado a cada tarea (una transacción).
+
+        Args:
+            user_id: ID del usuario
+            scheduled: Inicio del bloque por ID de tarea
+
+        Returns:
+            Número de tareas actualizadas
+        """
+        if not scheduled:
+            return 0
+        async with self._connection() as db:
+            cursor = await db.executemany(
+                "UPDATE tasks SET scheduled_at = ? WHERE id = ? AND user_id = ?",
+                [
+                    (int(start.timestamp()), task_id, user_id)
+                    for task_id, start in scheduled.items()
+                ],
+            )
+            await db.commit()
+            return cursor.rowcount
 
     async def complete_task(self, task_id: str, user_id: str) -> bool:
         """
@@ -183,7 +653,7 @@ class TaskDatabase:
         try:
             completed_at = datetime.now().isoformat()
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection() as db:
                 cursor = await db.execute(
                     """
                     UPDATE tasks
@@ -217,7 +687,7 @@ class TaskDatabase:
             True si se eliminó exitosamente
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection() as db:
                 cursor = await db.execute(
                     "DELETE FROM tasks WHERE id = ? AND user_id = ?", (task_id, user_id)
                 )
@@ -246,7 +716,7 @@ class TaskDatabase:
             Dict con la tarea o None si no existe
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection() as db:
                 db.row_factory = aiosqlite.Row
 
                 async with db.execute(
@@ -256,11 +726,12 @@ class TaskDatabase:
 
                     if row:
                         task = dict(row)
-                        if task.get("tags"):
-                            task["tags"] = task["tags"].split(",")
-                        else:
-                            task["tags"] = []
                         task["completed"] = bool(task["completed"])
+                        task.pop("due_at", None)
+                        if task.get("scheduled_at") is not None:
+                            scheduled_at = datetime.fromtimestamp(task["scheduled_at"])
+                            task["scheduled_at"] = scheduled_at.isoformat()
+                        await self._attach_tags(db, [task])
                         return task
 
                     return None
@@ -268,3 +739,183 @@ class TaskDatabase:
         except Exception as e:
             logger.error(f"Error obteniendo tarea: {e}")
             return None
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        kinds: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca tareas por título y descripción usando el índice FTS5.
+
+        Args:
+            user_id: ID del usuario
+            query: Texto a buscar (coincide por prefijo, sin acentos)
+            limit: Máximo de resultados
+            offset: Resultados a saltar (paginación)
+            kinds: Tipos a incluir; SQLite solo almacena tareas ("task")
+
+        Returns:
+            Lista de coincidencias ordenadas por relevancia
+        """
+        terms = search_terms(query)
+        if not terms or (kinds and "task" not in kinds):
+            return []
+
+        try:
+            async with self._connection() as db:
+                db.row_factory = aiosqlite.Row
+
+                # El filtro por usuario va dentro del MATCH; el de la tabla solo
+                # descarta IDs que el tokenizer parte en varios términos.
+                # bm25 da más peso al título que a la descripción (menor = mejor)
+                owner = user_id.replace('"', '""')
+                match = f'user_id:"{owner}" AND {{title description}}:({fts5_match(terms)})'
+
+                async with db.execute(
+                    """
+                    SELECT t.id, t.title, t.completed, t.due_date,
+                           snippet(tasks_fts, 1, '[', ']', '…', 12) AS snippet,
+                           bm25(tasks_fts, 10.0, 1.0, 0.0) AS rank
+                    FROM tasks_fts
+                    JOIN tasks t ON t.rowid = tasks_fts.rowid
+                    WHERE tasks_fts MATCH ? AND t.user_id = ?
+                    ORDER BY rank
+                    LIMIT ? OFFSET ?
+                """,
+                    (match, user_id, limit, offset),
+                ) as cursor:
+                    rows = await cursor.fetchall()
+
+            return [
+                {
+                    "type": "task",
+                    "id": row["id"],
+                    "title": row["title"],
+                    "snippet": row["snippet"],
+                    "completed": bool(row["completed"]),
+                    "due_date": row["due_date"],
+                    "rank": round(-row["rank"], 6),
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            logger.error(f"Error buscando tareas: {e}")
+            return []
+
+    # ==================== MANTENIMIENTO ====================
+
+    async def archive_completed_tasks(self, before: datetime, batch_size: int = 1000) -> int:
+        """
+        Mueve a tasks_archive las tareas completadas antes de before.
+
+        Cada lote es una transacción corta (copiar y borrar), así que el
+        archivado no bloquea la base mientras el bot la usa.
+
+        Args:
+            before: Se archivan las completadas antes de este momento
+            batch_size: Tareas por transacción
+
+        Returns:
+            Número de tareas archivadas
+        """
+        total = 0
+        try:
+            async with self._connection() as db:
+                while True:
+                    async with db.execute(
+                        """
+                        SELECT id FROM tasks
+                        WHERE completed = 1 AND completed_at < ?
+                        ORDER BY completed_at
+                        LIMIT ?
+                    """,
+                        (before.isoformat(), batch_size),
+                    ) as cursor:
+                        ids = [row[0] for row in await cursor.fetchall()]
+                    if not ids:
+                        break
+
+                    placeholders = ", ".join("?" * len(ids))
+                    # Las etiquetas se leen antes del DELETE (su trigger borra task_tags)
+                    await db.execute(
+                        f"""
+                        INSERT OR IGNORE INTO tasks_archive
+                        (id, user_id, title, description, priority, due_date, tags,
+                         created_at, completed_at, archived_at)
+                        SELECT t.id, t.user_id, t.title, t.description, t.priority, t.due_date,
+                               (SELECT group_concat(tag, ',') FROM task_tags WHERE task_id = t.id),
+                               t.created_at, t.completed_at, ?
+                        FROM tasks t WHERE t.id IN ({placeholders})
+                    """,
+                        (datetime.now().isoformat(), *ids),
+                    )
+                    await db.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", ids)
+                    await db.commit()
+                    total += len(ids)
+                    if len(ids) < batch_size:
+                        break
+
+            if total:
+                logger.info(f"Tareas archivadas: {total}")
+            return total
+
+        except Exception as e:
+            logger.error(f"Error archivando tareas: {e}")
+            return total
+
+    async def maintenance(self, vacuum_threshold: float = 0.2) -> Dict[str, Any]:
+        """
+        Renueva las estadísticas del planificador y compacta la base si hace falta.
+
+        ANALYZE se ejecuta siempre. VACUUM solo cuando las páginas libres
+        (lo que dejan los borrados y el archivado) superan vacuum_threshold
+        del archivo, y después reconstruye el índice FTS5, que se enlaza por
+        rowid.
+
+        Args:
+            vacuum_threshold: Fracción de páginas libres a partir de la que se compacta
+
+        Returns:
+            Dict con free_ratio y vacuumed
+        """
+        try:
+            async with self._connection() as db:
+                async with db.execute("PRAGMA page_count") as cursor:
+                    pages = (await cursor.fetchone())[0]
+                async with db.execute("PRAGMA freelist_count") as cursor:
+                    free = (await cursor.fetchone())[0]
+
+                free_ratio = free / pages if pages else 0.0
+                vacuumed = free_ratio > vacuum_threshold
+                if vacuumed:
+                    await db.execute("VACUUM")
+                await db.execute("ANALYZE")
+                await db.commit()
+
+            if vacuumed:
+                await self.rebuild_search_index()
+            logger.info(
+                f"Mantenimiento SQLite: {free_ratio:.0%} páginas libres, "
+                f"VACUUM {'ejecutado' if vacuumed else 'omitido'}"
+            )
+            return {"free_ratio": round(free_ratio, 3), "vacuumed": vacuumed}
+
+        except Exception as e:
+            logger.error(f"Error en el mantenimiento de SQLite: {e}")
+            return {"error": str(e)}
+
+    async def run_maintenance(self, policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """
+        Archiva las tareas completadas según la política y ejecuta maintenance().
+
+        Returns:
+            Dict con tasks_archived, free_ratio y vacuumed
+        """
+        policy = policy or RetentionPolicy()
+        archived = await self.archive_completed_tasks(policy.tasks_cutoff())
+        return {"tasks_archived": archived, **await self.maintenance()}
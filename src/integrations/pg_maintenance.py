@@ -0,0 +1,279 @@
+"""
+Mantenimiento periódico de PostgreSQL: particiones, archivo y VACUUM.
+
+reminders está particionada por mes de trigger_time (ver la migración
+v10). Este módulo crea las particiones de los meses siguientes antes de
+que lleguen filas, elimina de una vez los meses cuyos recordatorios ya se
+ejecutaron todos, mueve las tareas completadas antiguas a tasks_archive
+y ejecuta VACUUM (ANALYZE) sobre las tablas activas.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from ..utils.retention import RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock del mantenimiento: el bot y los listeners pueden programarlo
+# a la vez, pero solo una sesión lo ejecuta
+MAINTENANCE_LOCK_ID = 7_210_002
+
+# Particiones mensuales: reminders_pYYYYMM (límites en UTC)
+PARTITION_PREFIX = "reminders_p"
+DEFAULT_PARTITION = "reminders_default"
+
+# Columnas reales de reminders (search_vector es generada)
+REMINDER_TABLE_COLUMNS = [
+    "id",
+    "user_id",
+    "title",
+    "message",
+    "trigger_time",
+    "reminder_type",
+    "priority",
+    "sound_type",
+    "executed",
+    "executed_at",
+    "created_at",
+    "claimed_by",
+    "lease_until",
+    "recurrence",
+]
+
+# Tablas que se compactan y cuyas estadísticas se renuevan tras archivar
+HOT_TABLES = ("tasks", "reminders", "events")
+
+# Lápidas de borrados para la sincronización incremental (v7 y v12)
+TOMBSTONE_TABLES = ("event_tombstones", "task_tombstones", "reminder_tombstones")
+
+# Mueve un lote de tareas completadas a tasks_archive y devuelve cuántas
+ARCHIVE_TASKS = """
+    WITH moved AS (
+        DELETE FROM tasks
+        WHERE id IN (
+            SELECT id FROM tasks
+            WHERE completed = TRUE AND completed_at < $1
+            ORDER BY completed_at
+            LIMIT $2
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, user_id, title, description, priority, due_date, tags,
+                  created_at, completed_at
+    ), archived AS (
+        INSERT INTO tasks_archive
+        (id, user_id, title, description, priority, due_date, tags, created_at, completed_at)
+        SELECT * FROM moved
+        ON CONFLICT (id) DO NOTHING
+    )
+    SELECT COUNT(*) FROM moved
+"""
+
+
+def as_utc(value: datetime) -> datetime:
+    """datetime con zona en UTC; los que no tienen zona se toman como hora local."""
+    return value.astimezone(timezone.utc)
+
+
+def month_start(value: datetime) -> datetime:
+    """Primer instante (UTC) del mes de value."""
+    value = as_utc(value)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def next_month(month: datetime) -> datetime:
+    """Primer instante del mes siguiente."""
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Nombre de la partición de reminders de ese mes."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+async def create_reminder_partition(conn: asyncpg.Connection, month: datetime) -> bool:
+    """
+    Crea la partición de un mes si no existe.
+
+    Si la partición por defecto ya tiene filas de ese mes (llegaron antes
+    que la partición), se mueven a la nueva en la misma transacción.
+
+    Returns:
+        True si se creó
+    """
+    start = month_start(month)
+    end = next_month(start)
+    name = partition_name(start)
+    columns = ", ".join(REMINDER_TABLE_COLUMNS)
+
+    async with conn.transaction():
+        if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name):
+            return False
+        moved = await conn.fetch(
+            f"""
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE trigger_time >= $1 AND trigger_time < $2
+            RETURNING {columns}
+            """,
+            start,
+            end,
+        )
+        # Los límites de una partición no admiten parámetros
+        await conn.execute(
+            f"CREATE TABLE {name} PARTITION OF reminders "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        if moved:
+            await conn.copy_records_to_table(
+                "reminders", records=[tuple(row) for row in moved], columns=REMINDER_TABLE_COLUMNS
+            )
+
+    logger.info(f"Partición creada: {name} ({len(moved)} filas movidas desde {DEFAULT_PARTITION})")
+    return True
+
+
+async def ensure_reminder_partitions(
+    conn: asyncpg.Connection, months_ahead: int = 3, since: Optional[datetime] = None
+) -> List[str]:
+    """
+    Crea las particiones desde el mes de since hasta months_ahead meses después del actual.
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    month = month_start(since or datetime.now(timezone.utc))
+    last = month_start(datetime.now(timezone.utc))
+    for _ in range(months_ahead):
+        last = next_month(last)
+
+    created = []
+    while month <= last:
+        if await create_reminder_partition(conn, month):
+            created.append(partition_name(month))
+        month = next_month(month)
+    return created
+
+
+async def drop_expired_reminder_partitions(
+    conn: asyncpg.Connection, before: datetime
+) -> List[str]:
+    """
+    Elimina los meses de recordatorios que terminaron antes de before.
+
+    DROP de una partición no recorre filas. Un mes que aún tiene
+    recordatorios sin ejecutar se conserva.
+
+    Returns:
+        Nombres de las particiones eliminadas
+    """
+    rows = await conn.fetch(
+        """
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'reminders'::regclass AND c.relname LIKE $1
+        ORDER BY c.relname
+        """,
+        f"{PARTITION_PREFIX}%",
+    )
+    cutoff = as_utc(before)
+    dropped = []
+    for row in rows:
+        name = row["relname"]
+        month = datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m")
+        if next_month(month.replace(tzinfo=timezone.utc)) > cutoff:
+            break
+        async with conn.transaction():
+            # Bloquear altas en el mes mientras se decide
+            await conn.execute(f"LOCK TABLE {name} IN SHARE MODE")
+            if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE NOT executed)"):
+                logger.warning(f"Partición {name} conservada: tiene recordatorios pendientes")
+                continue
+            await conn.execute(f"DROP TABLE {name}")
+        dropped.append(name)
+        logger.info(f"Partición eliminada: {name}")
+    return dropped
+
+
+async def archive_completed_tasks(
+    conn: asyncpg.Connection, before: datetime, batch_size: int = 1000
+) -> int:
+    """
+    Mueve a tasks_archive las tareas completadas antes de before.
+
+    Cada lote es una transacción corta, así que el archivado convive con
+    el tráfico normal sin bloquear la tabla.
+
+    Returns:
+        Número de tareas archivadas
+    """
+    total = 0
+    while True:
+        moved = await conn.fetchval(ARCHIVE_TASKS, as_utc(before), batch_size)
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+async def purge_tombstones(conn: asyncpg.Connection, before: datetime) -> int:
+    """
+    Elimina las lápidas anteriores a before.
+
+    Returns:
+        Número de lápidas eliminadas
+    """
+    total = 0
+    for table in TOMBSTONE_TABLES:
+        status = await conn.execute(f"DELETE FROM {table} WHERE deleted_at < $1", as_utc(before))
+        total += int(status.split()[-1])
+    return total
+
+
+async def vacuum_analyze(conn: asyncpg.Connection, tables=HOT_TABLES):
+    """VACUUM (ANALYZE) de las tablas (no puede ir dentro de una transacción)."""
+    for table in tables:
+        await conn.execute(f"VACUUM (ANALYZE) {table}")
+
+
+async def run_maintenance(conn: asyncpg.Connection, policy: RetentionPolicy) -> Dict[str, Any]:
+    """
+    Ejecuta una pasada completa de mantenimiento.
+
+    Si otra sesión ya la está ejecutando, no hace nada.
+
+    Args:
+        conn: Conexión sin transacción abierta
+        policy: Edades de retención y particiones por adelantado
+
+    Returns:
+        Dict con partitions_created, partitions_dropped, tasks_archived y
+        tombstones_purged, o skipped=True si otra sesión tenía el lock
+    """
+    if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", MAINTENANCE_LOCK_ID):
+        logger.info("Mantenimiento en curso en otra sesión, se omite")
+        return {"skipped": True}
+
+    try:
+        created = await ensure_reminder_partitions(conn, policy.partitions_ahead)
+        dropped = await drop_expired_reminder_partitions(conn, policy.reminders_cutoff())
+        archived = await archive_completed_tasks(conn, policy.tasks_cutoff())
+        purged = await purge_tombstones(conn, policy.tombstones_cutoff())
+        await vacuum_analyze(conn)
+        await conn.execute("ANALYZE tasks_archive")
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MAINTENANCE_LOCK_ID)
+
+    logger.info(
+        f"Mantenimiento: {len(created)} particiones creadas, {len(dropped)} eliminadas, "
+        f"{archived} tareas archivadas, {purged} lápidas eliminadas"
+    )
+    return {
+        "partitions_created": created,
+        "partitions_dropped": dropped,
+        "tasks_archived": archived,
+        "tombstones_purged": purged,
+    }
@@ -0,0 +1,693 @@
+"""
+Migraciones versionadas del esquema de PostgreSQL.
+
+Cada migración se aplica una sola vez y queda registrada en la tabla
+schema_migrations. Se ejecutan dentro de una transacción protegida por un
+advisory lock, así que el bot en Railway y el PC local pueden arrancar a
+la vez sin aplicar la misma migración dos veces.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+
+import asyncpg
+
+from .pg_maintenance import REMINDER_TABLE_COLUMNS, ensure_reminder_partitions
+from ..utils.dates import parse_due_date
+from ..utils.tags import MAX_TAG_LENGTH, MAX_TAGS
+
+logger = logging.getLogger(__name__)
+
+# Identificador arbitrario del advisory lock de migraciones
+MIGRATION_LOCK_ID = 7_210_001
+
+# Canal de NOTIFY con los cambios de la tabla reminders
+REMINDER_CHANNEL = "reminders_changed"
+
+
+@dataclass
+class Migration:
+    """Representa una versión del esquema."""
+
+    version: int
+    description: str
+    apply: Callable[[asyncpg.Connection], Awaitable[None]]
+
+
+async def _v1_initial_schema(conn: asyncpg.Connection):
+    """Esquema original: tablas base, due_at normalizado y búsqueda de texto."""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            priority TEXT DEFAULT 'medium',
+            due_date TEXT,
+            tags TEXT DEFAULT '',
+            completed BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            completed_at TIMESTAMP,
+            due_at TIMESTAMP
+        )
+        """
+    )
+
+    # Bases anteriores a due_at: normalizar el texto libre de due_date
+    await conn.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS due_at TIMESTAMP")
+    rows = await conn.fetch(
+        """
+        SELECT id, due_date FROM tasks
+        WHERE due_at IS NULL AND due_date IS NOT NULL AND due_date <> ''
+        """
+    )
+    updates = []
+    for row in rows:
+        due_dt = parse_due_date(row["due_date"])
+        if due_dt:
+            updates.append((due_dt.isoformat(), due_dt, row["id"]))
+    if updates:
+        await conn.executemany(
+            "UPDATE tasks SET due_date = $1, due_at = $2 WHERE id = $3", updates
+        )
+        logger.info(f"Migración due_at aplicada ({len(updates)} tareas normalizadas)")
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reminders (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            trigger_time TIMESTAMP NOT NULL,
+            reminder_type TEXT DEFAULT 'notification',
+            priority TEXT DEFAULT 'normal',
+            sound_type TEXT,
+            executed BOOLEAN DEFAULT FALSE,
+            executed_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+        """
+    )
+
+    # Columnas tsvector generadas (STORED): PostgreSQL las recalcula en cada
+    # INSERT/UPDATE, así que el índice GIN nunca queda desincronizado.
+    sources = {
+        "tasks": ("title", "description"),
+        "events": ("title", "description"),
+        "reminders": ("title", "message"),
+    }
+    for table, (primary, secondary) in sources.items():
+        await conn.execute(
+            f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', coalesce({primary}, '')), 'A') ||
+                setweight(to_tsvector('spanish', coalesce({secondary}, '')), 'B')
+            ) STORED
+            """
+        )
+        await conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN(search_vector)"
+        )
+
+
+async def _v2_timestamptz_and_query_indexes(conn: asyncpg.Connection):
+    """
+    Tipos timestamptz e índices compuestos/parciales según las consultas.
+
+    Los TIMESTAMP existentes se interpretan en la zona horaria de la sesión
+    que aplica la migración. due_date pasa a ser la fecha normalizada
+    (antes due_at); el texto libre que no se pudo interpretar se descarta.
+    """
+    # Índices de una sola columna (completed/executed son de baja selectividad)
+    await conn.execute(
+        """
+        DROP INDEX IF EXISTS idx_tasks_user, idx_tasks_completed, idx_tasks_user_due,
+            idx_events_user, idx_reminders_user, idx_reminders_executed
+        """
+    )
+
+    await conn.execute("ALTER TABLE tasks DROP COLUMN due_date")
+    await conn.execute("ALTER TABLE tasks RENAME COLUMN due_at TO due_date")
+    await conn.execute(
+        """
+        ALTER TABLE tasks
+            ALTER COLUMN due_date TYPE TIMESTAMPTZ,
+            ALTER COLUMN created_at TYPE TIMESTAMPTZ,
+            ALTER COLUMN completed_at TYPE TIMESTAMPTZ
+        """
+    )
+    await conn.execute(
+        """
+        ALTER TABLE events
+            ALTER COLUMN start_time TYPE TIMESTAMPTZ,
+            ALTER COLUMN end_time TYPE TIMESTAMPTZ,
+            ALTER COLUMN created_at TYPE TIMESTAMPTZ
+        """
+    )
+    await conn.execute(
+        """
+        ALTER TABLE reminders
+            ALTER COLUMN trigger_time TYPE TIMESTAMPTZ,
+            ALTER COLUMN executed_at TYPE TIMESTAMPTZ,
+            ALTER COLUMN created_at TYPE TIMESTAMPTZ
+        """
+    )
+
+    # Un índice por forma de consulta en PostgresDatabase (ver QUERIES)
+    await conn.execute(
+        """
+        CREATE INDEX idx_tasks_user_created ON tasks(user_id, created_at DESC);
+
+        CREATE INDEX idx_tasks_pending_created ON tasks(user_id, created_at DESC)
+            WHERE completed = FALSE;
+
+        CREATE INDEX idx_tasks_urgent_created ON tasks(user_id, created_at DESC)
+            WHERE completed = FALSE AND priority = 'urgent';
+
+        CREATE INDEX idx_tasks_done_completed ON tasks(user_id, completed_at DESC)
+            WHERE completed = TRUE;
+
+        CREATE INDEX idx_tasks_pending_due ON tasks(user_id, due_date)
+            WHERE completed = FALSE AND due_date IS NOT NULL;
+
+        CREATE INDEX idx_events_user_start ON events(user_id, start_time);
+
+        CREATE INDEX idx_reminders_pending_trigger ON reminders(user_id, trigger_time)
+            WHERE executed = FALSE;
+        """
+    )
+
+
+async def _v3_keyset_pagination_indexes(conn: asyncpg.Connection):
+    """
+    Agrega id como desempate a los índices ordenados.
+
+    La paginación por cursor compara (columna de orden, id); con id en el
+    índice la comparación y el ORDER BY se resuelven sin ordenar en memoria.
+    """
+    await conn.execute(
+        """
+        DROP INDEX IF EXISTS idx_tasks_user_created, idx_tasks_pending_created,
+            idx_tasks_urgent_created, idx_tasks_done_completed, idx_tasks_pending_due,
+            idx_events_user_start, idx_reminders_pending_trigger;
+
+        CREATE INDEX idx_tasks_user_created ON tasks(user_id, created_at DESC, id DESC);
+
+        CREATE INDEX idx_tasks_pending_created ON tasks(user_id, created_at DESC, id DESC)
+            WHERE completed = FALSE;
+
+        CREATE INDEX idx_tasks_urgent_created ON tasks(user_id, created_at DESC, id DESC)
+            WHERE completed = FALSE AND priority = 'urgent';
+
+        CREATE INDEX idx_tasks_done_completed ON tasks(user_id, completed_at DESC, id DESC)
+            WHERE completed = TRUE;
+
+        CREATE INDEX idx_tasks_pending_due ON tasks(user_id, due_date, id)
+            WHERE completed = FALSE AND due_date IS NOT NULL;
+
+        CREATE INDEX idx_events_user_start ON events(user_id, start_time, id);
+
+        CREATE INDEX idx_reminders_pending_trigger ON reminders(user_id, trigger_time, id)
+            WHERE executed = FALSE;
+        """
+    )
+
+
+async def _v4_reminder_notify_trigger(conn: asyncpg.Connection):
+    """
+    Trigger que publica en REMINDER_CHANNEL cada cambio de reminders.
+
+    El payload es JSON con op, id, user_id, trigger_time y executed, así
+    los listeners deciden sin consultar si el cambio les afecta. NOTIFY se
+    entrega al hacer COMMIT, nunca para transacciones abortadas.
+    """
+    await conn.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_reminder_change() RETURNS trigger AS $$
+        DECLARE
+            r reminders%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                r := OLD;
+            ELSE
+                r := NEW;
+            END IF;
+            PERFORM pg_notify(
+                '{REMINDER_CHANNEL}',
+                json_build_object(
+                    'op', TG_OP,
+                    'id', r.id,
+                    'user_id', r.user_id,
+                    'trigger_time', r.trigger_time,
+                    'executed', r.executed
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS reminders_notify ON reminders;
+
+        CREATE TRIGGER reminders_notify
+            AFTER INSERT OR UPDATE OR DELETE ON reminders
+            FOR EACH ROW EXECUTE FUNCTION notify_reminder_change();
+        """
+    )
+
+
+async def _v5_reminder_leases(conn: asyncpg.Connection):
+    """
+    Columnas de reclamo para el despacho de recordatorios.
+
+    Un listener reclama los recordatorios vencidos (claimed_by, lease_until)
+    antes de ejecutarlos; si se cae sin confirmarlos, el lease expira y otro
+    los vuelve a reclamar. El trigger de NOTIFY deja de dispararse por los
+    cambios de lease, que no alteran cuándo vence un recordatorio.
+    """
+    await conn.execute(
+        """
+        ALTER TABLE reminders
+            ADD COLUMN claimed_by TEXT,
+            ADD COLUMN lease_until TIMESTAMPTZ;
+
+        DROP TRIGGER IF EXISTS reminders_notify ON reminders;
+
+        CREATE TRIGGER reminders_notify
+            AFTER INSERT OR DELETE OR UPDATE OF user_id, trigger_time, executed ON reminders
+            FOR EACH ROW EXECUTE FUNCTION notify_reminder_change();
+        """
+    )
+
+
+async def _v6_pending_reminders_by_time(conn: asyncpg.Connection):
+    """Índice para reclamar los recordatorios vencidos de todos los usuarios."""
+    await conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_reminders_pending_due ON reminders(trigger_time)
+            WHERE executed = FALSE
+        """
+    )
+
+
+async def _v7_event_change_tracking(conn: asyncpg.Connection):
+    """
+    Marca de modificación y lápidas de eventos para la sincronización incremental.
+
+    updated_at se actualiza por trigger en cada cambio, y cada borrado deja
+    una fila en event_tombstones. Así la sincronización con calcurse pide
+    solo lo cambiado desde su última marca (ver CalendarSync).
+    """
+    await conn.execute(
+        """
+        ALTER TABLE events ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+        UPDATE events SET updated_at = created_at WHERE created_at IS NOT NULL;
+
+        CREATE INDEX idx_events_user_updated ON events(user_id, updated_at);
+
+        CREATE TABLE event_tombstones (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
+        CREATE INDEX idx_event_tombstones_user_deleted ON event_tombstones(user_id, deleted_at);
+
+        CREATE OR REPLACE FUNCTION track_event_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO event_tombstones (id, user_id) VALUES (OLD.id, OLD.user_id)
+                ON CONFLICT (id) DO UPDATE SET deleted_at = NOW();
+                RETURN OLD;
+            END IF;
+            NEW.updated_at := NOW();
+            IF TG_OP = 'INSERT' THEN
+                -- Un id reutilizado deja de estar borrado
+                DELETE FROM event_tombstones WHERE id = NEW.id;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER events_track_change
+            BEFORE INSERT OR UPDATE OR DELETE ON events
+            FOR EACH ROW EXECUTE FUNCTION track_event_change();
+        """
+    )
+
+
+async def _v8_recurrence(conn: asyncpg.Connection):
+    """
+    RRULE de eventos y recordatorios recurrentes.
+
+    Una serie es una sola fila: el evento guarda su primera repetición y el
+    recordatorio la próxima. recurrence_until es el fin de la última
+    repetición del evento (NULL si la serie no termina) y permite descartar
+    en SQL las series que ya acabaron antes del rango consultado.
+    """
+    await conn.execute(
+        """
+        ALTER TABLE events ADD COLUMN recurrence TEXT;
+        ALTER TABLE events ADD COLUMN recurrence_until TIMESTAMPTZ;
+        ALTER TABLE reminders ADD COLUMN recurrence TEXT;
+
+        CREATE INDEX idx_events_user_series ON events(user_id, start_time)
+            WHERE recurrence IS NOT NULL;
+        """
+    )
+
+
+async def _v9_tag_arrays(conn: asyncpg.Connection):
+    """
+    Etiquetas de tareas como text[] con índice GIN.
+
+    Antes se guardaban como texto "a,b,c" y filtrar por etiqueta obligaba a
+    leer todas las tareas. El índice GIN resuelve tags @> ARRAY[...] por
+    búsqueda, y las etiquetas se normalizan paso a paso igual que
+    utils.tags.normalize_tag: sin espacios en los extremos ni '#' inicial,
+    espacios internos colapsados, minúsculas y recortadas; después sin
+    vacías ni duplicadas, en el orden original y como mucho MAX_TAGS.
+    """
+    await conn.execute(
+        f"""
+        -- ALTER COLUMN ... USING no admite subconsultas: columna nueva y renombre
+        ALTER TABLE tasks ADD COLUMN tag_list TEXT[] NOT NULL DEFAULT '{{}}';
+        UPDATE tasks SET tag_list = ARRAY(
+            SELECT tag FROM (
+                SELECT tag, MIN(idx) AS idx
+                FROM (
+                    SELECT rtrim(left(lower(btrim(regexp_replace(
+                               ltrim(regexp_replace(raw, '^\\s+', ''), '#'),
+                               '\\s+', ' ', 'g'))), {MAX_TAG_LENGTH})) AS tag,
+                           idx
+                    FROM unnest(string_to_array(tags, ',')) WITH ORDINALITY AS t(raw, idx)
+                ) AS normalized
+                WHERE tag <> ''
+                GROUP BY tag
+            ) AS unique_tags
+            ORDER BY idx
+            LIMIT {MAX_TAGS}
+        )
+        WHERE tags IS NOT NULL AND tags <> '';
+        ALTER TABLE tasks DROP COLUMN tags;
+        ALTER TABLE tasks RENAME COLUMN tag_list TO tags;
+
+        CREATE INDEX idx_tasks_tags ON tasks USING GIN (tags);
+        """
+    )
+
+
+async def _v10_partitioned_reminders(conn: asyncpg.Connection):
+    """
+    reminders particionada por mes de trigger_time.
+
+    Los recordatorios ejecutados de meses pasados se eliminan con un DROP
+    de su partición (ver pg_maintenance) en lugar de un DELETE masivo que
+    deja la tabla y sus índices llenos de tuplas muertas. La clave primaria
+    pasa a ser (id, trigger_time), porque debe incluir la columna de
+    partición; los ids siguen generándose únicos. Las filas fuera de las
+    particiones mensuales caen en reminders_default hasta que se crea su mes.
+    """
+    columns = ", ".join(REMINDER_TABLE_COLUMNS)
+    first = await conn.fetchval("SELECT MIN(trigger_time) FROM reminders")
+
+    await conn.execute(
+        """
+        ALTER TABLE reminders RENAME TO reminders_unpartitioned;
+        ALTER TABLE reminders_unpartitioned
+            RENAME CONSTRAINT reminders_pkey TO reminders_unpartitioned_pkey;
+
+        CREATE TABLE reminders (
+            id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            trigger_time TIMESTAMPTZ NOT NULL,
+            reminder_type TEXT DEFAULT 'notification',
+            priority TEXT DEFAULT 'normal',
+            sound_type TEXT,
+            executed BOOLEAN DEFAULT FALSE,
+            executed_at TIMESTAMPTZ,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('spanish', coalesce(message, '')), 'B')
+            ) STORED,
+            claimed_by TEXT,
+            lease_until TIMESTAMPTZ,
+            recurrence TEXT,
+            PRIMARY KEY (id, trigger_time)
+        ) PARTITION BY RANGE (trigger_time);
+
+        CREATE TABLE reminders_default PARTITION OF reminders DEFAULT;
+        """
+    )
+
+    # Particiones antes de copiar, para no pasar las filas por reminders_default
+    await ensure_reminder_partitions(conn, since=first)
+
+    await conn.execute(
+        f"""
+        INSERT INTO reminders ({columns})
+        SELECT {columns} FROM reminders_unpartitioned;
+
+        DROP TABLE reminders_unpartitioned;
+
+        CREATE INDEX idx_reminders_pending_trigger ON reminders(user_id, trigger_time, id)
+            WHERE executed = FALSE;
+        CREATE INDEX idx_reminders_pending_due ON reminders(trigger_time)
+            WHERE executed = FALSE;
+        CREATE INDEX idx_reminders_search ON reminders USING GIN(search_vector);
+
+        -- RECORD en lugar de reminders%ROWTYPE: la fila llega desde una partición
+        CREATE OR REPLACE FUNCTION notify_reminder_change() RETURNS trigger AS $$
+        DECLARE
+            r RECORD;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                r := OLD;
+            ELSE
+                r := NEW;
+            END IF;
+            PERFORM pg_notify(
+                '{REMINDER_CHANNEL}',
+                json_build_object(
+                    'op', TG_OP,
+                    'id', r.id,
+                    'user_id', r.user_id,
+                    'trigger_time', r.trigger_time,
+                    'executed', r.executed
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER reminders_notify
+            AFTER INSERT OR DELETE OR UPDATE OF user_id, trigger_time, executed ON reminders
+            FOR EACH ROW EXECUTE FUNCTION notify_reminder_change();
+        """
+    )
+
+
+async def _v11_tasks_archive(conn: asyncpg.Connection):
+    """
+    Archivo de tareas completadas.
+
+    Las tareas completadas hace más de la retención configurada se mueven a
+    tasks_archive (ver pg_maintenance.archive_completed_tasks), así las
+    consultas y los índices de tasks solo cargan con el trabajo vigente.
+    """
+    await conn.execute(
+        """
+        CREATE TABLE tasks_archive (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            priority TEXT DEFAULT 'medium',
+            due_date TIMESTAMPTZ,
+            tags TEXT[] NOT NULL DEFAULT '{}',
+            created_at TIMESTAMPTZ,
+            completed_at TIMESTAMPTZ,
+            archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
+        CREATE INDEX idx_tasks_archive_user_completed
+            ON tasks_archive(user_id, completed_at DESC, id DESC);
+
+        -- Lotes del archivado: completadas más antiguas primero
+        CREATE INDEX idx_tasks_completed_at ON tasks(completed_at) WHERE completed = TRUE;
+        """
+    )
+
+
+async def _v12_replica_change_tracking(conn: asyncpg.Connection):
+    """
+    Marca de modificación y lápidas de tareas y recordatorios.
+
+    Igual que los eventos en v7: updated_at se actualiza por trigger y cada
+    borrado (incluido el archivado de tareas) deja una lápida. La réplica
+    local del PC (ver pg_replica) pide solo lo cambiado desde su marca. En
+    reminders el trigger ignora los cambios de lease, que no se replican;
+    un UPDATE que mueve la fila de partición se ejecuta como DELETE más
+    INSERT, y el INSERT retira la lápida que deja el DELETE.
+    """
+    await conn.execute(
+        """
+        ALTER TABLE tasks ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+        UPDATE tasks SET updated_at = COALESCE(completed_at, created_at, NOW());
+        CREATE INDEX idx_tasks_user_updated ON tasks(user_id, updated_at, id);
+
+        ALTER TABLE reminders ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+        UPDATE reminders SET updated_at = COALESCE(executed_at, created_at, NOW());
+        CREATE INDEX idx_reminders_user_updated ON reminders(user_id, updated_at, id);
+
+        CREATE TABLE task_tombstones (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        CREATE INDEX idx_task_tombstones_user_deleted ON task_tombstones(user_id, deleted_at);
+
+        CREATE TABLE reminder_tombstones (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        CREATE INDEX idx_reminder_tombstones_user_deleted
+            ON reminder_tombstones(user_id, deleted_at);
+
+        CREATE OR REPLACE FUNCTION track_task_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO task_tombstones (id, user_id) VALUES (OLD.id, OLD.user_id)
+                ON CONFLICT (id) DO UPDATE SET deleted_at = NOW();
+                RETURN OLD;
+            END IF;
+            NEW.updated_at := NOW();
+            IF TG_OP = 'INSERT' THEN
+                DELETE FROM task_tombstones WHERE id = NEW.id;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER tasks_track_change
+            BEFORE INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW EXECUTE FUNCTION track_task_change();
+
+        CREATE OR REPLACE FUNCTION track_reminder_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO reminder_tombstones (id, user_id) VALUES (OLD.id, OLD.user_id)
+                ON CONFLICT (id) DO UPDATE SET deleted_at = NOW();
+                RETURN OLD;
+            END IF;
+            NEW.updated_at := NOW();
+            IF TG_OP = 'INSERT' THEN
+                DELETE FROM reminder_tombstones WHERE id = NEW.id;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER reminders_track_change
+            BEFORE INSERT OR DELETE OR UPDATE OF user_id, title, message, trigger_time,
+                reminder_type, priority, sound_type, executed, recurrence
+            ON reminders
+            FOR EACH ROW EXECUTE FUNCTION track_reminder_change();
+        """
+    )
+
+
+async def _v13_task_scheduling(conn: asyncpg.Connection):
+    """
+    Columnas del auto-scheduler en tasks, como en SQLite.
+
+    estimated_minutes es la duración estimada y scheduled_at el inicio del
+    bloque de calendario asignado. El índice parcial cubre la consulta de
+    tareas pendientes sin bloque (tasks_schedulable), por fecha límite.
+    """
+    await conn.execute(
+        """
+        ALTER TABLE tasks ADD COLUMN estimated_minutes INTEGER;
+        ALTER TABLE tasks ADD COLUMN scheduled_at TIMESTAMPTZ;
+
+        CREATE INDEX idx_tasks_schedulable
+            ON tasks(user_id, due_date NULLS LAST, created_at)
+            WHERE completed = FALSE AND scheduled_at IS NULL;
+        """
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "esquema inicial", _v1_initial_schema),
+    Migration(2, "timestamptz e índices compuestos/parciales", _v2_timestamptz_and_query_indexes),
+    Migration(3, "índices con desempate para paginación", _v3_keyset_pagination_indexes),
+    Migration(4, "NOTIFY de cambios en reminders", _v4_reminder_notify_trigger),
+    Migration(5, "reclamo con lease de recordatorios", _v5_reminder_leases),
+    Migration(6, "índice de recordatorios pendientes por hora", _v6_pending_reminders_by_time),
+    Migration(7, "seguimiento de cambios de eventos", _v7_event_change_tracking),
+    Migration(8, "eventos y recordatorios recurrentes", _v8_recurrence),
+    Migration(9, "etiquetas como text[] con índice GIN", _v9_tag_arrays),
+    Migration(10, "reminders particionada por mes", _v10_partitioned_reminders),
+    Migration(11, "archivo de tareas completadas", _v11_tasks_archive),
+    Migration(12, "seguimiento de cambios de tareas y recordatorios", _v12_replica_change_tracking),
+    Migration(13, "columnas del auto-scheduler en tasks", _v13_task_scheduling),
+]
+
+
+async def apply_migrations(conn: asyncpg.Connection) -> int:
+    """
+    Aplica las migraciones pendientes en orden.
+
+    Args:
+        conn: Conexión de asyncpg
+
+    Returns:
+        Versión del esquema tras aplicar las migraciones
+    """
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", MIGRATION_LOCK_ID)
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ DEFAULT NOW()
+            )
+            """
+        )
+        current = await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+            await migration.apply(conn)
+            await conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES ($1, $2)",
+                migration.version,
+                migration.description,
+            )
+            current = migration.version
+            logger.info(f"Migración aplicada: v{migration.version} - {migration.description}")
+
+    return current
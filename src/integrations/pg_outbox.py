@@ -0,0 +1,707 @@
+"""
+Escrituras diferidas (write-behind) hacia PostgreSQL.
+
+OutboxDatabase envuelve a PostgresDatabase: crear y completar tareas,
+crear y cancelar recordatorios se guardan primero en un outbox local
+(SQLite en modo WAL, solo se agrega al final) y se confirman al usuario
+en cuanto están en disco. Una tarea de fondo los aplica a PostgreSQL en
+lotes, cada lote en una transacción con escrituras idempotentes, así que
+reintentar un lote que sí llegó a aplicarse no duplica nada. Si
+PostgreSQL está caído o lento, las escrituras se acumulan y salen en
+orden cuando vuelve.
+
+Las lecturas de tareas y recordatorios combinan el resultado de
+PostgreSQL con lo que aún está en el outbox, así el usuario ve lo que
+acaba de crear. Las operaciones de TaskRepository que van directas a
+PostgreSQL (etiquetas, búsqueda, planificación, borrado) aplican antes lo
+pendiente del usuario. Los métodos propios de PostgresDatabase (eventos,
+cola de recordatorios, réplica) se delegan sin cambios.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+import asyncpg
+
+from .postgres_db import PostgresDatabase
+from .repository import TaskRepository
+from ..utils.dates import DUE_DATE_FILTERS, as_aware, due_date_range, parse_due_date
+from ..utils.pagination import MAX_PAGE_SIZE
+from ..utils.recurrence import RecurrenceRule
+from ..utils.retention import RetentionPolicy
+from ..utils.tags import normalize_tag, normalize_tags
+
+logger = logging.getLogger(__name__)
+
+# Fallos de red o de conexión: el lote se reintenta entero más tarde. Los
+# demás errores de PostgreSQL y de asyncpg son de datos y se aíslan por
+# escritura (ver _is_transient).
+TRANSIENT_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+)
+
+# Errores con los que PostgreSQL o asyncpg rechazan una escritura
+DATABASE_ERRORS = (asyncpg.PostgresError, asyncpg.InterfaceError)
+
+# Reintentos de una escritura rechazada por PostgreSQL antes de apartarla
+MAX_ATTEMPTS = 5
+
+# Espera máxima entre reintentos mientras PostgreSQL no responde (segundos)
+MAX_BACKOFF = 60.0
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    True si el error es de conexión y la escritura puede reintentarse tal cual.
+
+    asyncpg lanza InterfaceError sin subclase cuando la conexión o el pool
+    están cerrados. Sus subclases (DataError si un parámetro no se puede
+    codificar, funciones no soportadas) no se arreglan reintentando.
+    """
+    return isinstance(error, TRANSIENT_ERRORS) or type(error) is asyncpg.InterfaceError
+
+
+def _dt(value: Optional[str]) -> Optional[datetime]:
+    """ISO 8601 del outbox a datetime con zona (None se conserva)."""
+    return as_aware(datetime.fromisoformat(value)) if value else None
+
+
+# Operación del outbox -> (sentencia de WRITES, parámetros desde el payload)
+OPERATIONS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], tuple]]] = {
+    "task_create": (
+        "task_insert_once",
+        lambda p: (
+            p["id"],
+            p["user_id"],
+            p["title"],
+            p["description"],
+            p["priority"],
+            _dt(p["due_date"]),
+            p["tags"],
+            _dt(p["created_at"]),
+            # Las entradas anteriores a estimated_minutes no lo traen
+            p.get("estimated_minutes"),
+        ),
+    ),
+    "task_complete": (
+        "task_complete_at",
+        lambda p: (p["id"], p["user_id"], _dt(p["completed_at"])),
+    ),
+    "reminder_create": (
+        "reminder_insert_once",
+        lambda p: (
+            p["id"],
+            p["user_id"],
+            p["title"],
+            p["message"],
+            _dt(p["trigger_time"]),
+            p["reminder_type"],
+            p["priority"],
+            p["sound_type"],
+            p["recurrence"],
+        ),
+    ),
+    "reminder_cancel": ("reminder_cancel", lambda p: (p["id"], p["user_id"])),
+}
+
+
+class OutboxDatabase(TaskRepository):
+    """PostgresDatabase con escrituras confirmadas en local y aplicadas en segundo plano."""
+
+    def __init__(
+        self,
+        db: PostgresDatabase,
+        outbox_path: str = "data/pg_outbox.db",
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        lookup_timeout: float = 2.0,
+    ):
+        """
+        Inicializa el outbox.
+
+        Args:
+            db: Cliente de PostgreSQL al que se aplican las escrituras
+            outbox_path: Archivo SQLite del outbox
+            batch_size: Escrituras por transacción de PostgreSQL
+            flush_interval: Segundos entre vaciados si no llegan escrituras
+            lookup_timeout: Espera máxima (segundos) para comprobar en
+                PostgreSQL que existe lo que se completa o cancela, y para
+                aplicar lo pendiente antes de una operación directa
+        """
+        self.db = db
+        self.outbox_path = outbox_path
+        Path(outbox_path).parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lookup_timeout = lookup_timeout
+        self._conn: Optional[aiosqlite.Connection] = None
+        # Copia en memoria de las escrituras pendientes (seq -> entrada), en
+        # orden de llegada; las lecturas la combinan sin tocar disco
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    def __getattr__(self, name: str):
+        """Los métodos propios de PostgresDatabase (fuera de TaskRepository) se delegan."""
+        return getattr(self.db, name)
+
+    async def connect(self):
+        """Abre el outbox y conecta a PostgreSQL si responde (ver start)."""
+        await self.start()
+
+    async def disconnect(self):
+        """Vacía lo que se pueda, cierra el outbox y el pool de PostgreSQL."""
+        await self.stop()
+        await self.db.disconnect()
+
+    async def start(self):
+        """
+        Abre el outbox, recupera lo pendiente y arranca el vaciado en segundo plano.
+
+        Si PostgreSQL no responde al arrancar, las escrituras se aceptan
+        igual y el vaciado reintenta la conexión.
+        """
+        self._conn = await aiosqlite.connect(self.outbox_path)
+        # WAL: agregar al outbox no bloquea a quien lo lee; FULL sincroniza
+        # cada commit, que es lo que hace durable la confirmación
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute("PRAGMA synchronous=FULL")
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                op TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                failed BOOLEAN NOT NULL DEFAULT 0
+            )
+        """
+        )
+        await self._conn.commit()
+
+        async with self._conn.execute(
+            "SELECT seq, op, payload, attempts FROM outbox WHERE failed = 0 ORDER BY seq"
+        ) as cursor:
+            for seq, op, payload, attempts in await cursor.fetchall():
+                self._pending[seq] = {
+                    "seq": seq,
+                    "op": op,
+                    "payload": json.loads(payload),
+                    "attempts": attempts,
+                }
+        if self._pending:
+            logger.info(f"Outbox: {len(self._pending)} escrituras pendientes recuperadas")
+
+        try:
+            if self.db.pool is None:
+                await self.db.connect()
+        except Exception as e:
+            logger.warning(f"PostgreSQL no disponible, las escrituras quedan en el outbox: {e}")
+
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self, timeout: float = 10.0):
+        """Intenta vaciar lo pendiente (hasta timeout segundos) y cierra el outbox."""
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except Exception as e:
+            logger.warning(f"Outbox cerrado con {len(self._pending)} escrituras pendientes: {e}")
+
+        if self._conn:
+            await self._conn.close()
+            self._conn = None
+
+    @property
+    def pending_count(self) -> int:
+        """Escrituras confirmadas que aún no llegaron a PostgreSQL."""
+        return len(self._pending)
+
+    # ==================== OUTBOX ====================
+
+    async def _append(self, op: str, payload: Dict[str, Any]):
+        """Guarda una escritura en el outbox (durable al volver) y despierta el vaciado."""
+        cursor = await self._conn.execute(
+            "INSERT INTO outbox (op, payload, created_at) VALUES (?, ?, ?)",
+            (op, json.dumps(payload), datetime.now().isoformat()),
+        )
+        await self._conn.commit()
+        self._pending[cursor.lastrowid] = {
+            "seq": cursor.lastrowid,
+            "op": op,
+            "payload": payload,
+            "attempts": 0,
+        }
+        self._wake.set()
+
+    async def _flush_loop(self):
+        """Vacía el outbox al recibir escrituras o cada flush_interval, con backoff si falla."""
+        backoff = self.flush_interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), backoff)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                await self._drain()
+                backoff = self.flush_interval
+            except Exception as e:
+                # Cualquier fallo deja el lote pendiente: el vaciado no puede
+                # terminar mientras _append siga confirmando escrituras
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                if _is_transient(e):
+                    logger.warning(
+                        f"PostgreSQL no disponible ({e}); {len(self._pending)} escrituras "
+                        f"en el outbox, reintento en {backoff:.1f}s"
+                    )
+                else:
+                    logger.error(
+                        f"Error vaciando el outbox ({e}); {len(self._pending)} escrituras "
+                        f"pendientes, reintento en {backoff:.1f}s",
+                        exc_info=True,
+                    )
+
+    async def _drain(self):
+        """Aplica lotes hasta vaciar el outbox."""
+        if self.db.pool is None:
+            await self.db.connect()
+        while await self.flush() == self.batch_size:
+            pass
+
+    async def flush(self) -> int:
+        """
+        Aplica el siguiente lote del outbox en una transacción de PostgreSQL.
+
+        Si PostgreSQL o asyncpg rechazan el lote por los datos, cada
+        escritura se reintenta sola para que una inválida no bloquee a las
+        demás; tras MAX_ATTEMPTS rechazos se aparta (failed=1) y se registra
+        el error.
+
+        Returns:
+            Escrituras que salieron del outbox
+
+        Raises:
+            TRANSIENT_ERRORS: Si PostgreSQL no responde (el lote queda pendiente);
+                también InterfaceError si la conexión está cerrada
+        """
+        async with self._flush_lock:
+            batch = list(self._pending.values())[: self.batch_size]
+            if not batch:
+                return 0
+
+            try:
+                await self.db.execute_batch([self._write(entry) for entry in batch])
+                done = batch
+            except DATABASE_ERRORS as e:
+                if _is_transient(e):
+                    raise
+                logger.warning(f"Lote del outbox rechazado ({e}), se aplica por escritura")
+                done = []
+                for entry in batch:
+                    try:
+                        await self.db.execute_batch([self._write(entry)])
+                        done.append(entry)
+                    except DATABASE_ERRORS as error:
+                        if _is_transient(error):
+                            raise
+                        if await self._reject(entry, error):
+                            done.append(entry)
+                        else:
+                            # Conservar el orden: lo posterior espera a esta escritura
+                            break
+
+            await self._ack(done)
+            return len(done)
+
+    @staticmethod
+    def _write(entry: Dict[str, Any]) -> Tuple[str, tuple]:
+        """Sentencia y parámetros de PostgreSQL para una entrada del outbox."""
+        name, params = OPERATIONS[entry["op"]]
+        return name, params(entry["payload"])
+
+    async def _reject(self, entry: Dict[str, Any], error: Exception) -> bool:
+        """
+        Cuenta un rechazo de PostgreSQL para una escritura.
+
+        Returns:
+            True si agotó los reintentos y se apartó del outbox
+        """
+        entry["attempts"] += 1
+        failed = entry["attempts"] >= MAX_ATTEMPTS
+        await self._conn.execute(
+            "UPDATE outbox SET attempts = ?, last_error = ?, failed = ? WHERE seq = ?",
+            (entry["attempts"], str(error), failed, entry["seq"]),
+        )
+        await self._conn.commit()
+        if failed:
+            logger.error(f"Escritura {entry['op']} {entry['payload']['id']} descartada: {error}")
+        return failed
+
+    async def _ack(self, entries: List[Dict[str, Any]]):
+        """Quita del outbox las escrituras ya aplicadas (o apartadas)."""
+        if not entries:
+            return
+        await self._conn.executemany(
+            "DELETE FROM outbox WHERE seq = ? AND failed = 0",
+            [(entry["seq"],) for entry in entries],
+        )
+        await self._conn.commit()
+        for entry in entries:
+            self._pending.pop(entry["seq"], None)
+        logger.info(f"Outbox: {len(entries)} escrituras aplicadas en PostgreSQL")
+
+    def _pending_ops(self, op: str, user_id: str) -> List[Dict[str, Any]]:
+        """Payloads pendientes de una operación y usuario, en orden de llegada."""
+        return [
+            entry["payload"]
+            for entry in self._pending.values()
+            if entry["op"] == op and entry["payload"]["user_id"] == user_id
+        ]
+
+    def has_pending(self, user_id: str) -> bool:
+        """True si el usuario tiene escrituras en el outbox (ver ReplicaDatabase)."""
+        return any(entry["payload"]["user_id"] == user_id for entry in self._pending.values())
+
+    async def _settle(self, user_id: str) -> bool:
+        """
+        Aplica lo pendiente antes de una operación que va directa a PostgreSQL.
+
+        Returns:
+            True si al usuario no le queda nada en el outbox
+        """
+        if not self.has_pending(user_id):
+            return True
+        try:
+            await asyncio.wait_for(self._drain(), self.lookup_timeout)
+        except Exception as e:
+            logger.warning(f"No se pudo aplicar el outbox de {user_id} antes de la operación: {e}")
+        return not self.has_pending(user_id)
+
+    async def _exists(self, query: str, item_id: str, user_id: str) -> Optional[bool]:
+        """
+        Comprueba en PostgreSQL que una fila existe (ver PostgresDatabase.exists).
+
+        Returns:
+            True o False, o None si PostgreSQL no respondió a tiempo: entonces
+            la escritura se acepta y, si la fila no existía, no cambia nada
+        """
+        if self.db.pool is None:
+            return None
+        try:
+            return await asyncio.wait_for(
+                self.db.exists(query, item_id, user_id), self.lookup_timeout
+            )
+        except Exception as e:
+            if not _is_transient(e):
+                raise
+            logger.warning(f"No se pudo comprobar {item_id} en PostgreSQL ({e}), se encola")
+            return None
+
+    # ==================== TAREAS ====================
+
+    async def create_task(
+        self,
+        task_id: str,
+        user_id: str,
+        title: str,
+        description: str = "",
+        priority: str = "medium",
+        due_date: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        estimated_minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Crea una tarea (se confirma al quedar en el outbox)."""
+        due_at = parse_due_date(due_date)
+        if due_date and not due_at:
+            logger.warning(f"Fecha límite no reconocida, se ignora: {due_date}")
+
+        task = {
+            "id": task_id,
+            "user_id": user_id,
+            "title": title,
+            "description": description,
+            "priority": priority,
+            "due_date": due_at.isoformat() if due_at else None,
+            "tags": normalize_tags(tags),
+            "completed": False,
+            "created_at": datetime.now().isoformat(),
+            "completed_at": None,
+            "estimated_minutes": estimated_minutes,
+        }
+        await self._append("task_create", task)
+        logger.info(f"Tarea encolada para PostgreSQL: {task_id}")
+        return dict(task)
+
+    async def complete_task(self, task_id: str, user_id: str) -> bool:
+        """
+        Marca una tarea como completada (se confirma al quedar en el outbox).
+
+        Returns:
+            False si la tarea no está en el outbox ni en PostgreSQL
+        """
+        created = {payload["id"] for payload in self._pending_ops("task_create", user_id)}
+        if task_id not in created:
+            if await self._exists("task_get", task_id, user_id) is False:
+                return False
+        await self._append(
+            "task_complete",
+            {"id": task_id, "user_id": user_id, "completed_at": datetime.now().isoformat()},
+        )
+        return True
+
+    def _overlay_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        user_id: str,
+        filter_type: str,
+        days: int,
+        tag: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Aplica a una página de tareas las altas y completados aún en el outbox."""
+        completions = self._pending_ops("task_complete", user_id)
+        completed = {payload["id"]: payload["completed_at"] for payload in completions}
+        created = self._pending_ops("task_create", user_id)
+        if not completed and not created:
+            return tasks
+
+        seen = {task["id"] for task in tasks}
+        merged = tasks + [dict(task) for task in created if task["id"] not in seen]
+        for task in merged:
+            if task["id"] in completed and not task["completed"]:
+                task["completed"] = True
+                task["completed_at"] = completed[task["id"]]
+
+        start = end = None
+        if filter_type in DUE_DATE_FILTERS:
+            start, end = due_date_range(filter_type, days=days)
+        wanted_tag = normalize_tag(tag) if tag else None
+
+        def matches(task: Dict[str, Any]) -> bool:
+            if wanted_tag and wanted_tag not in task["tags"]:
+                return False
+            if filter_type == "all":
+                return True
+            if filter_type == "completed":
+                return task["completed"]
+            if task["completed"]:
+                return False
+            if filter_type == "urgent":
+                return task["priority"] == "urgent"
+            if start is None and end is None:
+                return True
+            if not task["due_date"]:
+                return False
+            due = datetime.fromisoformat(task["due_date"])
+            return (start is None or due >= start) and due < end
+
+        merged = [task for task in merged if matches(task)]
+        if filter_type in DUE_DATE_FILTERS:
+            merged.sort(key=lambda task: (task["due_date"], task["id"]))
+        elif filter_type == "completed":
+            merged.sort(key=lambda task: (task["completed_at"] or "", task["id"]), reverse=True)
+        else:
+            merged.sort(key=lambda task: (task["created_at"] or "", task["id"]), reverse=True)
+        return merged[:limit]
+
+    async def list_tasks_page(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = MAX_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        days: int = 7,
+        tag: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Lista una página de tareas incluyendo las escrituras aún en el outbox.
+
+        Las pendientes se combinan en la primera página; las siguientes
+        vienen tal cual de PostgreSQL.
+        """
+        page = await self.db.list_tasks_page(
+            user_id, filter_type, limit=limit, cursor=cursor, days=days, tag=tag
+        )
+        if cursor is None:
+            page["tasks"] = self._overlay_tasks(
+                page["tasks"], user_id, filter_type, days, tag, limit
+            )
+        return page
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        days: int = 7,
+        limit: int = MAX_PAGE_SIZE,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Lista la primera página de tareas (ver list_tasks_page)."""
+        page = await self.list_tasks_page(user_id, filter_type, limit=limit, days=days, tag=tag)
+        return page["tasks"]
+
+    async def get_task(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene una tarea por su ID, incluidas las altas y completados aún en el outbox."""
+        created = [p for p in self._pending_ops("task_create", user_id) if p["id"] == task_id]
+        if created:
+            task = {**created[-1], "scheduled_at": None}
+        else:
+            task = await self.db.get_task(task_id, user_id)
+            if task is None:
+                return None
+
+        for payload in self._pending_ops("task_complete", user_id):
+            if payload["id"] == task_id and not task["completed"]:
+                task["completed"] = True
+                task["completed_at"] = payload["completed_at"]
+        return task
+
+    async def tag_counts(
+        self, user_id: str, include_completed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Etiquetas del usuario con su número de tareas (tras aplicar lo pendiente)."""
+        await self._settle(user_id)
+        return await self.db.tag_counts(user_id, include_completed)
+
+    async def list_schedulable_tasks(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Tareas pendientes que se pueden planificar (tras aplicar lo pendiente)."""
+        await self._settle(user_id)
+        return await self.db.list_schedulable_tasks(user_id, limit)
+
+    async def mark_tasks_scheduled(self, user_id: str, scheduled: Dict[str, datetime]) -> int:
+        """Guarda el inicio del bloque planificado de cada tarea (tras aplicar lo pendiente)."""
+        await self._settle(user_id)
+        return await self.db.mark_tasks_scheduled(user_id, scheduled)
+
+    async def delete_task(self, task_id: str, user_id: str) -> bool:
+        """
+        Elimina una tarea en PostgreSQL.
+
+        Si su alta sigue en el outbox no se borra: al aplicarse después la
+        volvería a crear.
+        """
+        if not await self._settle(user_id):
+            created = {payload["id"] for payload in self._pending_ops("task_create", user_id)}
+            if task_id in created:
+                logger.warning(f"Tarea {task_id} aún en el outbox, no se puede eliminar")
+                return False
+        return await self.db.delete_task(task_id, user_id)
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        kinds: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Búsqueda de texto completo en PostgreSQL (tras aplicar lo pendiente)."""
+        await self._settle(user_id)
+        return await self.db.search(user_id, query, limit, offset, kinds)
+
+    async def run_maintenance(self, policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """Mantenimiento de PostgreSQL (ver PostgresDatabase.run_maintenance)."""
+        return await self.db.run_maintenance(policy)
+
+    # ==================== RECORDATORIOS ====================
+
+    async def create_reminder(
+        self,
+        reminder_id: str,
+        user_id: str,
+        title: str,
+        message: str,
+        trigger_time: datetime,
+        reminder_type: str = "notification",
+        priority: str = "normal",
+        sound_type: Optional[str] = None,
+        recurrence: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Crea un recordatorio (se confirma al quedar en el outbox).
+
+        Raises:
+            ValueError: Si recurrence no es una RRULE válida
+        """
+        if recurrence:
+            recurrence = str(RecurrenceRule.parse(recurrence).bounded(trigger_time))
+
+        reminder = {
+            "id": reminder_id,
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "trigger_time": trigger_time.isoformat(),
+            "reminder_type": reminder_type,
+            "priority": priority,
+            "sound_type": sound_type,
+            "recurrence": recurrence,
+        }
+        await self._append("reminder_create", reminder)
+        logger.info(f"Recordatorio encolado para PostgreSQL: {reminder_id}")
+        return {**reminder, "executed": False}
+
+    async def cancel_reminder(self, reminder_id: str, user_id: str) -> bool:
+        """
+        Cancela un recordatorio (se confirma al quedar en el outbox).
+
+        Returns:
+            False si el recordatorio no está pendiente en el outbox ni en PostgreSQL
+        """
+        cancelled = {p["id"] for p in self._pending_ops("reminder_cancel", user_id)}
+        if reminder_id in cancelled:
+            return False
+        created = {p["id"] for p in self._pending_ops("reminder_create", user_id)}
+        if reminder_id not in created:
+            if await self._exists("reminder_get", reminder_id, user_id) is False:
+                return False
+        await self._append("reminder_cancel", {"id": reminder_id, "user_id": user_id})
+        return True
+
+    async def list_reminders_page(
+        self, user_id: str, limit: int = MAX_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Lista una página de recordatorios incluyendo los cambios aún en el outbox."""
+        page = await self.db.list_reminders_page(user_id, limit, cursor)
+        if cursor is not None:
+            return page
+
+        created = self._pending_ops("reminder_create", user_id)
+        cancelled = {p["id"] for p in self._pending_ops("reminder_cancel", user_id)}
+        if created or cancelled:
+            seen = {reminder["id"] for reminder in page["reminders"]}
+            merged = page["reminders"] + [dict(r) for r in created if r["id"] not in seen]
+            merged = [reminder for reminder in merged if reminder["id"] not in cancelled]
+            merged.sort(key=lambda reminder: (reminder["trigger_time"], reminder["id"]))
+            page["reminders"] = merged[:limit]
+        return page
+
+    async def list_reminders(
+        self, user_id: str, limit: int = MAX_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Lista la primera página de recordatorios pendientes (ver list_reminders_page)."""
+        page = await self.list_reminders_page(user_id, limit=limit)
+        return page["reminders"]
@@ -0,0 +1,616 @@
+"""
+Réplica local en SQLite de las tareas, eventos y recordatorios de PostgreSQL.
+
+Pensada para el PC: las lecturas se sirven desde disco local en lugar de
+cruzar la WAN hasta Railway. La réplica se mantiene al día con deltas:
+cada tabla guarda una marca (hora del servidor de la última pasada) y
+solo pide las filas con updated_at posterior y las lápidas de borrados
+(migraciones v7 y v12). El NOTIFY de reminders adelanta la siguiente
+pasada; para tareas y eventos basta con el intervalo.
+
+La antigüedad de lo que se lee está acotada por max_staleness: si la
+última sincronización es más vieja, la lectura sincroniza antes. Si
+PostgreSQL no responde, se sirve lo que hay en la réplica.
+
+ReplicaDatabase es además un TaskRepository (REPLICA_ENABLED, ver
+create_repository): en el PC, las listas de tareas, etiquetas, eventos y
+recordatorios de los usuarios replicados se leen del disco local, y las
+escrituras y el resto de lecturas van al backend de PostgreSQL (con su
+outbox). Tras una escritura la siguiente lectura sincroniza antes; y
+mientras el usuario tenga escrituras en el outbox, sus lecturas van al
+backend, que ya combina lo pendiente.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiosqlite
+
+from .postgres_db import CHANGE_FEEDS, PostgresDatabase
+from .repository import TaskRepository
+from ..utils.dates import DUE_DATE_FILTERS, as_aware, as_local, due_date_range
+from ..utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from ..utils.recurrence import expand_series
+from ..utils.retention import RetentionPolicy
+from ..utils.tags import normalize_tag
+
+logger = logging.getLogger(__name__)
+
+# Columnas locales de cada tabla replicada (mismo nombre que en PostgreSQL)
+REPLICA_COLUMNS = {
+    "tasks": (
+        "id",
+        "user_id",
+        "title",
+        "description",
+        "priority",
+        "due_date",
+        "tags",
+        "completed",
+        "created_at",
+        "completed_at",
+        "updated_at",
+    ),
+    "events": (
+        "id",
+        "user_id",
+        "title",
+        "description",
+        "start_time",
+        "end_time",
+        "recurrence",
+        "updated_at",
+    ),
+    "reminders": (
+        "id",
+        "user_id",
+        "title",
+        "message",
+        "trigger_time",
+        "reminder_type",
+        "priority",
+        "sound_type",
+        "recurrence",
+        "executed",
+        "updated_at",
+    ),
+}
+
+# Las fechas se guardan como ISO 8601 en hora local (mismo formato que
+# devuelve PostgresDatabase), que ordena bien como texto
+REPLICA_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        priority TEXT,
+        due_date TEXT,
+        tags TEXT NOT NULL DEFAULT '[]',
+        completed BOOLEAN NOT NULL DEFAULT 0,
+        created_at TEXT,
+        completed_at TEXT,
+        updated_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks(user_id, completed, created_at);
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_due ON tasks(user_id, completed, due_date);
+
+    CREATE TABLE IF NOT EXISTS events (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        recurrence TEXT,
+        updated_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_user_start ON events(user_id, start_time);
+
+    CREATE TABLE IF NOT EXISTS reminders (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        trigger_time TEXT NOT NULL,
+        reminder_type TEXT,
+        priority TEXT,
+        sound_type TEXT,
+        recurrence TEXT,
+        executed BOOLEAN NOT NULL DEFAULT 0,
+        updated_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_reminders_user_pending
+    ON reminders(user_id, executed, trigger_time);
+
+    CREATE TABLE IF NOT EXISTS replica_state (
+        table_name TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        watermark TEXT NOT NULL,
+        PRIMARY KEY (table_name, user_id)
+    );
+"""
+
+# Condición y columna de orden (descendente) de cada filtro de tareas, las
+# mismas que en PostgresDatabase; los filtros por fecha límite van por
+# due_date ascendente
+TASK_FILTERS = {
+    "all": ("", "created_at"),
+    "pending": ("AND completed = 0", "created_at"),
+    "urgent": ("AND completed = 0 AND priority = 'urgent'", "created_at"),
+    "completed": ("AND completed = 1", "completed_at"),
+}
+
+
+class ReplicaDatabase(TaskRepository):
+    """Espejo local de PostgreSQL para los usuarios atendidos por este PC."""
+
+    # La marca se retrocede este margen al consultar, como en CalendarSync:
+    # cubre transacciones que confirmaron tarde con un updated_at anterior
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+
+    # Filas por página al traer cambios
+    PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        db: PostgresDatabase,
+        user_ids: Iterable[str],
+        replica_path: str = "data/pg_replica.db",
+        sync_interval: float = 30.0,
+        max_staleness: float = 60.0,
+        retention: Optional[RetentionPolicy] = None,
+    ):
+        """
+        Inicializa la réplica.
+
+        Args:
+            db: Cliente de PostgreSQL del que se replica (o el OutboxDatabase
+                que lo envuelve); recibe las escrituras y las lecturas que la
+                réplica no sirve
+            user_ids: Usuarios replicados
+            replica_path: Archivo SQLite de la réplica
+            sync_interval: Segundos entre pasadas de sincronización
+            max_staleness: Antigüedad máxima (segundos) de lo que se lee
+            retention: Retención de lápidas del servidor; una réplica sin
+                sincronizar más tiempo se recarga completa
+        """
+        self.db = db
+        self.user_ids = tuple(user_ids)
+        self.replica_path = replica_path
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.retention = retention or RetentionPolicy()
+        self.synced_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._sync_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        Path(replica_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def __getattr__(self, name: str):
+        """Los métodos propios de PostgresDatabase sin lectura local se delegan."""
+        return getattr(self.db, name)
+
+    async def connect(self):
+        """Conecta el backend, crea las tablas y arranca la sincronización periódica."""
+        await self.db.connect()
+        await self.initialize()
+        self._runner = asyncio.create_task(self.run())
+
+    async def disconnect(self):
+        """Detiene la sincronización y desconecta el backend."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.db.disconnect()
+
+    async def initialize(self):
+        """Crea las tablas de la réplica."""
+        async with aiosqlite.connect(self.replica_path) as db:
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.executescript(REPLICA_SCHEMA)
+            await db.commit()
+        logger.info(f"Réplica local inicializada: {self.replica_path}")
+
+    # ==================== SINCRONIZACIÓN ====================
+
+    def request_sync(self):
+        """Adelanta la próxima pasada (p. ej. al recibir un NOTIFY)."""
+        self._wake.set()
+
+    async def run(self):
+        """Sincroniza cada sync_interval segundos, o antes si se pide con request_sync."""
+        while True:
+            self._wake.clear()
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Sincronización de la réplica fallida: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sync(self) -> Dict[str, int]:
+        """
+        Trae los cambios de todas las tablas y usuarios replicados.
+
+        Cada tabla y usuario se aplica en una transacción local, así las
+        lecturas ven el estado anterior o el nuevo, nunca uno a medias.
+
+        Returns:
+            Dict con upserted y deleted
+        """
+        async with self._sync_lock:
+            server_time = await self.db.server_time()
+            horizon = server_time - self.retention.tombstones
+            totals = {"upserted": 0, "deleted": 0}
+
+            async with aiosqlite.connect(self.replica_path) as db:
+                for user_id in self.user_ids:
+                    for table in CHANGE_FEEDS:
+                        upserted, deleted = await self._sync_table(
+                            db, table, user_id, server_time, horizon
+                        )
+                        totals["upserted"] += upserted
+                        totals["deleted"] += deleted
+
+            self.synced_at = time.monotonic()
+            if totals["upserted"] or totals["deleted"]:
+                logger.info(
+                    f"Réplica sincronizada: {totals['upserted']} filas, "
+                    f"{totals['deleted']} borradas"
+                )
+            return totals
+
+    async def _sync_table(
+        self,
+        db: aiosqlite.Connection,
+        table: str,
+        user_id: str,
+        server_time: datetime,
+        horizon: datetime,
+    ) -> Tuple[int, int]:
+        """Aplica los cambios de una tabla y usuario; devuelve (upserted, deleted)."""
+        async with db.execute(
+            "SELECT watermark FROM replica_state WHERE table_name = ? AND user_id = ?",
+            (table, user_id),
+        ) as cursor:
+            row = await cursor.fetchone()
+        watermark = datetime.fromisoformat(row[0]) if row else None
+
+        since = None
+        if watermark is not None and watermark > horizon:
+            since = watermark - self.WATERMARK_OVERLAP
+        else:
+            # Primera carga, o las lápidas necesarias ya se purgaron
+            await db.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+
+        columns = REPLICA_COLUMNS[table]
+        upsert = (
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        upserted = 0
+        cursor = encode_cursor(since, "") if since else None
+        while True:
+            page = await self.db.get_changes_page(table, user_id, self.PAGE_SIZE, cursor)
+            await db.executemany(upsert, [self._row(table, row) for row in page["rows"]])
+            upserted += len(page["rows"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        deleted = []
+        if since is not None:
+            deleted = await self.db.get_deleted_ids(table, user_id, since)
+            await db.executemany(
+                f"DELETE FROM {table} WHERE id = ? AND user_id = ?",
+                [(row_id, user_id) for row_id in deleted],
+            )
+
+        await db.execute(
+            "INSERT OR REPLACE INTO replica_state (table_name, user_id, watermark) "
+            "VALUES (?, ?, ?)",
+            (table, user_id, server_time.isoformat()),
+        )
+        await db.commit()
+        return upserted, len(deleted)
+
+    @staticmethod
+    def _row(table: str, row: Dict[str, Any]) -> tuple:
+        """Fila de PostgresDatabase a parámetros del INSERT local."""
+        if table == "tasks":
+            row = {**row, "tags": json.dumps(row["tags"] or [])}
+        return tuple(row[column] for column in REPLICA_COLUMNS[table])
+
+    async def _ensure_fresh(self):
+        """Sincroniza antes de leer si la réplica superó max_staleness."""
+        now = time.monotonic()
+        if self.synced_at is not None and now - self.synced_at <= self.max_staleness:
+            return
+        if now < self._retry_at:
+            return
+        try:
+            await self.sync()
+        except Exception as e:
+            # No reintentar en cada lectura mientras PostgreSQL no responde
+            self._retry_at = now + self.sync_interval
+            logger.warning(f"PostgreSQL no disponible, se lee la réplica desactualizada: {e}")
+
+    def _serves(self, user_id: str) -> bool:
+        """
+        True si las lecturas del usuario pueden salir de la réplica.
+
+        No si el usuario no se replica, ni si tiene escrituras aún en el
+        outbox: el backend las combina y la réplica todavía no las tiene.
+        En ese caso la siguiente lectura local sincroniza antes.
+        """
+        if user_id not in self.user_ids:
+            return False
+        has_pending = getattr(self.db, "has_pending", None)
+        if has_pending is not None and has_pending(user_id):
+            self.synced_at = None
+            return False
+        return True
+
+    def _invalidate(self):
+        """Tras una escritura, la próxima lectura local sincroniza antes."""
+        self.synced_at = None
+        self.request_sync()
+
+    async def _fetch(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        """Ejecuta una lectura en la réplica y devuelve dicts."""
+        async with aiosqlite.connect(self.replica_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(sql, params) as cursor:
+                return [dict(row) for row in await cursor.fetchall()]
+
+    # ==================== LECTURAS ====================
+
+    async def list_tasks_page(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = MAX_PAGE_SIZE,
+        days: int = 7,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Página de tareas con los mismos filtros y orden que PostgresDatabase.
+
+        Los cursores son intercambiables con los de PostgresDatabase, así
+        una lista puede seguir en el backend si la réplica deja de servirla.
+
+        Args:
+            user_id: ID del usuario
+            filter_type: all, pending, completed, urgent, today, overdue, week o upcoming
+            limit: Tamaño de página
+            days: Días hacia adelante para el filtro upcoming
+            cursor: next_cursor de la página anterior (None para la primera)
+            tag: Solo tareas con esta etiqueta
+
+        Returns:
+            Dict con tasks y next_cursor (None si es la última página)
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        after_value, after_id = decode_cursor(cursor)
+        if not self._serves(user_id):
+            return await self.db.list_tasks_page(
+                user_id, filter_type, limit=limit, days=days, cursor=cursor, tag=tag
+            )
+        await self._ensure_fresh()
+
+        params: List[Any] = [user_id]
+        if filter_type in DUE_DATE_FILTERS:
+            start, end = due_date_range(filter_type, days=days)
+            condition = "AND completed = 0 AND due_date IS NOT NULL AND due_date < ?"
+            params.append(end.isoformat())
+            if start is not None:
+                condition += " AND due_date >= ?"
+                params.append(start.isoformat())
+            sort, direction, after = "due_date", "ASC", ">"
+        else:
+            condition, sort = TASK_FILTERS.get(filter_type, TASK_FILTERS["all"])
+            direction, after = "DESC", "<"
+
+        if tag:
+            condition += " AND EXISTS (SELECT 1 FROM json_each(tasks.tags) WHERE value = ?)"
+            params.append(normalize_tag(tag))
+
+        if after_id is not None:
+            condition += f" AND ({sort}, id) {after} (?, ?)"
+            params.extend([as_local(after_value).isoformat(), after_id])
+
+        tasks = await self._fetch(
+            f"""
+            SELECT id, user_id, title, description, priority, due_date, tags, completed,
+                   created_at, completed_at
+            FROM tasks WHERE user_id = ? {condition}
+            ORDER BY {sort} {direction}, id {direction}
+            LIMIT ?
+        """,
+            (*params, limit),
+        )
+        for task in tasks:
+            task["tags"] = json.loads(task["tags"])
+            task["completed"] = bool(task["completed"])
+
+        next_cursor = None
+        if limit and len(tasks) == limit:
+            last = tasks[-1]
+            next_cursor = encode_cursor(
+                as_aware(datetime.fromisoformat(last[sort])), last["id"]
+            )
+        return {"tasks": tasks, "next_cursor": next_cursor}
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = MAX_PAGE_SIZE,
+        days: int = 7,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Primera página de tareas (ver list_tasks_page)."""
+        page = await self.list_tasks_page(user_id, filter_type, limit=limit, days=days, tag=tag)
+        return page["tasks"]
+
+    async def tag_counts(
+        self, user_id: str, include_completed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Etiquetas del usuario con su número de tareas, como PostgresDatabase.tag_counts."""
+        if not self._serves(user_id):
+            return await self.db.tag_counts(user_id, include_completed)
+        await self._ensure_fresh()
+        return await self._fetch(
+            """
+            SELECT tag.value AS tag, COUNT(*) AS count
+            FROM tasks, json_each(tasks.tags) AS tag
+            WHERE user_id = ? AND (? OR completed = 0)
+            GROUP BY tag.value
+            ORDER BY count DESC, tag
+        """,
+            (user_id, include_completed),
+        )
+
+    async def list_events(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista eventos que empiezan en un rango, como PostgresDatabase.list_events.
+
+        Las series recurrentes aportan sus repeticiones dentro del rango.
+        """
+        if not self._serves(user_id):
+            return await self.db.list_events(user_id, start_date, end_date, limit)
+        await self._ensure_fresh()
+
+        start, end = as_local(start_date), as_local(end_date)
+        events = await self._fetch(
+            """
+            SELECT id, user_id, title, description, start_time, end_time, recurrence
+            FROM events
+            WHERE user_id = ? AND recurrence IS NULL AND start_time >= ? AND start_time <= ?
+            ORDER BY start_time ASC, id ASC
+            LIMIT ?
+        """,
+            (user_id, start.isoformat(), end.isoformat(), -1 if limit is None else limit),
+        )
+        series = await self._fetch(
+            """
+            SELECT id, user_id, title, description, start_time, end_time, recurrence
+            FROM events
+            WHERE user_id = ? AND recurrence IS NOT NULL AND start_time <= ?
+            ORDER BY start_time ASC, id ASC
+        """,
+            (user_id, end.isoformat()),
+        )
+        if not series:
+            return events
+
+        merged = heapq.merge(
+            events,
+            expand_series(series, start, end),
+            key=lambda event: event["start_time"],
+        )
+        return list(itertools.islice(merged, limit))
+
+    async def list_reminders(
+        self, user_id: str, limit: int = MAX_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Lista los recordatorios pendientes, del más próximo al más lejano."""
+        if not self._serves(user_id):
+            return await self.db.list_reminders(user_id, limit=limit)
+        await self._ensure_fresh()
+        return await self._fetch(
+            """
+            SELECT id, user_id, title, message, trigger_time, reminder_type, priority,
+                   sound_type, recurrence
+            FROM reminders
+            WHERE user_id = ? AND executed = 0
+            ORDER BY trigger_time ASC, id ASC
+            LIMIT ?
+        """,
+            (user_id, limit),
+        )
+
+    # ==================== BACKEND ====================
+
+    async def create_task(
+        self,
+        task_id: str,
+        user_id: str,
+        title: str,
+        description: str = "",
+        priority: str = "medium",
+        due_date: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        estimated_minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Crea la tarea en el backend."""
+        task = await self.db.create_task(
+            task_id, user_id, title, description, priority, due_date, tags, estimated_minutes
+        )
+        self._invalidate()
+        return task
+
+    async def complete_task(self, task_id: str, user_id: str) -> bool:
+        """Completa la tarea en el backend."""
+        success = await self.db.complete_task(task_id, user_id)
+        self._invalidate()
+        return success
+
+    async def delete_task(self, task_id: str, user_id: str) -> bool:
+        """Elimina la tarea en el backend."""
+        success = await self.db.delete_task(task_id, user_id)
+        self._invalidate()
+        return success
+
+    async def mark_tasks_scheduled(self, user_id: str, scheduled: Dict[str, datetime]) -> int:
+        """Guarda en el backend el bloque planificado de cada tarea."""
+        return await self.db.mark_tasks_scheduled(user_id, scheduled)
+
+    async def get_task(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Tarea por ID desde el backend (la réplica no guarda la planificación)."""
+        return await self.db.get_task(task_id, user_id)
+
+    async def list_schedulable_tasks(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Tareas planificables desde el backend (la réplica no guarda la duración)."""
+        return await self.db.list_schedulable_tasks(user_id, limit)
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        kinds: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Búsqueda de texto completo en el backend (la réplica no tiene índice FTS)."""
+        return await self.db.search(user_id, query, limit, offset, kinds)
+
+    async def run_maintenance(self, policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """Mantenimiento del backend."""
+        return await self.db.run_maintenance(policy)
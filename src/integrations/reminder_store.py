@@ -0,0 +1,210 @@
+"""
+Almacén persistente de los recordatorios y alarmas del scheduler.
+
+APScheduler guarda sus jobs en memoria, así que un reinicio o un redeploy
+los perdía. Aquí cada recordatorio se guarda como un descriptor
+serializable (ReminderJob: qué disparar y cuándo, sin funciones ni
+closures) en SQLite, y ReminderScheduler arma los jobs de APScheduler a
+partir de él: al arrancar, los que vencen en la ventana próxima con una
+sola consulta sobre el índice de trigger_at; los demás, a medida que la
+ventana avanza.
+"""
+
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Columnas en el orden de to_row / from_row
+JOB_COLUMNS = (
+    "id, kind, title, message, priority, sound_type, repeat_sound, trigger_at, recurrence"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ReminderJob:
+    """Descriptor serializable de un recordatorio o alarma programado."""
+
+    id: str
+    title: str
+    message: str
+    trigger_time: datetime
+    kind: str = "reminder"
+    priority: str = "normal"
+    sound_type: Optional[str] = None
+    repeat_sound: int = 0
+    recurrence: Optional[str] = None
+
+    def to_row(self) -> tuple:
+        """Fila para JOB_COLUMNS (trigger_time como timestamp UNIX)."""
+        return (
+            self.id,
+            self.kind,
+            self.title,
+            self.message,
+            self.priority,
+            self.sound_type,
+            self.repeat_sound,
+            self.trigger_time.timestamp(),
+            self.recurrence,
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "ReminderJob":
+        """Descriptor desde una fila de JOB_COLUMNS (trigger_time en hora local)."""
+        job_id, kind, title, message, priority, sound_type, repeat, trigger_at, recurrence = row
+        return cls(
+            id=job_id,
+            title=title,
+            message=message,
+            trigger_time=datetime.fromtimestamp(trigger_at),
+            kind=kind,
+            priority=priority,
+            sound_type=sound_type,
+            repeat_sound=repeat,
+            recurrence=recurrence,
+        )
+
+    def at(self, trigger_time: datetime) -> "ReminderJob":
+        """El mismo descriptor para otra repetición."""
+        return replace(self, trigger_time=trigger_time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación para las herramientas (reminder_list)."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "title": self.title,
+            "message": self.message,
+            "next_run": self.trigger_time.isoformat(),
+            "priority": self.priority,
+            "recurrence": self.recurrence,
+        }
+
+
+class ReminderStore:
+    """Recordatorios pendientes del scheduler en un archivo SQLite."""
+
+    def __init__(self, db_path: str = "data/reminders.db"):
+        """
+        Inicializa el almacén.
+
+        Args:
+            db_path: Ruta al archivo SQLite (en Railway, dentro de un volumen)
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[aiosqlite.Connection] = None
+
+    async def open(self):
+        """Abre la conexión y crea la tabla si no existe."""
+        self._conn = await aiosqlite.connect(self.db_path)
+        # WAL: listar recordatorios no espera a una escritura en curso
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        # Un recordatorio confirmado al usuario debe sobrevivir a un corte de luz
+        await self._conn.execute("PRAGMA synchronous=FULL")
+        await self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scheduled_reminders (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL DEFAULT 'reminder',
+                title TEXT NOT NULL,
+                message TEXT NOT NULL DEFAULT '',
+                priority TEXT NOT NULL DEFAULT 'normal',
+                sound_type TEXT,
+                repeat_sound INTEGER NOT NULL DEFAULT 0,
+                trigger_at REAL NOT NULL,
+                recurrence TEXT
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_scheduled_reminders_trigger
+            ON scheduled_reminders(trigger_at, id);
+            """
+        )
+        await self._conn.commit()
+
+    async def close(self):
+        """Cierra la conexión."""
+        if self._conn:
+            await self._conn.close()
+            self._conn = None
+
+    async def save(self, job: ReminderJob):
+        """Guarda un recordatorio (reemplaza el que tenga el mismo ID)."""
+        await self.save_many([job])
+
+    async def save_many(self, jobs: List[ReminderJob]):
+        """Guarda varios recordatorios en una transacción."""
+        await self._conn.executemany(
+            f"INSERT OR REPLACE INTO scheduled_reminders ({JOB_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [job.to_row() for job in jobs],
+        )
+        await self._conn.commit()
+
+    async def reschedule(self, reminder_id: str, trigger_time: datetime) -> bool:
+        """Mueve un recordatorio recurrente a su próxima repetición."""
+        cursor = await self._conn.execute(
+            "UPDATE scheduled_reminders SET trigger_at = ? WHERE id = ?",
+            (trigger_time.timestamp(), reminder_id),
+        )
+        await self._conn.commit()
+        return cursor.rowcount > 0
+
+    async def delete(self, reminder_id: str) -> bool:
+        """Elimina un recordatorio; False si no existía."""
+        cursor = await self._conn.execute(
+            "DELETE FROM scheduled_reminders WHERE id = ?", (reminder_id,)
+        )
+        await self._conn.commit()
+        return cursor.rowcount > 0
+
+    async def get(self, reminder_id: str) -> Optional[ReminderJob]:
+        """Recordatorio por ID, o None."""
+        async with self._conn.execute(
+            f"SELECT {JOB_COLUMNS} FROM scheduled_reminders WHERE id = ?", (reminder_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return ReminderJob.from_row(row) if row else None
+
+    async def due_before(
+        self, until: datetime, since: Optional[datetime] = None
+    ) -> List[ReminderJob]:
+        """
+        Recordatorios que se disparan antes de until.
+
+        Una sola consulta por rango sobre idx_scheduled_reminders_trigger.
+
+        Args:
+            until: Fin de la ventana (excluido)
+            since: Inicio de la ventana (incluido); sin él entran también
+                los vencidos mientras el agente estaba apagado
+        """
+        start = since.timestamp() if since else float("-inf")
+        async with self._conn.execute(
+            f"SELECT {JOB_COLUMNS} FROM scheduled_reminders "
+            "WHERE trigger_at >= ? AND trigger_at < ? ORDER BY trigger_at, id",
+            (start, until.timestamp()),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [ReminderJob.from_row(row) for row in rows]
+
+    async def list(self, limit: int = 50, offset: int = 0) -> List[ReminderJob]:
+        """Recordatorios pendientes, del más próximo al más lejano."""
+        async with self._conn.execute(
+            f"SELECT {JOB_COLUMNS} FROM scheduled_reminders "
+            "ORDER BY trigger_at, id LIMIT ? OFFSET ?",
+            (limit, offset),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [ReminderJob.from_row(row) for row in rows]
+
+    async def count(self) -> int:
+        """Número de recordatorios pendientes."""
+        async with self._conn.execute("SELECT COUNT(*) FROM scheduled_reminders") as cursor:
+            return (await cursor.fetchone())[0]
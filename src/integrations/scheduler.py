@@ -1,6 +1,16 @@
-"""Sistema de recordatorios programados usando APScheduler."""
+"""
+Sistema de recordatorios programados usando APScheduler.
+
+Los recordatorios y alarmas se guardan en ReminderStore y solo los que
+vencen dentro de la ventana de armado (arm_horizon) tienen un job en
+APScheduler. Al arrancar se arman de una vez los de la primera ventana
+(y los vencidos mientras el agente estaba apagado); el job "rearm" va
+armando los siguientes. Así un reinicio no pierde nada y recuperar muchos
+recordatorios pendientes no obliga a crear un job por cada uno.
+"""
 
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -10,6 +20,10 @@ from apscheduler.triggers.cron import CronTrigger
 
 from .notifications import NotificationManager
 from .database import TaskDatabase
+from .reminder_store import ReminderJob, ReminderStore
+from .repository import TaskRepository
+from ..utils.recurrence import RecurrenceRule, next_occurrence
+from ..utils.retention import RetentionPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -20,40 +34,63 @@ class ReminderScheduler:
     def __init__(
         self,
         notification_manager: Optional[NotificationManager] = None,
-        task_db: Optional[TaskDatabase] = None,
+        task_db: Optional[TaskRepository] = None,
+        retention: Optional[RetentionPolicy] = None,
+        alarm_manager=None,
+        store: Optional[ReminderStore] = None,
+        arm_horizon: timedelta = timedelta(hours=6),
     ):
         """
         Inicializa el scheduler de recordatorios.
 
         Args:
             notification_manager: Gestor de notificaciones
-            task_db: Base de datos de tareas
+            task_db: Base de datos de tareas ya conectada (cualquier backend); si
+                no se pasa se crea una SQLite que se conecta en start()
+            retention: Política de archivo de tareas completadas
+            alarm_manager: Gestor de alarmas con sonido; si no se pasa se crea
+                al dispararse la primera alarma
+            store: Almacén persistente de recordatorios (se abre en start())
+            arm_horizon: Ventana de recordatorios con job armado en APScheduler
         """
         self.scheduler = AsyncIOScheduler()
         self.notification_manager = notification_manager or NotificationManager()
         self.task_db = task_db or TaskDatabase()
-        self._initialized = False
+        self.retention = retention or RetentionPolicy()
+        self.alarm_manager = alarm_manager
+        self.store = store or ReminderStore()
+        self.arm_horizon = arm_horizon
+        self._initialized = task_db is not None
+        # Los recordatorios anteriores a este momento ya tienen job armado
+        self._armed_until = datetime.min
 
         logger.info("ReminderScheduler inicializado")
 
     async def start(self):
         """Inicia el scheduler."""
         if not self._initialized:
-            await self.task_db.initialize()
+            await self.task_db.connect()
             self._initialized = True
 
         if not self.scheduler.running:
+            await self.store.open()
             self.scheduler.start()
             logger.info("Scheduler iniciado")
 
+            # Recuperar los recordatorios guardados antes de programar nada más
+            await self._rehydrate()
+
             # Programar tareas recurrentes
             await self._schedule_daily_summary()
             await self._schedule_event_reminders()
+            await self._schedule_maintenance()
+            await self._schedule_rearm()
 
-    def stop(self):
-        """Detiene el scheduler."""
+    async def stop(self):
+        """Detiene el scheduler (los recordatorios siguen en el almacén)."""
         if self.scheduler.running:
             self.scheduler.shutdown()
+            await self.store.close()
             logger.info("Scheduler detenido")
 
     async def schedule_reminder(
@@ -63,16 +100,22 @@ class ReminderScheduler:
         message: str,
         trigger_time: datetime,
         priority: str = "normal",
+        recurrence: Optional[str] = None,
     ) -> bool:
         """
-        Programa un recordatorio único.
+        Programa un recordatorio único o recurrente.
+
+        El recordatorio se guarda en el almacén antes de armarlo, así que
+        sobrevive a un reinicio. De una serie solo se guarda la próxima
+        repetición; al dispararse, _fire guarda la siguiente con el mismo ID.
 
         Args:
             reminder_id: ID único del recordatorio
             title: Título del recordatorio
             message: Mensaje del recordatorio
-            trigger_time: Cuándo disparar el recordatorio
+            trigger_time: Cuándo disparar el recordatorio (primera repetición)
             priority: Prioridad de la notificación
+            recurrence: RRULE de la serie (ej. "FREQ=WEEKLY;BYDAY=MO")
 
         Returns:
             True si se programó exitosamente
@@ -83,13 +126,19 @@ class ReminderScheduler:
                 logger.warning(f"Tiempo de recordatorio {trigger_time} está en el pasado")
                 return False
 
-            # Programar job
-            self.scheduler.add_job(
-                func=self._send_reminder,
-                trigger=DateTrigger(run_date=trigger_time),
-                args=[title, message, priority],
-                id=reminder_id,
-                replace_existing=True,
+            if recurrence:
+                # COUNT pasa a UNTIL para poder avanzar el inicio de la serie
+                recurrence = str(RecurrenceRule.parse(recurrence).bounded(trigger_time))
+
+            await self._schedule(
+                ReminderJob(
+                    id=reminder_id,
+                    title=title,
+                    message=message,
+                    trigger_time=trigger_time,
+                    priority=priority,
+                    recurrence=recurrence,
+                )
             )
 
             logger.info(f"Recordatorio programado: {reminder_id} para {trigger_time}")
@@ -99,6 +148,54 @@ class ReminderScheduler:
             logger.error(f"Error programando recordatorio: {e}")
             return False
 
+    async def schedule_alarm(
+        self,
+        alarm_id: str,
+        title: str,
+        message: str,
+        alarm_time: datetime,
+        sound_type: str = "alarm",
+        repeat_sound: int = 3,
+    ) -> bool:
+        """
+        Programa una alarma con sonido (ver AlarmManager.trigger_alarm).
+
+        Args:
+            alarm_id: ID único de la alarma
+            title: Título de la alarma
+            message: Mensaje de la alarma
+            alarm_time: Cuándo sonar
+            sound_type: Valor de AlarmSound (alarm, bell, gentle, beep)
+            repeat_sound: Cuántas veces repetir el sonido
+
+        Returns:
+            True si se programó exitosamente
+        """
+        try:
+            if alarm_time <= datetime.now():
+                logger.warning(f"Hora de alarma {alarm_time} está en el pasado")
+                return False
+
+            await self._schedule(
+                ReminderJob(
+                    id=alarm_id,
+                    title=title,
+                    message=message,
+                    trigger_time=alarm_time,
+                    kind="alarm",
+                    priority="critical",
+                    sound_type=sound_type,
+                    repeat_sound=int(repeat_sound),
+                )
+            )
+
+            logger.info(f"Alarma programada: {alarm_id} para {alarm_time}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error programando alarma: {e}")
+            return False
+
     async def schedule_task_reminder(
         self, task_id: str, task_title: str, remind_at: datetime
     ) -> bool:
@@ -150,9 +247,66 @@ class ReminderScheduler:
             priority="normal",
         )
 
-    def cancel_reminder(self, reminder_id: str) -> bool:
+    async def _schedule(self, job: ReminderJob):
+        """Guarda el recordatorio y lo arma si cae dentro de la ventana actual."""
+        await self.store.save(job)
+        if job.trigger_time < self._armed_until:
+            self._arm(job)
+
+    def _arm(self, job: ReminderJob):
+        """Programa el job de una repetición (reemplaza la anterior con el mismo ID)."""
+        self.scheduler.add_job(
+            func=self._fire,
+            trigger=DateTrigger(run_date=job.trigger_time),
+            args=[job],
+            id=job.id,
+            replace_existing=True,
+            # Los vencidos mientras el agente estaba apagado se disparan al arrancar
+            misfire_grace_time=None,
+        )
+
+    async def _rehydrate(self):
+        """Arma los recordatorios guardados que vencen en la primera ventana."""
+        start = time.perf_counter()
+        until = datetime.now() + self.arm_horizon
+        # Antes de consultar: lo que se programe durante la consulta se arma
+        # en _schedule (armarlo dos veces no duplica, replace_existing)
+        self._armed_until = until
+        jobs = await self.store.due_before(until)
+        for job in jobs:
+            self._arm(job)
+        logger.info(
+            f"{len(jobs)} recordatorios recuperados hasta {until:%d/%m %H:%M} "
+            f"en {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+
+    async def _schedule_rearm(self):
+        """Programa el avance de la ventana de armado."""
+        try:
+            self.scheduler.add_job(
+                func=self._rearm,
+                trigger=IntervalTrigger(seconds=self.arm_horizon.total_seconds() / 2),
+                id="rearm",
+                replace_existing=True,
+            )
+            logger.info(f"Ventana de recordatorios armados: {self.arm_horizon}")
+
+        except Exception as e:
+            logger.error(f"Error programando el armado de recordatorios: {e}")
+
+    async def _rearm(self):
+        """Arma los recordatorios que entran en la ventana desde la última vez."""
+        since, until = self._armed_until, datetime.now() + self.arm_horizon
+        # Como en _rehydrate, la ventana avanza antes de consultar
+        self._armed_until = until
+        jobs = await self.store.due_before(until, since=since)
+        for job in jobs:
+            self._arm(job)
+        logger.debug(f"{len(jobs)} recordatorios armados hasta {until}")
+
+    async def cancel_reminder(self, reminder_id: str) -> bool:
         """
-        Cancela un recordatorio programado.
+        Cancela un recordatorio o alarma programado.
 
         Args:
             reminder_id: ID del recordatorio a cancelar
@@ -161,14 +315,66 @@ class ReminderScheduler:
             True si se canceló exitosamente
         """
         try:
-            self.scheduler.remove_job(reminder_id)
-            logger.info(f"Recordatorio cancelado: {reminder_id}")
-            return True
+            deleted = await self.store.delete(reminder_id)
+            if self.scheduler.get_job(reminder_id):
+                self.scheduler.remove_job(reminder_id)
+            if deleted:
+                logger.info(f"Recordatorio cancelado: {reminder_id}")
+            return deleted
         except Exception as e:
             logger.warning(f"No se pudo cancelar recordatorio {reminder_id}: {e}")
             return False
 
-    async def _send_reminder(self, title: str, message: str, priority: str = "normal"):
+    async def _fire(self, job: ReminderJob):
+        """
+        Dispara un recordatorio o alarma y, si es recurrente, guarda la siguiente repetición.
+
+        Args:
+            job: Repetición que se está disparando
+        """
+        try:
+            if job.kind == "alarm":
+                self._trigger_alarm(job)
+            else:
+                self._send_reminder(job.title, job.message, job.priority)
+        finally:
+            await self._advance(job)
+
+    async def _advance(self, job: ReminderJob):
+        """Pasa una serie a su próxima repetición o borra el recordatorio ya disparado."""
+        next_time = next_occurrence(job.recurrence, job.trigger_time) if job.recurrence else None
+        if next_time is None:
+            await self.store.delete(job.id)
+            if job.recurrence:
+                logger.info(f"Serie de recordatorios terminada: {job.id}")
+            return
+
+        await self.store.reschedule(job.id, next_time)
+        if next_time < self._armed_until:
+            self._arm(job.at(next_time))
+        logger.info(f"Próxima repetición de {job.id}: {next_time}")
+
+    def _trigger_alarm(self, job: ReminderJob):
+        """Hace sonar una alarma guardada."""
+        from .alarm import AlarmManager, AlarmSound
+
+        if self.alarm_manager is None:
+            self.alarm_manager = AlarmManager()
+
+        try:
+            sound = AlarmSound(job.sound_type)
+        except ValueError:
+            sound = AlarmSound.ALARM
+
+        self.alarm_manager.trigger_alarm(
+            title=job.title,
+            message=job.message,
+            sound=sound,
+            repeat_sound=job.repeat_sound,
+            persistent=True,
+        )
+
+    def _send_reminder(self, title: str, message: str, priority: str = "normal"):
         """
         Envía una notificación de recordatorio.
 
@@ -258,19 +464,36 @@ class ReminderScheduler:
         except Exception as e:
             logger.error(f"Error revisando eventos: {e}")
 
-    def list_scheduled_reminders(self) -> list:
+    async def _schedule_maintenance(self):
+        """Programa el archivo de tareas y el mantenimiento de la base."""
+        try:
+            self.scheduler.add_job(
+                func=self._run_maintenance,
+                trigger=IntervalTrigger(seconds=self.retention.interval.total_seconds()),
+                id="maintenance",
+                replace_existing=True,
+            )
+            logger.info(f"Mantenimiento programado cada {self.retention.interval}")
+
+        except Exception as e:
+            logger.error(f"Error programando mantenimiento: {e}")
+
+    async def _run_maintenance(self):
+        """Archiva las tareas completadas antiguas y compacta la base."""
+        result = await self.task_db.run_maintenance(self.retention)
+        logger.info(f"Mantenimiento completado: {result}")
+
+    async def list_reminders(self, limit: int = 50, offset: int = 0) -> list:
         """
-        Lista todos los recordatorios programados.
+        Lista los recordatorios y alarmas pendientes desde el almacén.
+
+        Incluye los que aún no tienen job armado (fuera de la ventana).
+
+        Args:
+            limit: Máximo de recordatorios
+            offset: Recordatorios a saltar
 
         Returns:
-            Lista de jobs programados
+            Lista de dicts (ver ReminderJob.to_dict), del más próximo al más lejano
         """
-        jobs = self.scheduler.get_jobs()
-        return [
-            {
-                "id": job.id,
-                "next_run": job.next_run_time,
-                "trigger": str(job.trigger),
-            }
-            for job in jobs
-        ]
+        return [job.to_dict() for job in await self.store.list(limit, offset)]
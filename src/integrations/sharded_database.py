@@ -0,0 +1,307 @@
+"""
+Base de datos de tareas repartida en varios archivos SQLite.
+
+Con un solo archivo todos los usuarios compiten por el mismo lock de
+escritura de SQLite. Aquí cada usuario (modo "user") o cada cubo de hash
+(modo "hash") tiene su propio archivo, así que las escrituras de usuarios
+distintos no se esperan entre sí.
+
+Cada shard es un TaskDatabase normal con una conexión persistente en modo
+WAL (ver TaskDatabase.open). Hay como mucho max_open conexiones abiertas; al
+pasar el límite se cierra la del shard usado hace más tiempo y se vuelve a
+abrir cuando haga falta. El esquema de cada archivo se crea una sola vez
+por proceso, así que reabrir un shard no repite el DDL.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from ..utils.retention import RetentionPolicy
+from .database import TaskDatabase
+from .repository import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+SHARD_MODES = ("user", "hash")
+
+# Caracteres permitidos en el nombre de archivo de un shard por usuario
+_SAFE_KEY = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def shard_key(user_id: str, mode: str = "user", buckets: int = 16) -> str:
+    """
+    Nombre del shard de un usuario.
+
+    Args:
+        user_id: ID del usuario
+        mode: "user" (un archivo por usuario) o "hash" (cubos fijos)
+        buckets: Número de cubos en modo "hash"
+
+    Returns:
+        Nombre del archivo sin extensión
+    """
+    digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()
+    if mode == "hash":
+        return f"bucket_{int(digest, 16) % buckets:03}"
+    if _SAFE_KEY.match(user_id):
+        return f"user_{user_id}"
+    # IDs con caracteres raros o muy largos no se usan como nombre de archivo
+    return f"user_h{digest[:16]}"
+
+
+class ShardedTaskDatabase(TaskRepository):
+    """Gestor de tareas con un archivo SQLite por usuario o por cubo de hash."""
+
+    def __init__(
+        self,
+        base_dir: str = "data/shards",
+        mode: str = "user",
+        buckets: int = 16,
+        max_open: int = 32,
+    ):
+        """
+        Inicializa el gestor de shards.
+
+        Args:
+            base_dir: Directorio de los archivos de los shards
+            mode: "user" o "hash"
+            buckets: Número de cubos en modo "hash"
+            max_open: Máximo de shards con conexión abierta a la vez
+        """
+        if mode not in SHARD_MODES:
+            raise ValueError(f"Modo de shard no válido: {mode}")
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.buckets = max(1, buckets)
+        self.max_open = max(1, max_open)
+        self._open: "OrderedDict[str, TaskDatabase]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Shards con el esquema ya creado en este proceso
+        self._initialized: Set[str] = set()
+
+        logger.info(
+            f"ShardedTaskDatabase inicializado ({mode}, {base_dir}, máx. {self.max_open} abiertos)"
+        )
+
+    async def connect(self):
+        """Los shards se crean e inicializan al usarse por primera vez."""
+
+    async def disconnect(self):
+        """Cierra las conexiones de todos los shards abiertos."""
+        while self._open:
+            _, shard = self._open.popitem(last=False)
+            await shard.close()
+        self._locks.clear()
+
+    async def initialize(self):
+        """Compatibilidad con TaskDatabase (ver connect)."""
+        await self.connect()
+
+    def shard_path(self, key: str) -> Path:
+        """Ruta del archivo de un shard."""
+        return self.base_dir / f"{key}.db"
+
+    @property
+    def open_count(self) -> int:
+        """Shards con conexión abierta ahora mismo."""
+        return len(self._open)
+
+    async def _shard(self, key: str) -> TaskDatabase:
+        """Devuelve el shard abierto, abriéndolo (y cerrando el más antiguo) si hace falta."""
+        shard = self._open.get(key)
+        if shard is not None:
+            self._open.move_to_end(key)
+            return shard
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            shard = self._open.get(key)
+            if shard is None:
+                shard = TaskDatabase(db_path=str(self.shard_path(key)))
+                if key not in self._initialized:
+                    await shard.initialize()
+                    self._initialized.add(key)
+                # WAL: las lecturas del shard no esperan a su escritor
+                await shard.open()
+                self._open[key] = shard
+                await self._evict()
+            else:
+                self._open.move_to_end(key)
+        return shard
+
+    async def _evict(self):
+        """
+        Cierra los shards usados hace más tiempo por encima de max_open.
+
+        close() espera a la operación en curso; quien aún tenga el shard
+        sigue funcionando con conexiones sueltas hasta que se reabra.
+        """
+        while len(self._open) > self.max_open:
+            key, shard = self._open.popitem(last=False)
+            lock = self._locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._locks[key]
+            await shard.close()
+            logger.debug(f"Shard cerrado: {key}")
+
+    async def for_user(self, user_id: str) -> TaskDatabase:
+        """Shard que guarda las tareas de un usuario."""
+        return await self._shard(shard_key(user_id, self.mode, self.buckets))
+
+    async def iter_shards(self) -> AsyncIterator[Tuple[str, TaskDatabase]]:
+        """
+        Recorre todos los shards existentes en disco, de uno en uno.
+
+        Los shards se abren solo al llegar a ellos, así que recorrer miles
+        no supera max_open.
+        """
+        for path in sorted(self.base_dir.glob("*.db")):
+            yield path.stem, await self._shard(path.stem)
+
+    # ==================== TAREAS ====================
+
+    async def create_task(
+        self,
+        task_id: str,
+        user_id: str,
+        title: str,
+        description: str = "",
+        priority: str = "medium",
+        due_date: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        estimated_minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Crea una tarea en el shard del usuario (ver TaskDatabase.create_task)."""
+        shard = await self.for_user(user_id)
+        return await shard.create_task(
+            task_id, user_id, title, description, priority, due_date, tags, estimated_minutes
+        )
+
+    async def list_tasks_page(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = 10,
+        days: int = 7,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Página de tareas del usuario (ver TaskDatabase.list_tasks_page)."""
+        shard = await self.for_user(user_id)
+        return await shard.list_tasks_page(
+            user_id, filter_type, limit=limit, days=days, cursor=cursor, tag=tag
+        )
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        filter_type: str = "pending",
+        *,
+        limit: int = 10,
+        days: int = 7,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Tareas del usuario (ver TaskDatabase.list_tasks)."""
+        shard = await self.for_user(user_id)
+        return await shard.list_tasks(user_id, filter_type, limit=limit, days=days, tag=tag)
+
+    async def tag_counts(
+        self, user_id: str, include_completed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Etiquetas del usuario con su número de tareas."""
+        shard = await self.for_user(user_id)
+        return await shard.tag_counts(user_id, include_completed)
+
+    async def list_schedulable_tasks(self, user_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Tareas pendientes que se pueden planificar."""
+        shard = await self.for_user(user_id)
+        return await shard.list_schedulable_tasks(user_id, limit)
+
+    async def mark_tasks_scheduled(self, user_id: str, scheduled: Dict[str, datetime]) -> int:
+        """Guarda el inicio del bloque planificado de cada tarea."""
+        shard = await self.for_user(user_id)
+        return await shard.mark_tasks_scheduled(user_id, scheduled)
+
+    async def complete_task(self, task_id: str, user_id: str) -> bool:
+        """Marca una tarea como completada."""
+        shard = await self.for_user(user_id)
+        return await shard.complete_task(task_id, user_id)
+
+    async def delete_task(self, task_id: str, user_id: str) -> bool:
+        """Elimina una tarea."""
+        shard = await self.for_user(user_id)
+        return await shard.delete_task(task_id, user_id)
+
+    async def get_task(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene una tarea por su ID."""
+        shard = await self.for_user(user_id)
+        return await shard.get_task(task_id, user_id)
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        kinds: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Búsqueda de texto completo en el shard del usuario."""
+        shard = await self.for_user(user_id)
+        return await shard.search(user_id, query, limit, offset, kinds)
+
+    # ==================== MANTENIMIENTO ====================
+
+    async def rebuild_search_index(self):
+        """Reconstruye el índice FTS5 de todos los shards."""
+        async for _, shard in self.iter_shards():
+            await shard.rebuild_search_index()
+
+    async def archive_completed_tasks(self, before: datetime, batch_size: int = 1000) -> int:
+        """
+        Archiva las tareas completadas antes de before en todos los shards.
+
+        Returns:
+            Número total de tareas archivadas
+        """
+        total = 0
+        async for _, shard in self.iter_shards():
+            total += await shard.archive_completed_tasks(before, batch_size)
+        return total
+
+    async def maintenance(self, vacuum_threshold: float = 0.2) -> Dict[str, Any]:
+        """
+        ANALYZE (y VACUUM si hace falta) de cada shard.
+
+        Returns:
+            Dict con shards, vacuumed (número de shards compactados) y errors
+        """
+        shards = vacuumed = errors = 0
+        async for key, shard in self.iter_shards():
+            result = await shard.maintenance(vacuum_threshold)
+            shards += 1
+            if "error" in result:
+                errors += 1
+                logger.warning(f"Mantenimiento del shard {key} fallido: {result['error']}")
+            elif result["vacuumed"]:
+                vacuumed += 1
+        logger.info(f"Mantenimiento de shards: {shards} revisados, {vacuumed} compactados")
+        return {"shards": shards, "vacuumed": vacuumed, "errors": errors}
+
+    async def run_maintenance(self, policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """
+        Archiva las tareas completadas según la política y ejecuta maintenance().
+
+        Returns:
+            Dict con tasks_archived, shards, vacuumed y errors
+        """
+        policy = policy or RetentionPolicy()
+        archived = await self.archive_completed_tasks(policy.tasks_cutoff())
+        return {"tasks_archived": archived, **await self.maintenance()}
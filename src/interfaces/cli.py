@@ -162,9 +162,13 @@ async def start_cli(settings: Optional[Settings] = None):
 
     config = load_yaml_config()
 
-    # Crear agente
+    # Crear agente y calentar sus servicios antes del primer mensaje
     agent = PersonalAgent(settings=settings, config=config)
+    await agent.start()
 
     # Crear y ejecutar CLI
     cli = CLIInterface(agent)
-    await cli.run()
+    try:
+        await cli.run()
+    finally:
+        await agent.stop()
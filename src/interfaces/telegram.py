@@ -161,7 +161,7 @@ También puedes hablar conmigo en lenguaje natural. Por ejemplo:
    Ejemplo: `/agenda 3` (próximos 3 días)
 
 ✅ `/tareas [filtro]` - Ver tus tareas
-   Filtros: pending, completed, urgent, all
+   Filtros: pending, completed, urgent, today, overdue, week, all
    Ejemplo: `/tareas urgent`
 
 🗑️ `/clear` - Limpiar historial de conversación
@@ -359,8 +359,9 @@ async def start_telegram_bot(settings: Settings):
     # Cargar configuración
     config = load_yaml_config()
 
-    # Crear agente
+    # Crear agente y calentar sus servicios antes del primer mensaje
     agent = PersonalAgent(settings=settings, config=config)
+    await agent.start()
 
     # Crear y arrancar bot
     bot = TelegramBot(settings=settings, agent=agent)
@@ -373,3 +374,5 @@ async def start_telegram_bot(settings: Settings):
     except Exception as e:
         logger.error(f"Error en bot de Telegram: {e}", exc_info=True)
         raise
+    finally:
+        await agent.stop()
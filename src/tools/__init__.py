@@ -1,23 +1,34 @@
 """Sistema de herramientas para el agente personal."""
 
 from .base import Tool, ToolRegistry
-from .calendar_tool import CalendarTool, CalendarGetAgendaTool
-from .task_tool import TaskCreateTool, TaskListTool, TaskCompleteTool
+from .calendar_tool import CalendarTool, CalendarGetAgendaTool, CalendarFindFreeSlotsTool
+from .task_tool import (
+    TaskCreateTool,
+    TaskListTool,
+    TaskTagsTool,
+    TaskCompleteTool,
+    TaskAutoScheduleTool,
+)
 from .notification_tool import NotificationSendTool
 from .reminder_tool import ReminderCreateTool, ReminderListTool, ReminderCancelTool
 from .alarm_tool import AlarmCreateTool
+from .search_tool import SearchTool
 
 __all__ = [
     "Tool",
     "ToolRegistry",
     "CalendarTool",
     "CalendarGetAgendaTool",
+    "CalendarFindFreeSlotsTool",
     "TaskCreateTool",
     "TaskListTool",
+    "TaskTagsTool",
     "TaskCompleteTool",
+    "TaskAutoScheduleTool",
     "NotificationSendTool",
     "ReminderCreateTool",
     "ReminderListTool",
     "ReminderCancelTool",
     "AlarmCreateTool",
+    "SearchTool",
 ]
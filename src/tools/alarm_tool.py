@@ -75,8 +75,6 @@ class AlarmCreateTool(Tool):
         Returns:
             Dict con el resultado de la operación
         """
-        from ..integrations.alarm import AlarmManager, AlarmSound
-
         title = kwargs.get("title")
         message = kwargs.get("message")
         alarm_time_str = kwargs.get("alarm_time")
@@ -97,41 +95,21 @@ class AlarmCreateTool(Tool):
             # Generar ID único
             alarm_id = f"alarm_{int(datetime.now().timestamp())}"
 
-            # Obtener scheduler
-            from .reminder_tool import get_reminder_scheduler
-
-            scheduler = await get_reminder_scheduler()
-
-            # Mapear sound type
-            sound_map = {
-                "alarm": AlarmSound.ALARM,
-                "bell": AlarmSound.BELL,
-                "gentle": AlarmSound.GENTLE,
-                "beep": AlarmSound.BEEP,
-            }
-            sound = sound_map.get(sound_type, AlarmSound.ALARM)
-
-            # Crear función de alarma
-            alarm_manager = AlarmManager()
-
-            async def trigger_alarm():
-                alarm_manager.trigger_alarm(
-                    title=title,
-                    message=message,
-                    sound=sound,
-                    repeat_sound=int(repeat_sound),
-                    persistent=True,
-                )
-
-            # Programar la alarma
-            from apscheduler.triggers.date import DateTrigger
-
-            scheduler.scheduler.add_job(
-                func=trigger_alarm,
-                trigger=DateTrigger(run_date=alarm_time),
-                id=alarm_id,
-                replace_existing=True,
+            # Programar la alarma (queda guardada y sobrevive a un reinicio)
+            scheduler = self.services.reminder_scheduler
+            success = await scheduler.schedule_alarm(
+                alarm_id=alarm_id,
+                title=title,
+                message=message,
+                alarm_time=alarm_time,
+                sound_type=sound_type,
+                repeat_sound=int(repeat_sound),
             )
+            if not success:
+                return {
+                    "success": False,
+                    "error": "No se pudo programar la alarma",
+                }
 
             # Calcular tiempo hasta la alarma
             time_until = alarm_time - datetime.now()
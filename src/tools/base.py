@@ -2,9 +2,12 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from ..core.services import ServiceContainer
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +31,25 @@ class Tool(ABC):
     - description: qué hace la herramienta
     - parameters: lista de parámetros que acepta
     - execute: lógica de ejecución
+
+    Las herramientas que usan la base de datos, el scheduler o las alarmas
+    los toman de self.services (ver core.services).
     """
 
+    def __init__(self, services: Optional["ServiceContainer"] = None):
+        """
+        Args:
+            services: Contenedor con los servicios compartidos del agente
+        """
+        self._services = services
+
+    @property
+    def services(self) -> "ServiceContainer":
+        """Servicios compartidos del agente."""
+        if self._services is None:
+            raise RuntimeError(f"La herramienta {self.name} no tiene contenedor de servicios")
+        return self._services
+
     @property
     @abstractmethod
     def name(self) -> str:
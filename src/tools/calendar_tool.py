@@ -1,10 +1,19 @@
 """Herramienta para gestión de calendario."""
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import islice
 from typing import Dict, Any, List
 from .base import Tool, ToolParameter
-from ..integrations import calcurse
+from ..integrations.calcurse_client import get_client
+from ..utils.config import load_yaml_config
+from ..utils.recurrence import parse_rule
+from ..utils.scheduling import DEEP_WORK_MODES, WorkSchedule
+
+# Máximo de huecos por respuesta de calendar_find_free_slots
+MAX_FREE_SLOTS = 20
+# Repeticiones de un evento recurrente en las que se buscan conflictos
+MAX_CHECKED_OCCURRENCES = 10
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +60,24 @@ class CalendarTool(Tool):
                 description="Descripción o notas adicionales del evento",
                 required=False,
             ),
+            ToolParameter(
+                name="allow_overlap",
+                type="boolean",
+                description=(
+                    "Crear el evento aunque se solape con otros "
+                    "(solo si el usuario lo confirmó tras ver los conflictos)"
+                ),
+                required=False,
+            ),
+            ToolParameter(
+                name="recurrence",
+                type="string",
+                description=(
+                    "Regla de repetición RRULE si el evento se repite "
+                    "(ej: 'FREQ=WEEKLY;BYDAY=TU,TH', 'FREQ=DAILY;COUNT=5')"
+                ),
+                required=False,
+            ),
         ]
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
@@ -62,26 +89,54 @@ class CalendarTool(Tool):
             start_time: Hora de inicio (ISO 8601)
             duration_minutes: Duración en minutos
             description: Descripción del evento
+            allow_overlap: Crear aunque haya conflictos
+            recurrence: RRULE del evento recurrente
 
         Returns:
-            Dict con el resultado de la operación
+            Dict con el resultado de la operación (y los conflictos si los hay)
         """
         title = kwargs.get("title")
         start_time_str = kwargs.get("start_time")
         duration_minutes = kwargs.get("duration_minutes", 60)
         kwargs.get("description", "")
+        allow_overlap = bool(kwargs.get("allow_overlap", False))
+
+        try:
+            rule = parse_rule(kwargs.get("recurrence"))
+        except ValueError as e:
+            return {"success": False, "error": f"Regla de recurrencia inválida: {e}"}
 
         # Parsear la fecha
         start_time = datetime.fromisoformat(start_time_str)
-        date = start_time.strftime("%m/%d/%Y")
-        start_t = start_time.strftime("%H:%M")
+        duration = timedelta(minutes=duration_minutes)
+        end_dt = start_time + duration
+        client = get_client()
 
-        from datetime import timedelta
+        conflicts = []
+        if load_yaml_config().get("task_management", {}).get("conflict_detection", True):
+            # De una serie se revisan solo las primeras repeticiones
+            starts = (
+                islice(rule.occurrences(start_time), MAX_CHECKED_OCCURRENCES)
+                if rule
+                else (start_time,)
+            )
+            for start in starts:
+                found = await client.conflicts(start, start + duration)
+                conflicts.extend(apt.to_dict() for apt in found)
+            if conflicts and not allow_overlap:
+                return {
+                    "success": False,
+                    "error": (
+                        f"El evento '{title}' se solapa con {len(conflicts)} evento(s); "
+                        "confirma con el usuario y usa allow_overlap para crearlo igualmente"
+                    ),
+                    "conflicts": conflicts,
+                }
 
-        end_dt = start_time + timedelta(minutes=duration_minutes)
-        end_t = end_dt.strftime("%H:%M")
-        c = calcurse.Calcurse()
-        return c.saveEvent(title, date, start_t, end_t)
+        result = await client.save_event(title, start_time, end_dt, str(rule) if rule else None)
+        if conflicts and result.get("success"):
+            result["conflicts"] = conflicts
+        return result
 
 
 class CalendarGetAgendaTool(Tool):
@@ -127,21 +182,21 @@ class CalendarGetAgendaTool(Tool):
         Returns:
             Dict con los eventos encontrados
         """
-        days = kwargs.get("days", 1)
-        kwargs.get("start_date")
+        days = int(kwargs.get("days", 1))
+        start_date = kwargs.get("start_date")
 
         try:
-            # Obtener agenda desde calcurse
-            c = calcurse.Calcurse()
-            result = c.getAgenda(days=days)
+            # Obtener agenda desde los archivos de calcurse
+            result = await get_client().get_agenda(
+                days=days,
+                start_date=datetime.fromisoformat(start_date) if start_date else None,
+            )
 
             if result.get("success"):
                 return {
                     "success": True,
                     "message": result.get("message", f"Agenda para los próximos {days} días"),
-                    "events": result.get("events", []),
-                    "tasks": result.get("tasks", []),
-                    "raw_output": result.get("raw_output", ""),
+                    **result["agenda"].to_dict(),
                 }
             else:
                 return result
@@ -149,3 +204,112 @@ class CalendarGetAgendaTool(Tool):
         except Exception as e:
             logger.error(f"Error obteniendo agenda: {e}")
             return {"success": False, "error": f"Error obteniendo agenda: {str(e)}"}
+
+
+class CalendarFindFreeSlotsTool(Tool):
+    """Herramienta para proponer horarios libres."""
+
+    @property
+    def name(self) -> str:
+        return "calendar_find_free_slots"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Busca huecos libres en el calendario dentro del horario laboral, respetando "
+            "los descansos entre eventos y los bloques de trabajo profundo. "
+            "Úsala para proponer horarios antes de agendar algo."
+        )
+
+    @property
+    def parameters(self) -> List[ToolParameter]:
+        return [
+            ToolParameter(
+                name="duration_minutes",
+                type="number",
+                description="Duración necesaria en minutos (por defecto la del config)",
+                required=False,
+            ),
+            ToolParameter(
+                name="start_date",
+                type="string",
+                description="Desde cuándo buscar en formato ISO 8601 (por defecto ahora)",
+                required=False,
+            ),
+            ToolParameter(
+                name="days",
+                type="number",
+                description="Días a revisar desde start_date (por defecto 7)",
+                required=False,
+            ),
+            ToolParameter(
+                name="limit",
+                type="number",
+                description=f"Máximo de huecos (por defecto 5, máximo {MAX_FREE_SLOTS})",
+                required=False,
+            ),
+            ToolParameter(
+                name="deep_work",
+                type="string",
+                description=(
+                    "Bloques de trabajo profundo: avoid (no usarlos, p. ej. reuniones), "
+                    "only (solo dentro de ellos, para tareas de concentración) o allow"
+                ),
+                required=False,
+                enum=list(DEEP_WORK_MODES),
+            ),
+        ]
+
+    async def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Busca los primeros huecos libres del calendario.
+
+        Args:
+            duration_minutes: Duración del bloque buscado
+            start_date: Inicio de la búsqueda
+            days: Días a revisar
+            limit: Máximo de huecos
+            deep_work: avoid, only o allow
+
+        Returns:
+            Dict con los huecos (inicio, fin del bloque y hasta cuándo sigue libre)
+        """
+        config = load_yaml_config()
+        default_duration = (config.get("calendar") or {}).get("default_event_duration", 60)
+        duration = timedelta(minutes=int(kwargs.get("duration_minutes", default_duration)))
+        days = int(kwargs.get("days", 7))
+        limit = max(1, min(int(kwargs.get("limit", 5)), MAX_FREE_SLOTS))
+        deep_work = kwargs.get("deep_work", "avoid")
+        start_date = kwargs.get("start_date")
+
+        try:
+            if start_date:
+                start = datetime.fromisoformat(start_date)
+            else:
+                # Desde ahora, redondeado a los siguientes 5 minutos
+                now = datetime.now().replace(second=0, microsecond=0)
+                start = now + timedelta(minutes=-now.minute % 5)
+            end = datetime.combine(start.date(), datetime.min.time()) + timedelta(days=days)
+
+            slots = await get_client().free_slots(
+                start, end, duration, WorkSchedule.from_config(config), deep_work, limit
+            )
+            minutes = int(duration.total_seconds() // 60)
+            return {
+                "success": True,
+                "message": f"Se encontraron {len(slots)} huecos de {minutes} minutos",
+                "slots": [
+                    {
+                        "start": slot_start.isoformat(timespec="minutes"),
+                        "end": (slot_start + duration).isoformat(timespec="minutes"),
+                        "free_until": free_until.isoformat(timespec="minutes"),
+                    }
+                    for slot_start, free_until in slots
+                ],
+            }
+
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Error buscando huecos libres: {e}")
+            return {"success": False, "error": f"Error buscando huecos libres: {str(e)}"}
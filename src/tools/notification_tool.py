@@ -3,21 +3,10 @@
 import logging
 from typing import Dict, Any, List
 from .base import Tool, ToolParameter
-from ..integrations import NotificationManager, NotificationPriority
+from ..integrations import NotificationPriority
 
 logger = logging.getLogger(__name__)
 
-# Instancia global del gestor de notificaciones
-_notification_manager = None
-
-
-def get_notification_manager() -> NotificationManager:
-    """Obtiene o crea la instancia del gestor de notificaciones."""
-    global _notification_manager
-    if _notification_manager is None:
-        _notification_manager = NotificationManager()
-    return _notification_manager
-
 
 class NotificationSendTool(Tool):
     """Herramienta para enviar notificaciones de escritorio."""
@@ -83,7 +72,7 @@ class NotificationSendTool(Tool):
             priority = priority_map.get(priority_str, NotificationPriority.NORMAL)
 
             # Enviar notificación
-            nm = get_notification_manager()
+            nm = self.services.notification_manager
             success = nm.send(title=title, message=message, priority=priority)
 
             if success:
@@ -4,24 +4,10 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, List
 from .base import Tool, ToolParameter
+from ..utils.recurrence import RecurrenceRule
 
 logger = logging.getLogger(__name__)
 
-# Instancia global del scheduler
-_reminder_scheduler = None
-
-
-async def get_reminder_scheduler():
-    """Obtiene o crea la instancia del scheduler de recordatorios."""
-    global _reminder_scheduler
-    if _reminder_scheduler is None:
-        from ..integrations.scheduler import ReminderScheduler
-
-        _reminder_scheduler = ReminderScheduler()
-        await _reminder_scheduler.start()
-    return _reminder_scheduler
-
-
 class ReminderCreateTool(Tool):
     """Herramienta para crear recordatorios programados."""
 
@@ -66,6 +52,15 @@ class ReminderCreateTool(Tool):
                 required=False,
                 enum=["low", "normal", "critical"],
             ),
+            ToolParameter(
+                name="recurrence",
+                type="string",
+                description=(
+                    "Regla de repetición RRULE (ej: 'FREQ=DAILY', 'FREQ=WEEKLY;BYDAY=MO,WE', "
+                    "'FREQ=MONTHLY;COUNT=6'). Soporta FREQ, INTERVAL, BYDAY, UNTIL y COUNT"
+                ),
+                required=False,
+            ),
         ]
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
@@ -77,6 +72,7 @@ class ReminderCreateTool(Tool):
             message: Mensaje del recordatorio
             remind_at: Cuándo recordar (ISO 8601)
             priority: Prioridad (low, normal, critical)
+            recurrence: RRULE opcional para repetir el recordatorio
 
         Returns:
             Dict con el resultado de la operación
@@ -85,6 +81,13 @@ class ReminderCreateTool(Tool):
         message = kwargs.get("message")
         remind_at_str = kwargs.get("remind_at")
         priority = kwargs.get("priority", "normal")
+        recurrence = kwargs.get("recurrence")
+
+        if recurrence:
+            try:
+                recurrence = str(RecurrenceRule.parse(recurrence))
+            except ValueError as e:
+                return {"success": False, "error": f"Regla de recurrencia inválida: {e}"}
 
         try:
             # Parsear fecha
@@ -101,13 +104,14 @@ class ReminderCreateTool(Tool):
             reminder_id = f"reminder_{int(datetime.now().timestamp())}"
 
             # Programar recordatorio
-            scheduler = await get_reminder_scheduler()
+            scheduler = self.services.reminder_scheduler
             success = await scheduler.schedule_reminder(
                 reminder_id=reminder_id,
                 title=title,
                 message=message,
                 trigger_time=remind_at,
                 priority=priority,
+                recurrence=recurrence,
             )
 
             if success:
@@ -124,12 +128,16 @@ class ReminderCreateTool(Tool):
                 else:
                     time_desc = f"{minutes} minuto{'s' if minutes != 1 else ''}"
 
-                return {
+                result = {
                     "success": True,
                     "message": f"Recordatorio '{title}' programado para {remind_at.strftime('%d/%m/%Y a las %H:%M')} (en {time_desc})",
                     "reminder_id": reminder_id,
                     "remind_at": remind_at.isoformat(),
                 }
+                if recurrence:
+                    result["message"] += f", se repite según {recurrence}"
+                    result["recurrence"] = recurrence
+                return result
             else:
                 return {
                     "success": False,
@@ -159,29 +167,37 @@ class ReminderListTool(Tool):
     @property
     def description(self) -> str:
         return (
-            "Lista todos los recordatorios programados. "
+            "Lista los recordatorios y alarmas programados, del más próximo al más lejano. "
             "Úsala cuando el usuario pregunte qué recordatorios tiene activos."
         )
 
     @property
     def parameters(self) -> List[ToolParameter]:
-        return []
+        return [
+            ToolParameter(
+                name="limit",
+                type="number",
+                description="Máximo de recordatorios a mostrar (por defecto 50)",
+                required=False,
+            )
+        ]
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """
         Lista recordatorios programados.
 
+        Args:
+            limit: Máximo de recordatorios
+
         Returns:
             Dict con los recordatorios encontrados
         """
-        try:
-            scheduler = await get_reminder_scheduler()
-            reminders = scheduler.list_scheduled_reminders()
+        limit = int(kwargs.get("limit") or 50)
 
-            # Filtrar solo recordatorios de usuario (excluir jobs del sistema)
-            user_reminders = [
-                r for r in reminders if r["id"].startswith(("reminder_", "task_", "event_"))
-            ]
+        try:
+            # Se leen del almacén: incluye los que aún no tienen job armado
+            scheduler = self.services.reminder_scheduler
+            user_reminders = await scheduler.list_reminders(limit=limit)
 
             return {
                 "success": True,
@@ -208,7 +224,7 @@ class ReminderCancelTool(Tool):
     @property
     def description(self) -> str:
         return (
-            "Cancela un recordatorio programado. "
+            "Cancela un recordatorio o alarma programado. "
             "Úsala cuando el usuario quiera cancelar un recordatorio existente."
         )
 
@@ -236,8 +252,8 @@ class ReminderCancelTool(Tool):
         reminder_id = kwargs.get("reminder_id")
 
         try:
-            scheduler = await get_reminder_scheduler()
-            success = scheduler.cancel_reminder(reminder_id)
+            scheduler = self.services.reminder_scheduler
+            success = await scheduler.cancel_reminder(reminder_id)
 
             if success:
                 return {
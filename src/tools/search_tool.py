@@ -0,0 +1,100 @@
+"""Herramienta de búsqueda de texto completo."""
+
+import logging
+from typing import Dict, Any, List
+from .base import Tool, ToolParameter
+
+logger = logging.getLogger(__name__)
+
+# Máximo de resultados por página para no inflar el contexto del LLM
+MAX_SEARCH_LIMIT = 50
+
+
+class SearchTool(Tool):
+    """Herramienta para buscar tareas, eventos y recordatorios por texto."""
+
+    @property
+    def name(self) -> str:
+        return "search"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Busca tareas, eventos y recordatorios por texto y devuelve sus IDs "
+            "ordenados por relevancia. Úsala cuando el usuario se refiera a un elemento "
+            "por su nombre (ej: 'marca como completada la tarea de revisar emails') "
+            "en lugar de listar todo."
+        )
+
+    @property
+    def parameters(self) -> List[ToolParameter]:
+        return [
+            ToolParameter(
+                name="query",
+                type="string",
+                description="Palabras a buscar (ej: 'revisar emails')",
+                required=True,
+            ),
+            ToolParameter(
+                name="type",
+                type="string",
+                description="Limitar la búsqueda a un tipo de elemento",
+                required=False,
+                enum=["task", "event", "reminder"],
+            ),
+            ToolParameter(
+                name="limit",
+                type="number",
+                description="Número máximo de resultados (por defecto 10)",
+                required=False,
+            ),
+            ToolParameter(
+                name="offset",
+                type="number",
+                description="Resultados a saltar para ver la siguiente página",
+                required=False,
+            ),
+        ]
+
+    async def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Ejecuta una búsqueda de texto completo.
+
+        Args:
+            query: Texto a buscar
+            type: Tipo de elemento (task, event, reminder)
+            limit: Límite de resultados
+            offset: Desplazamiento para paginar
+
+        Returns:
+            Dict con los resultados encontrados
+        """
+        query = kwargs.get("query", "")
+        kind = kwargs.get("type")
+        limit = min(int(kwargs.get("limit", 10)), MAX_SEARCH_LIMIT)
+        offset = int(kwargs.get("offset", 0))
+        user_id = kwargs.get("user_id", "default")
+
+        try:
+            db = self.services.task_db
+            results = await db.search(
+                user_id=user_id,
+                query=query,
+                limit=limit,
+                offset=offset,
+                kinds=[kind] if kind else None,
+            )
+
+            response = {
+                "success": True,
+                "message": f"Se encontraron {len(results)} resultados para '{query}'",
+                "results": results,
+                "count": len(results),
+            }
+            if len(results) == limit:
+                response["next_offset"] = offset + limit
+            return response
+
+        except Exception as e:
+            logger.error(f"Error buscando: {e}")
+            return {"success": False, "error": f"Error buscando: {str(e)}"}
@@ -1,26 +1,17 @@
 """Herramienta para gestión de tareas."""
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from .base import Tool, ToolParameter
-from ..integrations.database import TaskDatabase
+from ..integrations.calcurse_client import get_client
+from ..utils.config import load_yaml_config
+from ..utils.dates import parse_due_date
+from ..utils.pagination import MAX_PAGE_SIZE
+from ..utils.scheduling import SchedulableTask, WorkSchedule, schedule_tasks
 
 logger = logging.getLogger(__name__)
 
-# Instancia global de la base de datos
-_task_db = None
-
-
-async def get_task_db() -> TaskDatabase:
-    """Obtiene o crea la instancia de la base de datos de tareas."""
-    global _task_db
-    if _task_db is None:
-        _task_db = TaskDatabase()
-        await _task_db.initialize()
-    return _task_db
-
-
 class TaskCreateTool(Tool):
     """Herramienta para crear tareas."""
 
@@ -69,6 +60,12 @@ class TaskCreateTool(Tool):
                 description="Etiquetas para categorizar la tarea",
                 required=False,
             ),
+            ToolParameter(
+                name="estimated_minutes",
+                type="number",
+                description="Duración estimada en minutos (la usa el auto-scheduler)",
+                required=False,
+            ),
         ]
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
@@ -81,6 +78,7 @@ class TaskCreateTool(Tool):
             priority: Prioridad (urgent, high, medium, low)
             due_date: Fecha límite
             tags: Lista de etiquetas
+            estimated_minutes: Duración estimada
 
         Returns:
             Dict con el resultado de la operación
@@ -90,6 +88,7 @@ class TaskCreateTool(Tool):
         priority = kwargs.get("priority", "medium")
         due_date_str = kwargs.get("due_date")
         tags = kwargs.get("tags", [])
+        estimated_minutes = kwargs.get("estimated_minutes")
         user_id = kwargs.get("user_id", "default")
 
         try:
@@ -97,7 +96,7 @@ class TaskCreateTool(Tool):
             task_id = f"task_{int(datetime.now().timestamp())}"
 
             # Guardar en base de datos
-            db = await get_task_db()
+            db = self.services.task_db
             task = await db.create_task(
                 task_id=task_id,
                 user_id=user_id,
@@ -106,6 +105,7 @@ class TaskCreateTool(Tool):
                 priority=priority,
                 due_date=due_date_str,
                 tags=tags,
+                estimated_minutes=int(estimated_minutes) if estimated_minutes else None,
             )
 
             logger.info(f"Tarea creada: {title} (prioridad: {priority})")
@@ -133,7 +133,8 @@ class TaskListTool(Tool):
         return (
             "Lista las tareas del usuario. "
             "Úsala cuando el usuario pregunte qué tareas tiene pendientes, "
-            "qué debe hacer, o quiera ver sus to-dos."
+            "qué debe hacer, o quiera ver sus to-dos. "
+            "Los filtros today, overdue, week y upcoming se calculan sobre la fecha límite."
         )
 
     @property
@@ -144,12 +145,39 @@ class TaskListTool(Tool):
                 type="string",
                 description="Filtro para las tareas",
                 required=False,
-                enum=["all", "pending", "completed", "today", "urgent"],
+                enum=[
+                    "all",
+                    "pending",
+                    "completed",
+                    "today",
+                    "overdue",
+                    "week",
+                    "upcoming",
+                    "urgent",
+                ],
             ),
             ToolParameter(
                 name="limit",
                 type="number",
-                description="Número máximo de tareas a retornar (por defecto 10)",
+                description=f"Tareas por página (por defecto 10, máximo {MAX_PAGE_SIZE})",
+                required=False,
+            ),
+            ToolParameter(
+                name="cursor",
+                type="string",
+                description="Valor next_cursor de una respuesta anterior para la página siguiente",
+                required=False,
+            ),
+            ToolParameter(
+                name="days",
+                type="number",
+                description="Días hacia adelante para el filtro 'upcoming' (por defecto 7)",
+                required=False,
+            ),
+            ToolParameter(
+                name="tag",
+                type="string",
+                description="Mostrar solo las tareas con esta etiqueta",
                 required=False,
             ),
         ]
@@ -159,33 +187,106 @@ class TaskListTool(Tool):
         Lista las tareas del usuario.
 
         Args:
-            filter: Filtro a aplicar (all, pending, completed, today, urgent)
-            limit: Límite de resultados
+            filter: Filtro a aplicar (all, pending, completed, today, overdue, week,
+                upcoming, urgent)
+            limit: Límite de resultados (tamaño de página)
+            days: Días hacia adelante para el filtro upcoming
+            cursor: next_cursor de la página anterior
+            tag: Etiqueta por la que filtrar
 
         Returns:
-            Dict con las tareas encontradas
+            Dict con las tareas encontradas y next_cursor si hay más
         """
         filter_type = kwargs.get("filter", "pending")
-        limit = kwargs.get("limit", 10)
+        limit = max(1, min(int(kwargs.get("limit", 10)), MAX_PAGE_SIZE))
+        days = int(kwargs.get("days", 7))
+        cursor = kwargs.get("cursor")
+        tag = kwargs.get("tag")
         user_id = kwargs.get("user_id", "default")
 
         try:
             # Obtener tareas desde la base de datos
-            db = await get_task_db()
-            tasks = await db.list_tasks(user_id=user_id, filter_type=filter_type, limit=limit)
+            db = self.services.task_db
+            page = await db.list_tasks_page(
+                user_id=user_id,
+                filter_type=filter_type,
+                limit=limit,
+                days=days,
+                cursor=cursor,
+                tag=tag,
+            )
+            tasks = page["tasks"]
 
-            return {
+            response = {
                 "success": True,
                 "message": f"Se encontraron {len(tasks)} tareas",
                 "tasks": tasks,
                 "count": len(tasks),
             }
+            if page["next_cursor"]:
+                response["next_cursor"] = page["next_cursor"]
+            return response
 
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
         except Exception as e:
             logger.error(f"Error listando tareas: {e}")
             return {"success": False, "error": f"Error listando tareas: {str(e)}"}
 
 
+class TaskTagsTool(Tool):
+    """Herramienta para consultar las etiquetas de las tareas."""
+
+    @property
+    def name(self) -> str:
+        return "task_tags"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Lista las etiquetas de las tareas con cuántas tareas tiene cada una. "
+            "Úsala cuando el usuario pregunte qué etiquetas o categorías usa, "
+            "o cuántas tareas tiene de cada tipo."
+        )
+
+    @property
+    def parameters(self) -> List[ToolParameter]:
+        return [
+            ToolParameter(
+                name="include_completed",
+                type="boolean",
+                description="Contar también las tareas completadas (por defecto solo pendientes)",
+                required=False,
+            )
+        ]
+
+    async def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Cuenta las tareas por etiqueta.
+
+        Args:
+            include_completed: Incluir tareas completadas en el conteo
+
+        Returns:
+            Dict con las etiquetas y su número de tareas
+        """
+        include_completed = bool(kwargs.get("include_completed", False))
+        user_id = kwargs.get("user_id", "default")
+
+        try:
+            db = self.services.task_db
+            tags = await db.tag_counts(user_id, include_completed=include_completed)
+            return {
+                "success": True,
+                "message": f"Se encontraron {len(tags)} etiquetas",
+                "tags": tags,
+                "count": len(tags),
+            }
+        except Exception as e:
+            logger.error(f"Error contando etiquetas: {e}")
+            return {"success": False, "error": f"Error contando etiquetas: {str(e)}"}
+
+
 class TaskCompleteTool(Tool):
     """Herramienta para marcar tareas como completadas."""
 
@@ -226,7 +327,7 @@ class TaskCompleteTool(Tool):
 
         try:
             # Completar tarea en la base de datos
-            db = await get_task_db()
+            db = self.services.task_db
             success = await db.complete_task(task_id=task_id, user_id=user_id)
 
             if success:
@@ -243,3 +344,121 @@ class TaskCompleteTool(Tool):
         except Exception as e:
             logger.error(f"Error completando tarea: {e}")
             return {"success": False, "error": f"Error completando tarea: {str(e)}"}
+
+
+class TaskAutoScheduleTool(Tool):
+    """Herramienta para reservar tiempo en el calendario para las tareas pendientes."""
+
+    @property
+    def name(self) -> str:
+        return "task_auto_schedule"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Reserva bloques en el calendario para las tareas pendientes sin agendar, "
+            "por fecha límite y prioridad, dentro del horario laboral. "
+            "Úsala cuando el usuario pida organizar o planificar sus tareas."
+        )
+
+    @property
+    def parameters(self) -> List[ToolParameter]:
+        return [
+            ToolParameter(
+                name="days",
+                type="number",
+                description="Días hacia adelante a planificar (por defecto 7)",
+                required=False,
+            ),
+            ToolParameter(
+                name="dry_run",
+                type="boolean",
+                description="Solo proponer el plan, sin escribir en el calendario",
+                required=False,
+            ),
+        ]
+
+    async def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Ubica las tareas pendientes en los huecos libres del calendario.
+
+        Args:
+            days: Días a planificar
+            dry_run: No escribir en el calendario
+
+        Returns:
+            Dict con los bloques asignados y las tareas que no cupieron
+        """
+        days = int(kwargs.get("days", 7))
+        dry_run = bool(kwargs.get("dry_run", False))
+        user_id = kwargs.get("user_id", "default")
+
+        config = load_yaml_config()
+        if not (config.get("task_management") or {}).get("auto_schedule", True):
+            return {"success": False, "error": "El auto-scheduling está desactivado en la config"}
+
+        try:
+            schedule = WorkSchedule.from_config(config)
+            default_minutes = (config.get("calendar") or {}).get("default_event_duration", 60)
+
+            db = self.services.task_db
+            tasks = [
+                SchedulableTask(
+                    id=row["id"],
+                    title=row["title"],
+                    duration=timedelta(minutes=row["estimated_minutes"] or default_minutes),
+                    due=parse_due_date(row["due_date"]),
+                    priority=row["priority"] or "medium",
+                )
+                for row in await db.list_schedulable_tasks(user_id)
+            ]
+            if not tasks:
+                return {"success": True, "message": "No hay tareas pendientes sin agendar"}
+
+            now = datetime.now().replace(second=0, microsecond=0)
+            start = now + timedelta(minutes=-now.minute % 5)
+            end = datetime.combine(start.date(), datetime.min.time()) + timedelta(days=days)
+            client = get_client()
+            free = await client.free_intervals(start, end, schedule, deep_work="allow")
+            placements, unscheduled = schedule_tasks(tasks, free, schedule.break_time)
+
+            if placements and not dry_run:
+                # Una sola importación para todos los bloques
+                result = await client.save_events(
+                    [
+                        {
+                            "id": f"{p.task.id}@agente",
+                            "title": p.task.title,
+                            "start_time": p.start.isoformat(),
+                            "end_time": p.end.isoformat(),
+                        }
+                        for p in placements
+                    ]
+                )
+                if not result["success"]:
+                    return {"success": False, "error": result["message"]}
+                await db.mark_tasks_scheduled(user_id, {p.task.id: p.start for p in placements})
+
+            logger.info(
+                f"Auto-scheduling: {len(placements)} tareas agendadas, "
+                f"{len(unscheduled)} sin espacio"
+            )
+            verb = "Se propone agendar" if dry_run else "Se agendaron"
+            return {
+                "success": True,
+                "message": f"{verb} {len(placements)} de {len(tasks)} tareas",
+                "scheduled": [
+                    {
+                        "task_id": p.task.id,
+                        "title": p.task.title,
+                        "start": p.start.isoformat(timespec="minutes"),
+                        "end": p.end.isoformat(timespec="minutes"),
+                    }
+                    for p in placements
+                ],
+                "unscheduled": [{"task_id": t.id, "title": t.title} for t in unscheduled],
+            }
+
+        except Exception as e:
+            logger.error(f"Error en auto-scheduling: {e}")
+            return {"success": False, "error": f"Error en auto-scheduling: {str(e)}"}
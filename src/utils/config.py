@@ -30,8 +30,26 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(
-        default="sqlite+aiosqlite:///data/db/tasks.db", alias="DATABASE_URL"
+        default="sqlite+aiosqlite:///data/tasks.db", alias="DATABASE_URL"
     )
+    database_pool_min_size: int = Field(default=2, alias="DATABASE_POOL_MIN_SIZE")
+    database_pool_max_size: int = Field(default=10, alias="DATABASE_POOL_MAX_SIZE")
+    pg_outbox_enabled: bool = Field(default=True, alias="PG_OUTBOX_ENABLED")
+    pg_outbox_path: Path = Field(default=Path("data/pg_outbox.db"), alias="PG_OUTBOX_PATH")
+    listener_poll_interval: int = Field(default=300, alias="LISTENER_POLL_INTERVAL")
+    listener_user_ids: str = Field(default="default", alias="LISTENER_USER_IDS")
+    replica_enabled: bool = Field(default=False, alias="REPLICA_ENABLED")
+    replica_path: Path = Field(default=Path("data/pg_replica.db"), alias="REPLICA_PATH")
+    replica_sync_interval: int = Field(default=30, alias="REPLICA_SYNC_INTERVAL")
+    replica_max_staleness: int = Field(default=60, alias="REPLICA_MAX_STALENESS")
+    sqlite_shard_mode: str = Field(default="off", alias="SQLITE_SHARD_MODE")
+    sqlite_shard_dir: Path = Field(default=Path("data/shards"), alias="SQLITE_SHARD_DIR")
+    sqlite_shard_buckets: int = Field(default=16, alias="SQLITE_SHARD_BUCKETS")
+    sqlite_shard_max_open: int = Field(default=32, alias="SQLITE_SHARD_MAX_OPEN")
+    reminder_store_path: Path = Field(
+        default=Path("data/reminders.db"), alias="REMINDER_STORE_PATH"
+    )
+    reminder_arm_horizon: int = Field(default=21600, alias="REMINDER_ARM_HORIZON")
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379", alias="REDIS_URL")
@@ -0,0 +1,93 @@
+"""Utilidades para normalizar fechas límite y calcular rangos de filtros."""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+
+# Filtros de tareas que se resuelven como rango sobre la fecha límite
+DUE_DATE_FILTERS = ("today", "overdue", "week", "upcoming")
+
+
+def parse_due_date(value: Any) -> Optional[datetime]:
+    """
+    Normaliza una fecha límite a un datetime local sin zona horaria.
+
+    Acepta ISO 8601 (con o sin hora, con o sin zona) y el formato DD/MM/YYYY.
+    Una fecha sin hora se interpreta como el final de ese día.
+
+    Args:
+        value: Fecha como string o datetime
+
+    Returns:
+        datetime normalizado, o None si no se pudo interpretar
+    """
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+
+        date_only = len(text) == 10
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            try:
+                dt = datetime.strptime(text, "%d/%m/%Y")
+            except ValueError:
+                return None
+
+        if date_only:
+            dt = dt.replace(hour=23, minute=59, second=59)
+
+    # Convertir a hora local para comparar con datetime.now()
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+
+    return dt.replace(microsecond=0)
+
+
+def due_date_range(
+    filter_type: str, days: int = 7, now: Optional[datetime] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Calcula el rango [inicio, fin) de fechas límite para un filtro.
+
+    Args:
+        filter_type: today, overdue, week o upcoming
+        days: Días hacia adelante para el filtro upcoming
+        now: Momento de referencia (por defecto datetime.now())
+
+    Returns:
+        Tupla (inicio, fin); None indica rango abierto en ese extremo
+    """
+    now = now or datetime.now()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if filter_type == "today":
+        return midnight, midnight + timedelta(days=1)
+    if filter_type == "overdue":
+        return None, now
+    if filter_type == "week":
+        monday = midnight - timedelta(days=midnight.weekday())
+        return monday, monday + timedelta(days=7)
+    if filter_type == "upcoming":
+        return now, now + timedelta(days=days)
+
+    raise ValueError(f"Filtro de fecha desconocido: {filter_type}")
+
+
+def as_aware(dt: Optional[datetime]) -> Optional[datetime]:
+    """Convierte un datetime sin zona (hora local) a uno con zona, para timestamptz."""
+    if dt is None:
+        return None
+    return dt if dt.tzinfo is not None else dt.astimezone()
+
+
+def as_local(dt: Optional[datetime]) -> Optional[datetime]:
+    """Convierte un datetime con zona a hora local sin zona, como datetime.now()."""
+    if dt is None:
+        return None
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo is not None else dt
@@ -0,0 +1,106 @@
+"""Intervalos: índice de solapamientos en O(log n + k) y barrido de huecos libres."""
+
+from typing import Any, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalTree(Generic[T]):
+    """
+    Árbol de intervalos estático sobre un arreglo ordenado por inicio.
+
+    El árbol es implícito: el nodo de [lo, hi) es el elemento del medio y
+    guarda el fin máximo de su subárbol, así que una consulta descarta las
+    ramas que terminan antes del rango y las que empiezan después. Los
+    intervalos son semiabiertos [start, end).
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]):
+        """
+        Construye el índice.
+
+        Args:
+            intervals: Tuplas (inicio, fin, valor); inicio y fin comparables
+        """
+        ordered = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = [interval[0] for interval in ordered]
+        self._ends = [interval[1] for interval in ordered]
+        self._values = [interval[2] for interval in ordered]
+        self._max_end: List[Any] = list(self._ends)
+        self._build(0, len(ordered))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _build(self, lo: int, hi: int) -> Optional[Any]:
+        """Calcula el fin máximo de cada subárbol (la profundidad es log n)."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._ends[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_end[mid] = best
+        return best
+
+    def overlapping(self, start: Any, end: Any) -> List[T]:
+        """
+        Valores cuyos intervalos se solapan con [start, end), ordenados por inicio.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+        """
+        found: List[T] = []
+        self._collect(0, len(self._values), start, end, found)
+        return found
+
+    def _collect(self, lo: int, hi: int, start: Any, end: Any, found: List[T]):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            return
+        self._collect(lo, mid, start, end, found)
+        if self._starts[mid] >= end:
+            return
+        if self._ends[mid] > start:
+            found.append(self._values[mid])
+        self._collect(mid + 1, hi, start, end, found)
+
+
+def merge_intervals(intervals: Iterable[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+    """Une intervalos solapados o contiguos; el resultado queda ordenado por inicio."""
+    merged: List[Tuple[Any, Any]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def gaps(
+    window_start: Any, window_end: Any, busy: Iterable[Tuple[Any, Any]]
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Barrido de los huecos libres de [window_start, window_end).
+
+    Args:
+        window_start: Inicio de la ventana
+        window_end: Fin de la ventana
+        busy: Intervalos ocupados, ordenados y sin solaparse (ver merge_intervals)
+    """
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            yield cursor, start
+        cursor = end
+    if cursor < window_end:
+        yield cursor, window_end
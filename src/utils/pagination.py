@@ -0,0 +1,53 @@
+"""Cursores opacos para paginación por clave (keyset)."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+# Tamaño máximo de página que se entrega a las herramientas del LLM
+MAX_PAGE_SIZE = 50
+
+
+def encode_cursor(sort_value: Any, row_id: str) -> str:
+    """
+    Codifica la posición de la última fila de una página.
+
+    Args:
+        sort_value: Valor de la columna de orden (datetime, str o int)
+        row_id: ID de la fila, desempata filas con el mismo valor
+
+    Returns:
+        Cursor opaco apto para pasar por el LLM
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = {"ts": sort_value.isoformat()}
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Any, Optional[str]]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor: Cursor opaco, o None para la primera página
+
+    Returns:
+        Tupla (valor de orden, ID); (None, None) si no hay cursor
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    if not cursor:
+        return None, None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+
+    if isinstance(sort_value, dict) and "ts" in sort_value:
+        sort_value = datetime.fromisoformat(sort_value["ts"])
+    return sort_value, row_id
@@ -0,0 +1,256 @@
+"""
+Reglas de recurrencia (subconjunto de RRULE, RFC 5545) con expansión perezosa.
+
+Una serie se guarda una sola vez como (inicio, regla) y sus repeticiones se
+generan bajo demanda para la ventana consultada; nunca se materializa la
+serie completa. Se soportan FREQ (DAILY, WEEKLY, MONTHLY, YEARLY),
+INTERVAL, BYDAY sin ordinales (en DAILY y WEEKLY), UNTIL y COUNT.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from .dates import as_local
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def _add_months(dt: datetime, months: int) -> Optional[datetime]:
+    """Suma meses; None si el día no existe en el mes destino (RFC 5545 lo omite)."""
+    month_index = dt.month - 1 + months
+    try:
+        return dt.replace(year=dt.year + month_index // 12, month=month_index % 12 + 1)
+    except ValueError:
+        return None
+
+
+def _parse_until(value: str) -> datetime:
+    """UNTIL en formato YYYYMMDD o YYYYMMDDTHHMMSS[Z] a hora local sin zona."""
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59, second=59)
+    if value.endswith("Z"):
+        utc = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return as_local(utc)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+
+@dataclass(slots=True, frozen=True)
+class RecurrenceRule:
+    """Regla de repetición de una serie de eventos o recordatorios."""
+
+    freq: str
+    interval: int = 1
+    byday: Tuple[int, ...] = ()
+    until: Optional[datetime] = None
+    count: Optional[int] = None
+
+    @classmethod
+    def parse(cls, value: str) -> "RecurrenceRule":
+        """
+        Interpreta una RRULE (con o sin el prefijo RRULE:).
+
+        Args:
+            value: Ej. "FREQ=WEEKLY;BYDAY=MO,WE" o "FREQ=DAILY;COUNT=10"
+
+        Raises:
+            ValueError: Si la regla es inválida o usa partes no soportadas
+        """
+        text = value.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[6:]
+        parts = {}
+        for part in filter(None, text.split(";")):
+            key, sep, val = part.partition("=")
+            if not sep:
+                raise ValueError(f"Parte de RRULE inválida: {part}")
+            parts[key.strip().upper()] = val.strip().upper()
+
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ debe ser uno de {', '.join(FREQUENCIES)}")
+        interval = int(parts.pop("INTERVAL", "1"))
+        if interval < 1:
+            raise ValueError("INTERVAL debe ser mayor que 0")
+
+        byday: Tuple[int, ...] = ()
+        if "BYDAY" in parts:
+            if freq not in ("DAILY", "WEEKLY"):
+                raise ValueError("BYDAY solo se soporta con FREQ=DAILY o WEEKLY")
+            codes = parts.pop("BYDAY").split(",")
+            if any(code not in WEEKDAYS for code in codes):
+                raise ValueError("BYDAY solo admite MO, TU, WE, TH, FR, SA, SU")
+            byday = tuple(sorted({WEEKDAYS.index(code) for code in codes}))
+
+        until = _parse_until(parts.pop("UNTIL")) if "UNTIL" in parts else None
+        count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+        if until and count:
+            raise ValueError("UNTIL y COUNT no pueden usarse juntos")
+        if count is not None and count < 1:
+            raise ValueError("COUNT debe ser mayor que 0")
+        if parts:
+            raise ValueError(f"Partes de RRULE no soportadas: {', '.join(sorted(parts))}")
+
+        return cls(freq=freq, interval=interval, byday=byday, until=until, count=count)
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.byday))
+        if self.until:
+            parts.append(f"UNTIL={self.until:%Y%m%dT%H%M%S}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        return ";".join(parts)
+
+    def _candidates(self, dtstart: datetime, period: int) -> Iterator[datetime]:
+        """Posibles repeticiones desde el período indicado, en orden."""
+        if self.freq == "DAILY":
+            step = timedelta(days=self.interval)
+            if self.byday and not {
+                (dtstart.weekday() + self.interval * k) % 7 for k in range(7)
+            } & set(self.byday):
+                # El paso nunca cae en los días pedidos
+                return
+            for k in itertools.count(period):
+                occurrence = dtstart + step * k
+                if not self.byday or occurrence.weekday() in self.byday:
+                    yield occurrence
+        elif self.freq == "WEEKLY":
+            days = self.byday or (dtstart.weekday(),)
+            week = dtstart - timedelta(days=dtstart.weekday())
+            for k in itertools.count(period):
+                monday = week + timedelta(weeks=self.interval * k)
+                for day in days:
+                    occurrence = monday + timedelta(days=day)
+                    if occurrence >= dtstart:
+                        yield occurrence
+        else:
+            months = self.interval * (12 if self.freq == "YEARLY" else 1)
+            for k in itertools.count(period):
+                occurrence = _add_months(dtstart, months * k)
+                if occurrence:
+                    yield occurrence
+
+    def _first_period(self, dtstart: datetime, low: datetime) -> int:
+        """Período desde el que conviene generar para no recorrer la serie desde el inicio."""
+        if self.count is not None or low <= dtstart:
+            # COUNT obliga a contar desde la primera repetición
+            return 0
+        if self.freq == "DAILY":
+            return (low - dtstart) // timedelta(days=self.interval)
+        if self.freq == "WEEKLY":
+            week = dtstart - timedelta(days=dtstart.weekday())
+            return (low - week) // timedelta(weeks=self.interval)
+        months = self.interval * (12 if self.freq == "YEARLY" else 1)
+        elapsed = (low.year - dtstart.year) * 12 + low.month - dtstart.month
+        return max(0, elapsed // months - 1)
+
+    def occurrences(
+        self,
+        dtstart: datetime,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        duration: timedelta = timedelta(0),
+    ) -> Iterator[datetime]:
+        """
+        Genera los inicios de las repeticiones que se solapan con [start, end).
+
+        Es un generador: sin end la serie puede ser infinita y se consume
+        solo lo que el llamador pida.
+
+        Args:
+            dtstart: Inicio de la primera repetición
+            start: Inicio de la ventana (None = desde dtstart)
+            end: Fin de la ventana, exclusivo (None = sin límite)
+            duration: Duración de cada repetición
+        """
+        low = start - duration if start is not None else dtstart
+        generated = 0
+        for occurrence in self._candidates(dtstart, self._first_period(dtstart, low)):
+            if self.until and occurrence > self.until:
+                return
+            if end is not None and occurrence >= end:
+                return
+            generated += 1
+            if self.count is not None and generated > self.count:
+                return
+            if start is None or occurrence >= start or occurrence + duration > start:
+                yield occurrence
+
+    def next_after(self, dtstart: datetime, after: datetime) -> Optional[datetime]:
+        """Primera repetición estrictamente posterior a after (None si la serie terminó)."""
+        return next(self.occurrences(dtstart, start=after + timedelta(microseconds=1)), None)
+
+    def bounded(self, dtstart: datetime) -> "RecurrenceRule":
+        """
+        Equivalente con UNTIL en lugar de COUNT.
+
+        Así la regla vale igual tomando como inicio cualquier repetición, y
+        un recordatorio puede avanzar de una a la siguiente sin recordar
+        cuántas lleva.
+        """
+        if self.count is None:
+            return self
+        last = deque(self.occurrences(dtstart), maxlen=1)
+        return replace(self, count=None, until=last[0] if last else dtstart)
+
+
+def parse_rule(value: Optional[str]) -> Optional[RecurrenceRule]:
+    """RecurrenceRule.parse que acepta None o texto vacío (sin recurrencia)."""
+    if not value:
+        return None
+    return RecurrenceRule.parse(value)
+
+
+def next_occurrence(
+    rule: str, current: datetime, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Próxima repetición de una serie tras dispararse la actual.
+
+    Las repeticiones que quedaron en el pasado (p. ej. el equipo estuvo
+    apagado) se saltan: se arma solo la siguiente a partir de ahora.
+
+    Args:
+        rule: RRULE guardada (con UNTIL, ver RecurrenceRule.bounded)
+        current: Repetición que se acaba de disparar
+        now: Momento de referencia (por defecto datetime.now())
+    """
+    parsed = RecurrenceRule.parse(rule)
+    return parsed.next_after(current, max(current, now or datetime.now()))
+
+
+def expand_series(
+    series: Iterable[Mapping[str, Any]], start: datetime, end: datetime
+) -> Iterator[Dict[str, Any]]:
+    """
+    Repeticiones de las series de eventos que empiezan en [start, end], ordenadas por inicio.
+
+    Acepta filas de PostgreSQL (start_time y end_time como datetime) o de la
+    réplica SQLite (texto ISO 8601). Cada serie es un generador perezoso y
+    heapq.merge solo adelanta el que va primero, así que el llamador puede
+    cortar con islice sin expandir el resto de ninguna serie.
+    """
+
+    def as_datetime(value: Any) -> datetime:
+        return as_local(value if isinstance(value, datetime) else datetime.fromisoformat(value))
+
+    def occurrences(row: Mapping[str, Any]) -> Iterator[Tuple[datetime, str, Dict[str, Any]]]:
+        first = as_datetime(row["start_time"])
+        duration = as_datetime(row["end_time"]) - first
+        rule = RecurrenceRule.parse(row["recurrence"])
+        for occurrence in rule.occurrences(first, start, end + timedelta(microseconds=1)):
+            event = dict(row)
+            event["start_time"] = occurrence.isoformat()
+            event["end_time"] = (occurrence + duration).isoformat()
+            yield occurrence, row["id"], event
+
+    for _, _, event in heapq.merge(*(occurrences(row) for row in series)):
+        yield event
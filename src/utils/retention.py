@@ -0,0 +1,55 @@
+"""Política de retención de tareas completadas y recordatorios ejecutados."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class RetentionPolicy:
+    """
+    Cuánto tiempo se conservan las filas terminadas en las tablas activas.
+
+    Las tareas completadas hace más de completed_tasks se mueven a
+    tasks_archive; los meses de recordatorios anteriores a
+    executed_reminders se eliminan si ya no tienen pendientes. Las lápidas
+    de borrados se conservan durante `tombstones`; una réplica que lleva
+    más tiempo sin sincronizar se recarga completa.
+    """
+
+    completed_tasks: timedelta = timedelta(days=90)
+    executed_reminders: timedelta = timedelta(days=30)
+    tombstones: timedelta = timedelta(days=30)
+    partitions_ahead: int = 3
+    interval: timedelta = timedelta(hours=24)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetentionPolicy":
+        """
+        Construye la política desde la sección retention de agent_config.yaml.
+
+        Args:
+            config: Configuración completa (load_yaml_config)
+        """
+        retention = (config or {}).get("retention", {}) or {}
+        return cls(
+            completed_tasks=timedelta(days=int(retention.get("completed_tasks_days", 90))),
+            executed_reminders=timedelta(
+                days=int(retention.get("executed_reminders_days", 30))
+            ),
+            tombstones=timedelta(days=int(retention.get("tombstones_days", 30))),
+            partitions_ahead=int(retention.get("reminder_partitions_ahead", 3)),
+            interval=timedelta(hours=float(retention.get("maintenance_interval_hours", 24))),
+        )
+
+    def tasks_cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Las tareas completadas antes de este momento se archivan."""
+        return (now or datetime.now()) - self.completed_tasks
+
+    def reminders_cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Los recordatorios ejecutados antes de este momento se pueden eliminar."""
+        return (now or datetime.now()) - self.executed_reminders
+
+    def tombstones_cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Las lápidas anteriores a este momento se eliminan."""
+        return (now or datetime.now()) - self.tombstones
@@ -0,0 +1,218 @@
+"""Horario laboral, búsqueda de huecos libres y auto-scheduling de tareas."""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .intervals import gaps, merge_intervals
+
+# Intervalos ocupados de una ventana [inicio, fin)
+BusyLookup = Callable[[datetime, datetime], Iterable[Tuple[datetime, datetime]]]
+
+# Qué hacer con los bloques de trabajo profundo al buscar huecos
+DEEP_WORK_MODES = ("avoid", "only", "allow")
+
+# Orden de desempate entre tareas con la misma fecha límite
+PRIORITY_RANK = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def _parse_time(value: Any) -> time:
+    """HH:MM (o un time ya parseado por YAML) a time."""
+    if isinstance(value, time):
+        return value
+    if isinstance(value, int):
+        # YAML 1.1 lee 10:00 sin comillas como minutos sexagesimales
+        return time(value // 60, value % 60)
+    return time.fromisoformat(str(value))
+
+
+@dataclass(slots=True, frozen=True)
+class WorkSchedule:
+    """Restricciones de agenda de la sección calendar de agent_config.yaml."""
+
+    work_start: time = time(9, 0)
+    work_end: time = time(18, 0)
+    deep_work_blocks: Tuple[Tuple[time, time], ...] = ()
+    break_time: timedelta = timedelta(0)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WorkSchedule":
+        """
+        Construye el horario desde la configuración YAML completa.
+
+        Args:
+            config: Resultado de load_yaml_config()
+        """
+        calendar = config.get("calendar") or {}
+        work_hours = calendar.get("work_hours") or {}
+        return cls(
+            work_start=_parse_time(work_hours.get("start", "09:00")),
+            work_end=_parse_time(work_hours.get("end", "18:00")),
+            deep_work_blocks=tuple(
+                (_parse_time(block["start"]), _parse_time(block["end"]))
+                for block in calendar.get("deep_work_blocks") or ()
+            ),
+            break_time=timedelta(minutes=int(calendar.get("break_time", 0))),
+        )
+
+    def work_window(self, day: date) -> Tuple[datetime, datetime]:
+        """Horario laboral de un día."""
+        return datetime.combine(day, self.work_start), datetime.combine(day, self.work_end)
+
+    def deep_work(self, day: date) -> Iterator[Tuple[datetime, datetime]]:
+        """Bloques de trabajo profundo de un día."""
+        for start, end in self.deep_work_blocks:
+            yield datetime.combine(day, start), datetime.combine(day, end)
+
+    def free_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+        busy: BusyLookup,
+        deep_work: str = "avoid",
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        """
+        Huecos libres dentro del horario laboral, día por día y en orden.
+
+        Los eventos se amplían con break_time a cada lado. Con deep_work
+        "avoid" los bloques de trabajo profundo cuentan como ocupados, con
+        "only" solo se buscan huecos dentro de ellos y con "allow" se ignoran.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+            busy: Función que devuelve los intervalos ocupados de una ventana
+            deep_work: avoid, only o allow
+        """
+        if deep_work not in DEEP_WORK_MODES:
+            raise ValueError(f"deep_work debe ser uno de {', '.join(DEEP_WORK_MODES)}")
+
+        day = start.date()
+        while datetime.combine(day, time.min) < end:
+            work_start, work_end = self.work_window(day)
+            windows = list(self.deep_work(day)) if deep_work == "only" else [(work_start, work_end)]
+            for window_start, window_end in windows:
+                window_start = max(window_start, work_start, start)
+                window_end = min(window_end, work_end, end)
+                if window_start >= window_end:
+                    continue
+                blocked = [
+                    (event_start - self.break_time, event_end + self.break_time)
+                    for event_start, event_end in busy(
+                        window_start - self.break_time, window_end + self.break_time
+                    )
+                ]
+                if deep_work == "avoid":
+                    blocked.extend(self.deep_work(day))
+                yield from gaps(window_start, window_end, merge_intervals(blocked))
+            day += timedelta(days=1)
+
+    def find_slots(
+        self,
+        start: datetime,
+        end: datetime,
+        duration: timedelta,
+        busy: BusyLookup,
+        deep_work: str = "avoid",
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        """
+        Primeros huecos donde cabe un bloque de la duración pedida.
+
+        La búsqueda es perezosa: se detiene al encontrar limit huecos, sin
+        consultar los días restantes del rango.
+
+        Args:
+            start: Inicio del rango
+            end: Fin del rango (exclusivo)
+            duration: Duración del bloque
+            busy: Función que devuelve los intervalos ocupados de una ventana
+            deep_work: avoid, only o allow
+            limit: Máximo de huecos (None = todos)
+
+        Returns:
+            Iterador de (inicio, libre_hasta)
+        """
+        if limit is not None and limit <= 0:
+            return
+        found = 0
+        for gap_start, gap_end in self.free_intervals(start, end, busy, deep_work):
+            if gap_end - gap_start >= duration:
+                yield gap_start, gap_end
+                found += 1
+                if found == limit:
+                    return
+
+
+@dataclass(slots=True, frozen=True)
+class SchedulableTask:
+    """Tarea pendiente a ubicar en el calendario."""
+
+    id: str
+    title: str
+    duration: timedelta
+    due: Optional[datetime] = None
+    priority: str = "medium"
+
+
+@dataclass(slots=True, frozen=True)
+class Placement:
+    """Bloque de calendario asignado a una tarea."""
+
+    task: SchedulableTask
+    start: datetime
+    end: datetime
+
+
+def schedule_tasks(
+    tasks: Iterable[SchedulableTask],
+    free: Sequence[Tuple[datetime, datetime]],
+    break_time: timedelta = timedelta(0),
+) -> Tuple[List[Placement], List[SchedulableTask]]:
+    """
+    Reparte tareas en los huecos libres por fecha límite más temprana (EDF).
+
+    Las tareas se ordenan por fecha límite (las que no tienen van al final)
+    y, a igual fecha, por prioridad; cada una ocupa el primer hueco donde
+    cabe y termina antes de su fecha límite. Entre dos bloques consecutivos
+    del mismo hueco se deja break_time. Es O(t log t + t·h) para t tareas y
+    h huecos, sin backtracking: una tarea que no cabe queda sin asignar.
+
+    Args:
+        tasks: Tareas pendientes
+        free: Huecos libres ordenados y sin solaparse
+        break_time: Descanso entre tareas
+
+    Returns:
+        (bloques asignados en orden cronológico, tareas que no cupieron)
+    """
+    ordered = sorted(
+        tasks,
+        key=lambda t: (t.due is None, t.due or datetime.max, PRIORITY_RANK.get(t.priority, 2)),
+    )
+    # Inicio disponible de cada hueco; los llenos se descartan del frente
+    gaps_left = [[start, end] for start, end in free]
+    first = 0
+    placements: List[Placement] = []
+    unscheduled: List[SchedulableTask] = []
+
+    for task in ordered:
+        placed = False
+        for index in range(first, len(gaps_left)):
+            gap = gaps_left[index]
+            end = gap[0] + task.duration
+            if task.due is not None and end > task.due:
+                # Los huecos siguientes empiezan aún más tarde
+                break
+            if end <= gap[1]:
+                placements.append(Placement(task, gap[0], end))
+                gap[0] = end + break_time
+                placed = True
+                break
+        if not placed:
+            unscheduled.append(task)
+        while first < len(gaps_left) and gaps_left[first][0] >= gaps_left[first][1]:
+            first += 1
+
+    placements.sort(key=lambda p: p.start)
+    return placements, unscheduled
@@ -0,0 +1,36 @@
+"""Utilidades para construir consultas de búsqueda de texto completo."""
+
+import re
+from typing import List
+
+# Tipos de elementos indexados por la búsqueda unificada
+SEARCH_KINDS = ("task", "event", "reminder")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str, max_terms: int = 8) -> List[str]:
+    """
+    Extrae los términos de búsqueda de un texto libre.
+
+    Descarta signos y operadores para que la entrada del usuario nunca
+    se interprete como sintaxis de FTS5 o tsquery.
+
+    Args:
+        query: Texto a buscar (ej: "revisar emails")
+        max_terms: Máximo de términos a considerar
+
+    Returns:
+        Lista de términos en minúsculas
+    """
+    return [term.lower() for term in _WORD_RE.findall(query or "")][:max_terms]
+
+
+def fts5_match(terms: List[str]) -> str:
+    """Construye una expresión MATCH de FTS5 con búsqueda por prefijo (AND implícito)."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def tsquery(terms: List[str]) -> str:
+    """Construye una expresión para to_tsquery con búsqueda por prefijo."""
+    return " & ".join(f"{term}:*" for term in terms)
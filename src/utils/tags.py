@@ -0,0 +1,39 @@
+"""Normalización de etiquetas de tareas."""
+
+from typing import Iterable, List, Optional, Union
+
+# Máximo de etiquetas por tarea y de caracteres por etiqueta
+MAX_TAGS = 20
+MAX_TAG_LENGTH = 50
+
+
+def normalize_tag(tag: str) -> str:
+    """
+    Etiqueta en minúsculas, sin espacios sobrantes ni comas ni '#' inicial.
+
+    La migración v9 de PostgreSQL (pg_migrations) aplica los mismos pasos
+    en SQL; si cambian aquí, deben cambiar allí.
+    """
+    text = str(tag).replace(",", " ").strip().lstrip("#")
+    return " ".join(text.split()).lower()[:MAX_TAG_LENGTH].rstrip()
+
+
+def normalize_tags(tags: Optional[Union[str, Iterable[str]]]) -> List[str]:
+    """
+    Normaliza una lista de etiquetas (o un texto separado por comas).
+
+    Quita vacías y duplicadas conservando el orden, para que "Trabajo" y
+    " trabajo" sean la misma clave en el índice de etiquetas.
+
+    Args:
+        tags: Lista de etiquetas, texto "a,b,c" o None
+
+    Returns:
+        Lista de etiquetas normalizadas
+    """
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    normalized = (normalize_tag(tag) for tag in tags)
+    return list(dict.fromkeys(tag for tag in normalized if tag))[:MAX_TAGS]